@@ -1,8 +1,10 @@
 from PyQt5 import uic
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTableWidgetItem, 
-                           QLineEdit, QHeaderView, QComboBox, QWidget, QHBoxLayout, QLabel, QMessageBox)
+                           QLineEdit, QHeaderView, QMessageBox, QFileDialog, QMenu, QInputDialog)
+import os
 import sys
+from datetime import date, timedelta
 
 # Import the meeting calculation functions
 import meeting_calculator
@@ -10,6 +12,25 @@ import meeting_calculator
 # Import the export dialog
 from export_dialog import open_export_dialog
 
+# Import the roster table model and dropdown delegate
+from roster_model import RosterModel, TimeRangeDelegate
+
+# Import the background calculation worker
+from calculation_worker import CalculationWorker
+
+# Import live (debounced, incremental) recalculation
+from live_recalculation import LiveRecalculator
+
+# Import streaming roster file reader
+import roster_import
+
+# Import the saved-event database and the table -> database sync
+from roster_database import RosterDatabase
+from event_sync import EventSync
+
+# Import the iCalendar/CSV/JSON result writers
+import result_export
+
 
 class EditableHeaderView(QHeaderView):
     """Custom header view that allows editing of vertical headers"""
@@ -63,32 +84,64 @@ class MainWindow(QMainWindow):
         super().__init__()
         uic.loadUi("main_window.ui", self)  # Load the UI file
 
-        # Track how many users are in the table
-        self.user_count = 0
+        # Roster data lives in a model; dropdowns are only created for the cell being edited
+        self.roster_model = RosterModel(self)
+        self.time_delegate = TimeRangeDelegate(self)
+        self.tableView.setModel(self.roster_model)
+        self.tableView.setItemDelegateForColumn(1, self.time_delegate)  # Day One
+        self.tableView.setItemDelegateForColumn(2, self.time_delegate)  # Day Two
+        
+        # Calculation state for this window (participants and results)
+        self.session = meeting_calculator.SchedulingSession()
+        
+        # Background calculation - the generation goes up on every roster edit so stale results are dropped
+        self.thread_pool = QThreadPool.globalInstance()
+        self.calculation_worker = None
+        self.pending_export = None   # export action waiting for a background calculation
+        self.roster_generation = 0
+        self.roster_model.dataChanged.connect(self.on_roster_changed)
+        self.roster_model.rowsInserted.connect(self.on_roster_changed)
+        self.roster_model.rowsRemoved.connect(self.on_roster_changed)
+        self.roster_model.modelReset.connect(self.on_roster_changed)
+        
+        # Live mode - best times follow edits without pressing Calculate
+        self.live_recalculator = LiveRecalculator(self.roster_model, parent=self)
+        self.live_recalculator.results_ready.connect(self.on_live_results)
+        self.checkBox.toggled.connect(self.live_recalculator.set_enabled)
+        
+        # Saved event (SQLite) - once opened or saved, every edit is written straight through
+        self.event_sync = None
         
         # Storage for export functionality
         self.last_day_one_result = ""
         self.last_day_two_result = ""
+        self.export_dialog = None
 
         # Connect buttons
         self.pushButton.clicked.connect(self.add_user)        # Add User
         self.pushButton_2.clicked.connect(self.calculate_best_times)  # Calculate
         self.pushButton_3.clicked.connect(self.export_results)  # Export
+        self.pushButton_4.clicked.connect(self.import_roster)  # Import
+        self.pushButton_5.clicked.connect(self.open_event)  # Open Event
+        self.pushButton_6.clicked.connect(self.save_event)  # Save Event
 
         # Configure main table
-        self.tableWidget.setEditTriggers(
-            self.tableWidget.DoubleClicked | 
-            self.tableWidget.EditKeyPressed | 
-            self.tableWidget.AnyKeyPressed
+        self.tableView.setEditTriggers(
+            self.tableView.DoubleClicked | 
+            self.tableView.SelectedClicked | 
+            self.tableView.EditKeyPressed | 
+            self.tableView.AnyKeyPressed
         )
+        self.tableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tableView.verticalHeader().setDefaultSectionSize(30)
 
         # Lock the results table
         self.tableWidget_2.setEditTriggers(self.tableWidget_2.NoEditTriggers)
 
         # Set column widths
-        self.tableWidget.setColumnWidth(0, 120)  # User Name
-        self.tableWidget.setColumnWidth(1, 200)  # Day One Times
-        self.tableWidget.setColumnWidth(2, 200)  # Day Two Times
+        self.tableView.setColumnWidth(0, 120)  # User Name
+        self.tableView.setColumnWidth(1, 200)  # Day One Times
+        self.tableView.setColumnWidth(2, 200)  # Day Two Times
         
         # Configure results table
         self.tableWidget_2.resizeColumnsToContents()
@@ -108,167 +161,224 @@ class MainWindow(QMainWindow):
         ]
         
         for user_data in test_users:
-            self.add_user()
-            row = self.user_count - 1
-            
-            # Set user name
-            self.tableWidget.item(row, 0).setText(user_data["name"])
-            
-            # Set day 1 times
-            day_one_widget = self.tableWidget.cellWidget(row, 1)
-            if day_one_widget:
-                start_index = day_one_widget.start_combo.findText(user_data["day1_start"])
-                if start_index >= 0:
-                    day_one_widget.start_combo.setCurrentIndex(start_index)
-                
-                end_index = day_one_widget.end_combo.findText(user_data["day1_end"])
-                if end_index >= 0:
-                    day_one_widget.end_combo.setCurrentIndex(end_index)
-            
-            # Set day 2 times
-            day_two_widget = self.tableWidget.cellWidget(row, 2)
-            if day_two_widget:
-                start_index = day_two_widget.start_combo.findText(user_data["day2_start"])
-                if start_index >= 0:
-                    day_two_widget.start_combo.setCurrentIndex(start_index)
-                
-                end_index = day_two_widget.end_combo.findText(user_data["day2_end"])
-                if end_index >= 0:
-                    day_two_widget.end_combo.setCurrentIndex(end_index)
+            day_indices = [
+                self.find_time_indices(user_data["day1_start"], user_data["day1_end"]),
+                self.find_time_indices(user_data["day2_start"], user_data["day2_end"])
+            ]
+            self.roster_model.add_participant(user_data["name"], day_indices)
+
+    def find_time_indices(self, start_text, end_text):
+        """Look up the dropdown indices for a start/end time, 0 ("Start"/"End") if not found"""
+        start_options = meeting_calculator.START_TIME_OPTIONS
+        end_options = meeting_calculator.END_TIME_OPTIONS
+        start_index = start_options.index(start_text) if start_text in start_options else 0
+        end_index = end_options.index(end_text) if end_text in end_options else 0
+        return start_index, end_index
 
     def add_user(self):
         """Add a new user row to the table"""
-        row = self.user_count
-        self.tableWidget.insertRow(row)
-
-        # Add editable user name
-        user_name_item = QTableWidgetItem(f"User {row + 1}")
-        user_name_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable)
-        self.tableWidget.setItem(row, 0, user_name_item)
-        
-        # Add time selection dropdowns
-        self.add_time_dropdown(row, 1)  # Day One
-        self.add_time_dropdown(row, 2)  # Day Two
-
-        self.user_count += 1
-
-    def add_time_dropdown(self, row, column):
-        """Add dual dropdowns (start time - end time) to a specific cell"""
-        container = QWidget()
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.setSpacing(2)
-        
-        # Start time dropdown
-        start_combo = QComboBox()
-        time_options = [
-            "Start",
-            "8:00 AM", "8:30 AM", "9:00 AM", "9:30 AM", "10:00 AM", "10:30 AM",
-            "11:00 AM", "11:30 AM", "12:00 PM", "12:30 PM", "1:00 PM", "1:30 PM",
-            "2:00 PM", "2:30 PM", "3:00 PM", "3:30 PM", "4:00 PM", "4:30 PM",
-            "5:00 PM", "5:30 PM", "6:00 PM"
-        ]
-        start_combo.addItems(time_options)
-        start_combo.setCurrentIndex(0)
-        
-        # Dash label
-        dash_label = QLabel(" - ")
-        dash_label.setAlignment(Qt.AlignCenter)
-        
-        # End time dropdown
-        end_combo = QComboBox()
-        end_time_options = [
-            "End",
-            "8:30 AM", "9:00 AM", "9:30 AM", "10:00 AM", "10:30 AM", "11:00 AM",
-            "11:30 AM", "12:00 PM", "12:30 PM", "1:00 PM", "1:30 PM", "2:00 PM",
-            "2:30 PM", "3:00 PM", "3:30 PM", "4:00 PM", "4:30 PM", "5:00 PM",
-            "5:30 PM", "6:00 PM", "6:30 PM"
-        ]
-        end_combo.addItems(end_time_options)
-        end_combo.setCurrentIndex(0)
+        row = self.roster_model.rowCount()
+        self.roster_model.add_participant(f"User {row + 1}")
+        self.tableView.scrollTo(self.roster_model.index(row, 0))
+
+    def import_roster(self):
+        """Stream a CSV/JSONL availability export into the table in batches"""
+        path, _ = QFileDialog.getOpenFileName(self, "Import Roster", "",
+                                              "Roster files (*.csv *.jsonl *.ndjson)")
+        if not path:
+            return
         
-        # Add to layout
-        layout.addWidget(start_combo)
-        layout.addWidget(dash_label)
-        layout.addWidget(end_combo)
+        imported = 0
+        unrepresentable = []
+        # Suspend repaints while rows arrive; each batch is a single insert notification
+        self.tableView.setUpdatesEnabled(False)
+        try:
+            for batch in roster_import.iter_batches(roster_import.read_roster_records(path)):
+                unrepresentable.extend(self.roster_model.add_records(batch))
+                imported += len(batch)
+                self.statusBar().showMessage(f"Importing... {imported} participants")
+                QApplication.processEvents()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Import Failed", f"Could not import '{path}': {e}")
+        finally:
+            self.tableView.setUpdatesEnabled(True)
         
-        # Store references for later access
-        container.start_combo = start_combo
-        container.end_combo = end_combo
+        if unrepresentable:
+            self.statusBar().showMessage(f"Imported {imported} participants "
+                                         f"({len(unrepresentable)} with times the dropdowns can't show)")
+            names = ", ".join(unrepresentable[:10])
+            if len(unrepresentable) > 10:
+                names += f" and {len(unrepresentable) - 10} more"
+            QMessageBox.warning(self, "Unsupported Times",
+                                f"{len(unrepresentable)} imported participant(s) picked times the dropdowns "
+                                f"don't offer, so those days were left as 'Not selected':\n\n{names}")
+        else:
+            self.statusBar().showMessage(f"Imported {imported} participants", 5000)
+
+    def open_event(self):
+        """Load a saved event and show its best times from the stored vote totals"""
+        path, _ = QFileDialog.getOpenFileName(self, "Open Event", "", "Event files (*.db)")
+        if not path:
+            return
+        
+        self.close_event_file()
+        try:
+            database = RosterDatabase(path)
+            records = database.load_records()
+        except Exception as e:
+            QMessageBox.critical(self, "Open Failed", f"Could not open '{path}': {e}")
+            return
         
-        self.tableWidget.setCellWidget(row, column, container)
+        self.roster_model.clear()
+        self.roster_model.add_records(records)
+        self.event_sync = EventSync(self.roster_model, database, [record['id'] for record in records], self)
+        
+        # Best times come from the stored aggregates - nobody is rescanned
+        day_one_result, day_two_result = database.calculate_separate_day_times()
+        self.last_day_one_result = day_one_result
+        self.last_day_two_result = day_two_result
+        self.display_results(day_one_result, day_two_result)
+        self.statusBar().showMessage(f"Opened {len(records)} participants from {path}", 5000)
 
-    def get_all_selections(self):
-        """Extract all user selections from the GUI table"""
-        selections = []
-        for row in range(self.tableWidget.rowCount()):
-            user_name = self.tableWidget.item(row, 0).text() if self.tableWidget.item(row, 0) else f"User {row + 1}"
-            
-            # Get day one selection
-            day_one_widget = self.tableWidget.cellWidget(row, 1)
-            if day_one_widget and hasattr(day_one_widget, 'start_combo'):
-                day_one_start = day_one_widget.start_combo.currentText()
-                day_one_end = day_one_widget.end_combo.currentText()
-                if day_one_start != "Start" and day_one_end != "End":
-                    day_one_time = f"{day_one_start} - {day_one_end}"
-                else:
-                    day_one_time = "Not selected"
-            else:
-                day_one_time = "Not selected"
-            
-            # Get day two selection
-            day_two_widget = self.tableWidget.cellWidget(row, 2)
-            if day_two_widget and hasattr(day_two_widget, 'start_combo'):
-                day_two_start = day_two_widget.start_combo.currentText()
-                day_two_end = day_two_widget.end_combo.currentText()
-                if day_two_start != "Start" and day_two_end != "End":
-                    day_two_time = f"{day_two_start} - {day_two_end}"
-                else:
-                    day_two_time = "Not selected"
-            else:
-                day_two_time = "Not selected"
-            
-            selections.append({
-                'user': user_name,
-                'day_one': day_one_time,
-                'day_two': day_two_time
-            })
+    def save_event(self):
+        """Save the roster to an event file; later edits are saved as they are made"""
+        path, _ = QFileDialog.getSaveFileName(self, "Save Event", "", "Event files (*.db)")
+        if not path:
+            return
+        
+        self.close_event_file()
+        try:
+            database = RosterDatabase(path)
+            database.clear()
+            participant_ids = database.add_records(self.roster_model.get_selections())
+        except Exception as e:
+            QMessageBox.critical(self, "Save Failed", f"Could not save '{path}': {e}")
+            return
         
-        return selections
+        self.event_sync = EventSync(self.roster_model, database, participant_ids, self)
+        self.statusBar().showMessage(f"Saved {len(participant_ids)} participants to {path}", 5000)
+
+    def close_event_file(self):
+        """Stop writing edits to the current event file, if any"""
+        if self.event_sync is not None:
+            self.event_sync.detach()
+            self.event_sync = None
+
+    def get_all_selections(self):
+        """Extract all user selections from the roster model as text ranges"""
+        return self.roster_model.get_text_selections()
+
+    def get_structured_selections(self):
+        """
+        Extract all user selections as (start_minute, end_minute) tuples straight from the model
+        Same shape as get_all_selections, but a day is None instead of "Not selected" and no text is built
+        """
+        return self.roster_model.get_selections()
 
     def calculate_best_times(self):
-        """Calculate the best meeting times using the imported algorithm"""
-        user_data = self.get_all_selections()
+        """Calculate the best meeting times in the background (pressing Calculate again cancels)"""
+        if self.calculation_worker is not None:
+            self.cancel_calculation()
+            return
         
-        # Print debug info
-        print("=== Meeting Time Picker (GUI Version) ===")
-        print("Participant availability:")
-        for user in user_data:
-            print(f"Name: {user['user']}")
-            print(f"  Day 1: {user['day_one']}")
-            print(f"  Day 2: {user['day_two']}")
+        # Unchanged roster - answer straight from the session's result cache
+        fingerprint = self.roster_model.fingerprint()
+        cached = self.session.lookup_separate_day_times(fingerprint)
+        if cached is not None:
+            self.last_day_one_result, self.last_day_two_result = cached
+            self.display_results(*cached)
+            self.statusBar().showMessage("Results unchanged (cached)", 5000)
+            return
         
-        try:
-            # Use the imported calculation function
-            day_one_result, day_two_result = meeting_calculator.calculate_separate_day_times(user_data)
-            
-            # Store results for export functionality
-            self.last_day_one_result = day_one_result
-            self.last_day_two_result = day_two_result
-            
-            # Display results
-            self.display_results(day_one_result, day_two_result)
-            
-            # Print to console
-            print(f"\nBest Day One meeting time: {day_one_result}")
-            print(f"Best Day Two meeting time: {day_two_result}")
-            
-            # Print debug info from the calculator
-            meeting_calculator.print_debug_info()
-            
-        except Exception as e:
-            print(f"Error in calculation: {e}")
+        self.start_calculation(fingerprint)
+
+    def start_calculation(self, fingerprint, build_participants=False):
+        """Hand the current roster to a CalculationWorker (build_participants: an export needs them afterwards)"""
+        user_data = self.get_structured_selections()
+        
+        worker = CalculationWorker(self.session, user_data, self.roster_generation, fingerprint,
+                                   build_participants=build_participants)
+        worker.signals.progress.connect(self.on_calculation_progress)
+        worker.signals.finished.connect(self.on_calculation_finished)
+        worker.signals.failed.connect(self.on_calculation_failed)
+        worker.signals.cancelled.connect(self.on_calculation_cancelled)
+        
+        self.calculation_worker = worker
+        self.pushButton_2.setText("Cancel")
+        self.statusBar().showMessage("Calculating...")
+        self.thread_pool.start(worker)
+
+    def cancel_calculation(self):
+        """Stop the running calculation, if any"""
+        if self.calculation_worker is not None:
+            self.calculation_worker.cancel()
+
+    def on_roster_changed(self, *args):
+        """Any roster edit makes a running calculation stale"""
+        self.roster_generation += 1
+        self.cancel_calculation()
+
+    def is_current_calculation(self, generation):
+        """True if a worker signal belongs to the calculation we are still waiting for"""
+        worker = self.calculation_worker
+        return worker is not None and worker.generation == generation
+
+    def finish_calculation(self, message, completed=False):
+        """Reset the Calculate button once the worker is done (completed: results for the current roster arrived)"""
+        self.calculation_worker = None
+        self.pushButton_2.setText("Calculate")
+        self.statusBar().showMessage(message, 5000)
+        
+        # An export was waiting for this calculation - run it now, or give up if it didn't finish
+        action, self.pending_export = self.pending_export, None
+        if action is not None:
+            self.pushButton_3.setEnabled(True)
+            if completed:
+                self.run_export(action)
+            else:
+                self.statusBar().showMessage(f"{message} - export cancelled", 5000)
+
+    def on_calculation_progress(self, generation, done, total):
+        """Show worker progress in the status bar"""
+        if self.is_current_calculation(generation):
+            self.statusBar().showMessage(f"Calculating... {done}/{total} participants")
+
+    def on_calculation_finished(self, generation, day_one_result, day_two_result):
+        """Display results delivered by the worker, dropping them if the roster changed meanwhile"""
+        if not self.is_current_calculation(generation):
+            return
+        
+        if generation != self.roster_generation:
+            self.finish_calculation("Roster changed during calculation - results discarded")
+            return
+        
+        # Store results for export functionality
+        self.last_day_one_result = day_one_result
+        self.last_day_two_result = day_two_result
+        
+        # Display results
+        self.display_results(day_one_result, day_two_result)
+        self.finish_calculation("Calculation finished", completed=True)
+
+    def on_calculation_failed(self, generation, message):
+        """Show an error result if the worker failed"""
+        if self.is_current_calculation(generation):
             self.display_results("Error in calculation", "Error in calculation")
+            self.finish_calculation(f"Error in calculation: {message}")
+
+    def on_calculation_cancelled(self, generation):
+        """Worker stopped early - either the user cancelled or the roster changed"""
+        if self.is_current_calculation(generation):
+            if generation != self.roster_generation:
+                self.finish_calculation("Roster changed during calculation - press Calculate again")
+            else:
+                self.finish_calculation("Calculation cancelled")
+
+    def on_live_results(self, day_one_result, day_two_result):
+        """Show results pushed by the live recalculator"""
+        self.last_day_one_result = day_one_result
+        self.last_day_two_result = day_two_result
+        self.display_results(day_one_result, day_two_result)
 
     def display_results(self, day_one_result, day_two_result):
         """Display calculation results in the results table"""
@@ -308,26 +418,120 @@ class MainWindow(QMainWindow):
                                       new_width, current_geometry.height())
 
     def export_results(self):
-        """Export meeting results using email code"""
+        """Export meeting results - email them, or save them as a calendar, CSV or JSON file"""
         # Check if we have calculated results
         if not hasattr(self, 'last_day_one_result') or not self.last_day_one_result:
             QMessageBox.warning(self, "No Results", "Please calculate meeting times first before exporting.")
             return
         
+        menu = QMenu(self)
+        menu.addAction("Email Invitations...", lambda: self.run_export(self.email_results))
+        menu.addAction("Save as Calendar (.ics)...", lambda: self.run_export(lambda: self.save_results('.ics')))
+        menu.addAction("Save as CSV...", lambda: self.run_export(lambda: self.save_results('.csv')))
+        menu.addAction("Save as JSON...", lambda: self.run_export(lambda: self.save_results('.json')))
+        menu.exec_(self.pushButton_3.mapToGlobal(self.pushButton_3.rect().bottomLeft()))
+
+    def run_export(self, action):
+        """
+        Run an export once the session's participants match the table (live, reopened-event and edited
+        rosters included). If they don't, the calculation runs on the worker and the export waits for it
+        with Export disabled - the session lock is never taken here while a worker may hold it.
+        """
+        if self.calculation_worker is None:
+            fingerprint = self.roster_model.fingerprint()
+            if self.session.has_participants(fingerprint):
+                action()
+                return
+            self.start_calculation(fingerprint, build_participants=True)
+        
+        self.pending_export = action
+        self.pushButton_3.setEnabled(False)
+        self.statusBar().showMessage("Calculating before export...")
+
+    def get_export_participants(self):
+        """
+        The session's participants (run_export has already brought them up to date with the table)
+        Returns: the ParticipantStore, or None (after warning) if there is nobody to export
+        """
         # Get participants data from the meeting calculator
-        participants_data = meeting_calculator.get_participants_data()
+        participants_data = self.session.get_participants_data()
         
         # Check if we have participants data
         if not participants_data:
             QMessageBox.warning(self, "No Participants", "No participant data available for export.")
+            return None
+        return participants_data
+
+    def save_results(self, extension):
+        """Write best times, slot votes and everyone's availability to a file"""
+        participants_data = self.get_export_participants()
+        if participants_data is None:
+            return
+        
+        file_filters = {'.ics': "Calendar files (*.ics)", '.csv': "CSV files (*.csv)", '.json': "JSON files (*.json)"}
+        path, _ = QFileDialog.getSaveFileName(self, "Save Results", f"meeting_results{extension}",
+                                              file_filters[extension])
+        if not path:
+            return
+        if not path.lower().endswith(extension):
+            path += extension
+        
+        start_date = None
+        votes_path = None
+        if extension == '.csv':
+            # The save dialog only asked about the main file - don't silently replace the vote counts next to it
+            votes_path = result_export.votes_csv_path(path)
+            if os.path.exists(votes_path):
+                reply = QMessageBox.question(self, "Replace Vote Counts?",
+                                             f"'{os.path.basename(votes_path)}' already exists. Replace it?\n\n"
+                                             "Choose No to save the vote counts somewhere else.",
+                                             QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+                if reply == QMessageBox.Cancel:
+                    return
+                if reply == QMessageBox.No:
+                    votes_path, _ = QFileDialog.getSaveFileName(self, "Save Vote Counts", votes_path,
+                                                                file_filters['.csv'])
+                    if not votes_path:
+                        return
+        elif extension == '.ics':
+            # The roster only knows "day one", "day two" - the calendar needs real dates
+            tomorrow = (date.today() + timedelta(days=1)).isoformat()
+            text, ok = QInputDialog.getText(self, "Meeting Date", "Date of day one (YYYY-MM-DD):", text=tomorrow)
+            if not ok:
+                return
+            try:
+                start_date = date.fromisoformat(text.strip())
+            except ValueError:
+                QMessageBox.warning(self, "Invalid Date", f"'{text}' is not a date like {tomorrow}.")
+                return
+        
+        try:
+            written = result_export.export_results(path, participants_data, start_date, votes_path=votes_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Export Failed", f"Could not save '{path}': {e}")
+            return
+        self.statusBar().showMessage(f"Saved {len(participants_data)} participants to {', '.join(written)}", 5000)
+
+    def email_results(self):
+        """Email the results to the participants (sending runs in the background)"""
+        participants_data = self.get_export_participants()
+        if participants_data is None:
             return
         
-        # Open export dialog using email functionality
-        success = open_export_dialog(self.last_day_one_result, self.last_day_two_result, participants_data, self)
-        if success:
-            print("✅ Email sent successfully using email code!")
+        # Open export dialog using email functionality (sending runs in the background)
+        self.export_dialog = open_export_dialog(self.last_day_one_result, self.last_day_two_result,
+                                                participants_data, self,
+                                                fingerprint=self.roster_model.fingerprint())
+        self.export_dialog.sending_finished.connect(self.on_export_sent)
+
+    def on_export_sent(self, results, cancelled):
+        """Log the real outcome of a background email send"""
+        sent = sum(1 for error in results.values() if error is None)
+        if sent == len(results) and not cancelled:
+            print(f"✅ Email sent successfully to {sent} recipients!")
         else:
-            print("❌ Email cancelled or failed")
+            print(f"❌ Email sent to {sent} of {len(results)} recipients{' (stopped)' if cancelled else ''}")
+        self.statusBar().showMessage(f"Email sent to {sent} of {len(results)} recipients", 5000)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""
+Availability Matrix Module
+Stores participant availability as a compact participant x slot matrix.
+Each participant is one row, held as a Python integer bitmask with one bit per
+hourly slot, so vote counts come from a single column-sum instead of hashing
+formatted time strings into dictionaries.
+"""
+
+from collections import Counter
+
+# One bit per hour of the day (bit 9 = "9:00 AM - 10:00 AM")
+SLOTS_PER_DAY = 24
+
+
+def slot_range_to_mask(start_slot, end_slot):
+    """Convert a slot range like (9, 14) into a bitmask with bits 9..13 set"""
+    if end_slot <= start_slot:
+        return 0
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
+
+
+def mask_to_slots(mask):
+    """Return the indices of the set bits in a mask, lowest first"""
+    slots = []
+    while mask:
+        low_bit = mask & -mask
+        slots.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return slots
+
+
+def pack_day_masks(day_masks, slots_per_day=SLOTS_PER_DAY):
+    """Pack per-day slot masks into one row: day d occupies bits d * slots_per_day and up"""
+    day_mask = (1 << slots_per_day) - 1
+    row = 0
+    for day, mask in enumerate(day_masks):
+        row |= (mask & day_mask) << (day * slots_per_day)
+    return row
+
+
+def top_slots(counts):
+    """
+    Find the slot(s) with the most votes
+    Returns: tuple of (max_votes, [slot indices]) - max_votes is 0 when nobody voted
+    """
+    max_votes = max(counts, default=0)
+    if max_votes == 0:
+        return 0, []
+    return max_votes, [slot for slot, votes in enumerate(counts) if votes == max_votes]
+
+
+def weighted_column_sums(rows, weights, slot_count):
+    """
+    Weighted column-sum over bitmask rows: sums[slot] is the total weight of the rows with
+    that slot set. Weights of identical rows are merged before the per-bit pass.
+    """
+    grouped = {}
+    for row, weight in zip(rows, weights):
+        if row:
+            grouped[row] = grouped.get(row, 0) + weight
+
+    sums = [0] * slot_count
+    for row, weight in grouped.items():
+        for slot in mask_to_slots(row):
+            sums[slot] += weight
+    return sums
+
+
+class AvailabilityMatrix:
+    """
+    Participant x slot availability matrix backed by integer bitmasks
+
+    Each row packs every day into one integer: day d occupies bits
+    d * slots_per_day .. (d + 1) * slots_per_day - 1.
+    """
+
+    def __init__(self, day_count=2, slots_per_day=SLOTS_PER_DAY):
+        self.day_count = day_count
+        self.slots_per_day = slots_per_day
+        self.day_mask = (1 << slots_per_day) - 1
+        self.full_mask = (1 << (day_count * slots_per_day)) - 1
+        self.names = []
+        self.rows = []
+        self.name_index = {}
+        self._counts = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add_participant(self, name, day_masks):
+        """Add a participant row from a list of per-day slot masks"""
+        self.name_index.setdefault(name, len(self.rows))
+        self.names.append(name)
+        self.rows.append(pack_day_masks(day_masks[:self.day_count], self.slots_per_day))
+        self._counts = None
+
+    def get_day_mask(self, index, day):
+        """Get one participant's slot mask for a single day"""
+        return (self.rows[index] >> (day * self.slots_per_day)) & self.day_mask
+
+    def column_counts(self):
+        """
+        Sum every column of the matrix in one pass
+        Identical rows are grouped first, so the per-bit work depends on the
+        number of distinct availability patterns rather than the roster size.
+        The result is cached until the next participant is added.
+        """
+        if self._counts is None:
+            counts = [0] * (self.day_count * self.slots_per_day)
+            for row, repeats in Counter(self.rows).items():
+                for slot in mask_to_slots(row):
+                    counts[slot] += repeats
+            self._counts = counts
+        return list(self._counts)
+
+    def intersect_rows(self, indices):
+        """Bitwise AND of the given rows - the slots where every one of those participants is free"""
+        mask = self.full_mask
+        for index in indices:
+            mask &= self.rows[index]
+        return mask
+
+    def rank_with_required(self, required_indices):
+        """
+        Keep only the slots where every required participant is free, then rank them by
+        how many optional participants can also attend. Optional counts are the cached
+        column counts minus the required people, so a query costs O(required + slots).
+        Slots nobody can attend are left out (with no required people every slot would pass).
+        Returns: list of (slot, optional_votes), most optional attendees first
+        """
+        required = set(required_indices)
+        mask = self.intersect_rows(required)
+        if self._counts is None:
+            self.column_counts()
+        ranked = [(slot, self._counts[slot] - len(required)) for slot in mask_to_slots(mask) if self._counts[slot]]
+        ranked.sort(key=lambda item: -item[1])
+        return ranked
+
+    def day_counts(self):
+        """Return the column counts split into one list per day"""
+        counts = self.column_counts()
+        size = self.slots_per_day
+        return [counts[day * size:(day + 1) * size] for day in range(self.day_count)]
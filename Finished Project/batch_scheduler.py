@@ -0,0 +1,143 @@
+"""
+Batch Scheduler Module
+Headless command line entry point for scheduling many meetings at once.
+Every roster file (CSV or JSON Lines, see roster_import.py, or a binary
+snapshot, see roster_snapshot.py) is calculated in
+its own worker process, so a nightly run over hundreds of teams uses every
+core. Results are written as JSON or CSV instead of being shown in the GUI.
+
+Usage:
+    python batch_scheduler.py rosters/ extra_team.csv --format csv --output results.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import meeting_calculator
+import roster_import
+from roster_snapshot import SNAPSHOT_EXTENSION, RosterSnapshot
+
+ROSTER_EXTENSIONS = ('.csv', '.jsonl', '.ndjson', SNAPSHOT_EXTENSION)
+CSV_COLUMNS = ['roster', 'participants', 'day', 'max_votes', 'times', 'result', 'error']
+
+
+def collect_roster_files(paths):
+    """Expand the given files/directories into a sorted list of roster files"""
+    roster_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for file_name in sorted(os.listdir(path)):
+                if file_name.lower().endswith(ROSTER_EXTENSIONS):
+                    roster_files.append(os.path.join(path, file_name))
+        else:
+            roster_files.append(path)
+    return roster_files
+
+
+def schedule_roster_file(path, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Calculate the best times for one roster file (runs inside a worker process)
+    Errors are reported in the result instead of raised, so one bad file doesn't stop the batch.
+    Returns: dict with 'roster', 'participants', 'days' (day -> {'max_votes', 'times', 'result'}) and 'error'
+    """
+    result = {'roster': path, 'participants': 0, 'days': {}, 'error': None}
+    try:
+        if path.lower().endswith(SNAPSHOT_EXTENSION):
+            # Snapshots are tallied straight from the mapped file
+            with RosterSnapshot(path, day_keys) as snapshot:
+                participant_count = len(snapshot)
+                day_counts = snapshot.day_counts()
+        else:
+            # Parse warnings go to stderr so they can't end up inside the JSON/CSV on stdout
+            with contextlib.redirect_stdout(sys.stderr):
+                tally = roster_import.import_into_tally(path, day_keys=day_keys)
+            participant_count = len(tally)
+            day_counts = tally.day_counts()
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+        return result
+    except Exception as e:
+        # Anything else (csv.Error, a truncated snapshot, ...) still only fails this file
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    result['participants'] = participant_count
+    for day_key, day_result in meeting_calculator.summarize_day_counts(day_counts, day_keys).items():
+        result['days'][day_key] = dict(day_result, result=meeting_calculator.format_day_result(
+            day_result, f"No {day_key.replace('_', ' ')} times selected"))
+    return result
+
+
+def schedule_rosters(roster_files, workers=None):
+    """
+    Calculate every roster in a process pool
+    Returns: list of results in the same order as roster_files
+    """
+    if not roster_files:
+        return []
+    workers = workers or os.cpu_count() or 1
+    # Hand each process several small rosters at a time to keep pickling overhead down
+    chunk_size = max(1, len(roster_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(schedule_roster_file, roster_files, chunksize=chunk_size))
+
+
+def write_json(results, output):
+    """Write the results as one JSON document"""
+    json.dump(results, output, indent=2)
+    output.write('\n')
+
+
+def write_csv(results, output):
+    """Write the results as CSV, one row per roster per day"""
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for result in results:
+        if result['error']:
+            writer.writerow({'roster': result['roster'], 'error': result['error']})
+            continue
+        for day_key, day_result in result['days'].items():
+            writer.writerow({
+                'roster': result['roster'],
+                'participants': result['participants'],
+                'day': day_key,
+                'max_votes': day_result['max_votes'],
+                'times': '; '.join(day_result['times']),
+                'result': day_result['result'],
+                'error': ''
+            })
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Calculate the best meeting times for many roster files.")
+    parser.add_argument('paths', nargs='+', help="roster files (.csv/.jsonl/.ndjson) or directories of them")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help="output format (default: json)")
+    parser.add_argument('--output', help="file to write results to (default: stdout)")
+    parser.add_argument('--workers', type=int, help="number of worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    roster_files = collect_roster_files(args.paths)
+    if not roster_files:
+        parser.error("no roster files found")
+    results = schedule_rosters(roster_files, args.workers)
+
+    writer = write_csv if args.format == 'csv' else write_json
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as output:
+            writer(results, output)
+    else:
+        writer(results, sys.stdout)
+
+    failed = sum(1 for result in results if result['error'])
+    print(f"Scheduled {len(results) - failed} of {len(results)} rosters", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Calculation Worker Module
+Runs the meeting time calculation on a QThreadPool thread so the main window
+stays responsive. Progress, results and errors come back to the GUI thread
+through Qt signals, and a running calculation can be cancelled.
+"""
+
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+import meeting_calculator
+
+
+class CalculationSignals(QObject):
+    """Signals emitted by a CalculationWorker - every signal carries the roster generation it was started for"""
+    progress = pyqtSignal(int, int, int)   # generation, rows processed, total rows
+    finished = pyqtSignal(int, str, str)   # generation, day one result, day two result
+    failed = pyqtSignal(int, str)          # generation, error message
+    cancelled = pyqtSignal(int)            # generation
+
+
+class CalculationWorker(QRunnable):
+    """Background job that calculates the best times for one snapshot of the roster"""
+
+    def __init__(self, session, user_data, generation, fingerprint=None, debug=False, build_participants=False):
+        super().__init__()
+        self.session = session
+        self.user_data = user_data
+        self.generation = generation
+        self.fingerprint = fingerprint
+        self.build_participants = build_participants   # an export is waiting for the participants too
+        self.debug = debug   # dump every row to the console (slow on big rosters)
+        self.signals = CalculationSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the worker to stop at its next progress checkpoint"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """Cancel check passed to the calculator"""
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """Calculate on the worker thread and report back through signals"""
+        try:
+            if self.debug:
+                print("=== Meeting Time Picker (GUI Version) ===")
+                print("Participant availability:")
+                for user in self.user_data:
+                    print(f"Name: {user['user']}")
+                    print(f"  Day 1: {meeting_calculator.format_selection(user['day_one'])}")
+                    print(f"  Day 2: {meeting_calculator.format_selection(user['day_two'])}")
+
+            day_one_result, day_two_result = self.session.calculate_separate_day_times(
+                self.user_data,
+                progress_callback=self.report_progress,
+                cancel_check=self.is_cancelled,
+                fingerprint=self.fingerprint
+            )
+
+            if self.build_participants:
+                # After a cache hit they are rebuilt on first use - do that here, not on the GUI thread
+                self.session.get_participants_data()
+
+            # Print to console
+            print(f"\nBest Day One meeting time: {day_one_result}")
+            print(f"Best Day Two meeting time: {day_two_result}")
+
+            if self.debug:
+                self.session.print_debug_info()
+
+            self.signals.finished.emit(self.generation, day_one_result, day_two_result)
+
+        except meeting_calculator.CalculationCancelled:
+            self.signals.cancelled.emit(self.generation)
+        except Exception as e:
+            print(f"Error in calculation: {e}")
+            self.signals.failed.emit(self.generation, str(e))
+
+    def report_progress(self, done, total):
+        """Progress callback passed to the calculator"""
+        self.signals.progress.emit(self.generation, done, total)
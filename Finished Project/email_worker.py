@@ -0,0 +1,75 @@
+"""
+Email Worker Module
+Delivers queued export emails on a background thread so the dialog (and
+the main window) stay responsive. Messages are first written to the durable
+outbox (see outbox.py); the worker drains them through one pooled
+MailTransport with at most `concurrency` SMTP conversations at a time.
+Personalized invitations are rendered and queued on the worker thread too,
+straight from a generator (see invitation_template.py). Progress and the
+real per-recipient results come back through Qt signals, and a send can be
+cancelled between batches - unsent mail stays queued.
+"""
+
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from mail_calc import MailTransport
+from outbox import DEFAULT_CONCURRENCY, DEFAULT_OUTBOX_PATH, QUEUED_ERROR, Outbox, deliver_outbox
+
+# Result given to recipients that were left in the outbox by a cancelled send
+CANCELLED_ERROR = QUEUED_ERROR
+
+
+class EmailSignals(QObject):
+    """Signals emitted by an EmailSendWorker"""
+    progress = pyqtSignal(int, int, int)   # sent, failed, remaining
+    finished = pyqtSignal(dict, bool)      # recipient -> None or error message, cancelled
+    failed = pyqtSignal(str)               # error message (outbox or transport could not be used)
+
+
+class EmailSendWorker(QRunnable):
+    """Background job that delivers queued outbox messages"""
+
+    def __init__(self, sender_email, sender_password, message_ids=None, outbox_path=DEFAULT_OUTBOX_PATH,
+                 concurrency=DEFAULT_CONCURRENCY, transport_options=None, campaign=None, messages=None):
+        """
+        message_ids: already queued messages to deliver, or
+        campaign + messages: a stream of (message, recipients) to queue under the campaign first
+        """
+        super().__init__()
+        self.message_ids = None if message_ids is None else list(message_ids)
+        self.campaign = campaign
+        self.messages = messages
+        self.outbox_path = outbox_path
+        self.concurrency = concurrency
+        self.transport = MailTransport(sender_email, sender_password, pool_size=concurrency,
+                                       **(transport_options or {}))
+        self.signals = EmailSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop after the batches that are already being sent (the rest stay queued)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """Drain the messages from the outbox and report as batches complete"""
+        try:
+            # SQLite connections belong to one thread, so the worker opens its own
+            with Outbox(self.outbox_path) as outbox:
+                if self.messages is not None:
+                    outbox.enqueue_many(self.messages, self.transport.sender_email, self.campaign)
+                    self.messages = None
+                results = deliver_outbox(outbox, self.transport, self.message_ids, self.concurrency,
+                                         progress_callback=self.signals.progress.emit,
+                                         cancel_check=self.is_cancelled, campaign=self.campaign)
+        except Exception as e:
+            print(f"Error delivering email: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            self.transport.close()
+        self.signals.finished.emit(results, self.is_cancelled())
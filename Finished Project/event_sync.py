@@ -0,0 +1,63 @@
+"""
+Event Sync Module
+Mirrors edits made in the roster table into a RosterDatabase as they happen.
+Each edited cell becomes one single-row transaction (rename or one day's
+selection), inserted batches such as imports are written in one transaction,
+and removed rows are deleted along with their votes.
+"""
+
+from PyQt5.QtCore import QObject
+
+import meeting_calculator
+
+
+class EventSync(QObject):
+    """Keeps a RosterDatabase in step with a RosterModel, row for row"""
+
+    def __init__(self, roster_model, database, participant_ids, parent=None):
+        super().__init__(parent)
+        self.roster_model = roster_model
+        self.database = database
+        # Database id for every table row, in row order
+        self.participant_ids = list(participant_ids)
+
+        roster_model.dataChanged.connect(self.on_data_changed)
+        roster_model.rowsInserted.connect(self.on_rows_inserted)
+        roster_model.rowsAboutToBeRemoved.connect(self.on_rows_removed)
+        roster_model.modelReset.connect(self.on_model_reset)
+
+    def detach(self):
+        """Stop following the model and close the database"""
+        self.roster_model.dataChanged.disconnect(self.on_data_changed)
+        self.roster_model.rowsInserted.disconnect(self.on_rows_inserted)
+        self.roster_model.rowsAboutToBeRemoved.disconnect(self.on_rows_removed)
+        self.roster_model.modelReset.disconnect(self.on_model_reset)
+        self.database.close()
+
+    def on_data_changed(self, top_left, bottom_right, roles=None):
+        """Write each changed cell as its own small transaction"""
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            selection = self.roster_model.get_row_selection(row)
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                if column == 0:
+                    self.database.rename_participant(self.participant_ids[row], selection['user'])
+                else:
+                    day = column - 1
+                    self.database.update_selection(self.participant_ids[row], day,
+                                                   selection[meeting_calculator.DAY_KEYS[day]])
+
+    def on_rows_inserted(self, parent, first, last):
+        """Store new rows - a whole imported batch goes in as one transaction"""
+        records = [self.roster_model.get_row_selection(row) for row in range(first, last + 1)]
+        self.participant_ids[first:first] = self.database.add_records(records)
+
+    def on_rows_removed(self, parent, first, last):
+        """Delete rows (and their votes) before the model forgets them"""
+        for participant_id in self.participant_ids[first:last + 1]:
+            self.database.remove_participant(participant_id)
+        del self.participant_ids[first:last + 1]
+
+    def on_model_reset(self):
+        """Rewrite the whole event after the model was reset"""
+        self.database.clear()
+        self.participant_ids = self.database.add_records(self.roster_model.get_selections())
@@ -3,19 +3,37 @@ Export Dialog for GUI - Uses email code
 This file handles the GUI for sending emails, keeping it separate from the main GUI
 """
 
+import uuid
+
+from PyQt5.QtCore import QThreadPool, pyqtSignal
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QLineEdit, QPushButton, QTextEdit, QMessageBox)
-from mail_calc import send_email  # Import from mail_calc.py
+                           QLineEdit, QPushButton, QTextEdit, QMessageBox, QProgressBar)
+from email_worker import CANCELLED_ERROR, EmailSendWorker  # Sends through mail_calc.py in the background
+from invitation_template import (DEFAULT_TEMPLATE, RECIPIENT_FIELDS, SHARED_FIELDS, InvitationTemplate,
+                                 RecipientDirectory, iter_invitation_messages, shared_fields, split_recipients)
+from mail_calc import build_message
+from outbox import DEFAULT_OUTBOX_PATH, Outbox
+from meeting_calculator import ResultCache
+
+# Recipient directories and shared invitation text, keyed by roster fingerprint and results
+invitation_cache = ResultCache(max_entries=8)
 
 
 class ExportDialog(QDialog):
-    """Email export dialog that uses send_email function"""
+    """Email export dialog - sending runs on a background worker (see email_worker.py)"""
     
-    def __init__(self, day_one_result, day_two_result, participants_data, parent=None):
+    sending_finished = pyqtSignal(dict, bool)  # recipient -> None or error message, cancelled
+    
+    def __init__(self, day_one_result, day_two_result, participants_data, parent=None, fingerprint=None):
         super().__init__(parent)
         self.day_one_result = day_one_result
         self.day_two_result = day_two_result
         self.participants_data = participants_data
+        self.fingerprint = fingerprint
+        self.send_worker = None
+        # Trying again from this dialog retries the same send (delivered recipients are skipped);
+        # a new dialog is a new send
+        self.send_id = uuid.uuid4().hex
         self.setup_ui()
     
     def setup_ui(self):
@@ -59,13 +77,19 @@ class ExportDialog(QDialog):
         
         self.recipients = QTextEdit()
         self.recipients.setMaximumHeight(100)
-        # Generate placeholder emails based on participant names
-        placeholder_emails = []
-        for person in self.participants_data:
-            name = person['name'].lower().replace(' ', '')
-            placeholder_emails.append(f"{name}@example.com")
-        self.recipients.setPlainText("\n".join(placeholder_emails))
+        # Participants' own addresses - anyone who didn't give one is left off and listed below
+        addresses, self.missing_emails = split_recipients(self.participants_data)
+        self.recipients.setPlainText("\n".join(addresses))
         layout.addWidget(self.recipients)
+        if self.missing_emails:
+            names = ", ".join(self.missing_emails[:10])
+            if len(self.missing_emails) > 10:
+                names += f" and {len(self.missing_emails) - 10} more"
+            missing_label = QLabel(f"{len(self.missing_emails)} participant(s) have no email address and "
+                                   f"won't be sent an invitation: {names}")
+            missing_label.setWordWrap(True)
+            missing_label.setStyleSheet("color: #b36b00;")
+            layout.addWidget(missing_label)
         
         # Email content
         content_label = QLabel("Email Content:")
@@ -83,58 +107,60 @@ class ExportDialog(QDialog):
         # Body
         body_label = QLabel("Message:")
         layout.addWidget(body_label)
+        fields_label = QLabel("Filled in for each recipient: " + " ".join(f"{{{field}}}" for field in RECIPIENT_FIELDS)
+                              + "   Shared: " + " ".join(f"{{{field}}}" for field in SHARED_FIELDS))
+        fields_label.setStyleSheet("color: gray;")
+        layout.addWidget(fields_label)
         
         self.body = QTextEdit()
         self.body.setPlainText(self.generate_email_body())
         layout.addWidget(self.body)
         
+        # Sending progress (hidden until a send starts)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        self.progress_label = QLabel()
+        self.progress_label.hide()
+        layout.addWidget(self.progress_label)
+        
         # Buttons
         button_layout = QHBoxLayout()
         
-        send_btn = QPushButton("Send Email")
-        send_btn.clicked.connect(self.send_email)
-        send_btn.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
+        self.send_btn = QPushButton("Send Email")
+        self.send_btn.clicked.connect(self.send_email)
+        self.send_btn.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         
-        cancel_btn = QPushButton("Cancel")
-        cancel_btn.clicked.connect(self.reject)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.reject)
         
-        button_layout.addWidget(cancel_btn)
-        button_layout.addWidget(send_btn)
+        button_layout.addWidget(self.cancel_btn)
+        button_layout.addWidget(self.send_btn)
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
     
     def generate_email_body(self):
-        """Create email body with meeting results"""
-        # Start with basic message
-        body_lines = []
-        
-        # Add meeting times
-        if self.day_one_result and self.day_one_result != "No day one times selected":
-            body_lines.append(f"Day One meeting time: {self.day_one_result}")
-        
-        if self.day_two_result and self.day_two_result != "No day two times selected":
-            body_lines.append(f"Day Two meeting time: {self.day_two_result}")
-        
-        if not body_lines:
-            body_lines.append("Meeting time: TBD")
-        
-        # Add main message 
-        main_message = "A team meeting has been scheduled."
-        if body_lines:
-            main_message += "\n\nScheduled times:\n" + "\n".join(body_lines)
-        
-        # Add participants
-        main_message += "\n\nParticipants:\n"
-        for person in self.participants_data:
-            main_message += f"• {person['name']}\n"
-        
-        main_message += "\nPlease confirm your attendance."
-        
-        return main_message
+        """The invitation template shown in the message box - its {fields} are filled in when sending"""
+        return DEFAULT_TEMPLATE
+    
+    def invitation_data(self):
+        """
+        Recipient directory and shared fields for the invitations (reused while the roster and results are unchanged)
+        Returns: tuple of (RecipientDirectory, shared fields dict)
+        """
+        if self.fingerprint is None:
+            return self.build_invitation_data()
+        key = (self.fingerprint, self.day_one_result, self.day_two_result)
+        return invitation_cache.get_or_compute(key, self.build_invitation_data)
+    
+    def build_invitation_data(self):
+        """Index the participants by email and render the shared fields"""
+        directory = RecipientDirectory(self.participants_data)
+        return directory, shared_fields((self.day_one_result, self.day_two_result), self.participants_data)
     
     def send_email(self):
-        """Send email using send_email function"""
+        """Queue the invitations in the outbox and deliver them in the background; progress and results come back through signals"""
         # Get form data
         subject = self.subject.text().strip()
         body = self.body.toPlainText()
@@ -155,31 +181,115 @@ class ExportDialog(QDialog):
             return
         
         try:
-            # Use send_email function 
-            send_email(subject, body, sender_email, password, recipient_emails)
-            
-            # Show success message
-            QMessageBox.information(self, "Success", 
-                                  f"Email sent successfully to {len(recipient_emails)} recipients!")
+            template = InvitationTemplate(body)
+        except ValueError as e:
+            QMessageBox.warning(self, "Message Template", str(e))
+            return
+        directory, shared = self.invitation_data()
+        
+        # Written to disk first, so nothing is lost if sending fails partway or the app closes
+        if template.is_personalized():
+            # One message per recipient, rendered and queued on the worker thread as a stream
+            messages = iter_invitation_messages(template, subject, sender_email, directory, recipient_emails, shared)
+            worker = EmailSendWorker(sender_email, password, campaign=self.send_id, messages=messages)
+            counts = {'sent': 0, 'failed': 0, 'pending': len(set(recipient_emails)), 'sending': 0}
+        else:
+            # Same text for everyone - one message Bcc'd in chunks
+            msg = build_message(subject, template.render(shared), sender_email, "undisclosed-recipients:;")
+            try:
+                with Outbox(DEFAULT_OUTBOX_PATH) as outbox:
+                    message_id = outbox.enqueue(msg, recipient_emails, sender_email, campaign=self.send_id)
+                    counts = outbox.counts(sender_email, [message_id])
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Could not queue email: {e}")
+                return
+            worker = EmailSendWorker(sender_email, password, [message_id])
+        
+        worker.signals.progress.connect(self.on_send_progress)
+        worker.signals.finished.connect(self.on_send_finished)
+        worker.signals.failed.connect(self.on_send_failed)
+        self.send_worker = worker
+        
+        self.send_btn.setEnabled(False)
+        self.cancel_btn.setText("Stop Sending")
+        self.progress_bar.show()
+        self.progress_label.show()
+        self.on_send_progress(counts['sent'], counts['failed'], counts['pending'] + counts['sending'])
+        QThreadPool.globalInstance().start(worker)
+    
+    def reject(self):
+        """Cancel stops a running send first; the dialog closes once the worker reports back"""
+        if self.send_worker is not None:
+            self.send_worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.progress_label.setText(self.progress_label.text() + " - stopping...")
+            return
+        super().reject()
+    
+    def on_send_progress(self, sent, failed, remaining):
+        """Live sent/failed/remaining counts"""
+        self.progress_bar.setRange(0, sent + failed + remaining)
+        self.progress_bar.setValue(sent + failed)
+        self.progress_label.setText(f"Sent: {sent}   Failed: {failed}   Remaining: {remaining}")
+    
+    def on_send_finished(self, results, cancelled):
+        """Report the real per-recipient outcome"""
+        self.send_worker = None
+        self.sending_finished.emit(results, cancelled)
+        
+        failures = {recipient: error for recipient, error in results.items()
+                    if error is not None and error != CANCELLED_ERROR}
+        sent = sum(1 for error in results.values() if error is None)
+        not_sent = len(results) - sent - len(failures)
+        
+        if not failures and not cancelled:
+            message = f"Email sent successfully to {sent} recipients!"
+            if self.missing_emails:
+                message += f"\n{len(self.missing_emails)} participant(s) without an email address were skipped."
+            QMessageBox.information(self, "Success", message)
             self.accept()  # Close dialog
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to send email: {e}")
+            return
+        
+        summary = f"Sent to {sent} of {len(results)} recipients."
+        if not_sent:
+            summary += f"\n{not_sent} are still queued in the outbox and go out on the next send."
+        if failures:
+            details = "\n".join(f"{recipient}: {error}" for recipient, error in list(failures.items())[:10])
+            more = f"\n...and {len(failures) - 10} more" if len(failures) > 10 else ""
+            summary += f"\n\nFailed:\n{details}{more}"
+        QMessageBox.warning(self, "Email Not Fully Sent", summary)
+        
+        # Let the organizer fix the list and try again - already delivered recipients are skipped
+        self.reset_send_buttons()
+    
+    def on_send_failed(self, message):
+        """The outbox or mail transport could not be used at all"""
+        self.send_worker = None
+        QMessageBox.critical(self, "Error", f"Failed to send email: {message}")
+        self.reset_send_buttons()
+    
+    def reset_send_buttons(self):
+        """Allow another send after a partial or failed one"""
+        self.send_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setText("Close")
 
 
-def open_export_dialog(day_one_result, day_two_result, participants_data, parent=None):
+def open_export_dialog(day_one_result, day_two_result, participants_data, parent=None, fingerprint=None):
     """
     Convenience function to open the export dialog
+    The dialog is modeless, so the main window stays usable while emails are sending.
     
     Args:
         day_one_result: string with day one meeting result
         day_two_result: string with day two meeting result  
         participants_data: list of participant dictionaries
         parent: parent widget
+        fingerprint: roster fingerprint, lets the email body be reused between exports
     
     Returns:
-        True if email was sent, False if cancelled
+        the open ExportDialog - connect to sending_finished for the per-recipient results
     """
-    dialog = ExportDialog(day_one_result, day_two_result, participants_data, parent)
-    result = dialog.exec_()
-    return result == QDialog.Accepted
\ No newline at end of file
+    dialog = ExportDialog(day_one_result, day_two_result, participants_data, parent, fingerprint)
+    dialog.show()
+    return dialog
\ No newline at end of file
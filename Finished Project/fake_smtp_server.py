@@ -0,0 +1,123 @@
+"""
+Fake SMTP Server Module
+A small in-process SMTP server for the mail tests (test_mail_calc.py,
+test_outbox.py). It speaks just enough SMTP for smtplib and can be told to
+refuse recipients (550), defer them (451), reject the login (535) or drop
+the connection after a number of messages, and it records every connection
+and message it sees.
+"""
+
+import socketserver
+import threading
+
+
+class FakeSMTPServer:
+    """
+    Plain (non-SSL) SMTP server on 127.0.0.1, one thread per connection
+    rejected:    addresses answered with 550 at RCPT TO
+    deferred:    {address: n} - the first n RCPT TO attempts for that address get 451
+    auth:        None (no AUTH offered), 'accept' or 'reject' (535 for every login)
+    drop_after:  close a connection without warning after this many messages on it
+    """
+
+    def __init__(self, rejected=(), deferred=None, auth=None, drop_after=None):
+        self.rejected = set(rejected)
+        self.deferred = dict(deferred or {})
+        self.auth = auth
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = []   # (mail from, [accepted recipients], data bytes)
+        self.rcpt_attempts = {}
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server.handle_connection(self.rfile, self.wfile)
+
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def recipients(self):
+        """Every accepted recipient, in delivery order"""
+        return [recipient for _, recipients, _ in self.messages for recipient in recipients]
+
+    def handle_connection(self, rfile, wfile):
+        """Run one SMTP session until QUIT, a drop or the client going away"""
+        with self.lock:
+            self.connections += 1
+
+        def reply(line):
+            wfile.write(line.encode('ascii') + b'\r\n')
+            wfile.flush()
+
+        reply("220 fake.test ESMTP")
+        mail_from, recipients, sent_here = None, [], 0
+        for line in rfile:
+            command, _, argument = line.decode('utf-8', 'replace').rstrip('\r\n').partition(' ')
+            command = command.upper()
+            if command == 'EHLO':
+                reply("250-fake.test" + ("\r\n250-AUTH PLAIN" if self.auth else "") + "\r\n250 8BITMIME")
+            elif command == 'HELO':
+                reply("250 fake.test")
+            elif command == 'AUTH':
+                reply("235 Authenticated" if self.auth == 'accept' else "535 Bad credentials")
+            elif command == 'MAIL':
+                mail_from, recipients = _address(argument), []
+                reply("250 OK")
+            elif command == 'RCPT':
+                reply(self.check_recipient(_address(argument), recipients))
+            elif command == 'DATA':
+                if not recipients:
+                    reply("503 No valid recipients")
+                    continue
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b'.') else data_line)
+                with self.lock:
+                    self.messages.append((mail_from, recipients, b''.join(data)))
+                reply("250 Queued")
+                mail_from, recipients = None, []
+                sent_here += 1
+                if self.drop_after is not None and sent_here >= self.drop_after:
+                    return
+            elif command == 'RSET':
+                mail_from, recipients = None, []
+                reply("250 OK")
+            elif command == 'NOOP':
+                reply("250 OK")
+            elif command == 'QUIT':
+                reply("221 Bye")
+                return
+            else:
+                reply("500 Unknown command")
+
+    def check_recipient(self, address, recipients):
+        """The RCPT TO reply for one address (accepted ones are added to recipients)"""
+        with self.lock:
+            attempt = self.rcpt_attempts[address] = self.rcpt_attempts.get(address, 0) + 1
+        if address in self.rejected:
+            return "550 No such user"
+        if attempt <= self.deferred.get(address, 0):
+            return "451 Try again later"
+        recipients.append(address)
+        return "250 OK"
+
+
+def _address(argument):
+    """'TO:<a@b.org> OPTION' -> 'a@b.org'"""
+    return argument.partition('<')[2].partition('>')[0]
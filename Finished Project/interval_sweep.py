@@ -0,0 +1,101 @@
+"""
+Interval Sweep Module
+Keeps availability as (start_minute, end_minute) pairs instead of expanding
+each range into hourly slot strings. Maximum-overlap windows are found with a
+sorted sweep over the range endpoints, so the cost depends on the number of
+ranges (O(n log n)) and not on the time resolution.
+"""
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time_to_minutes(time_str):
+    """Convert '9:30 AM' to 570, '2:00 PM' to 840, '12:00 AM' to 0, etc."""
+    time_str = time_str.strip().upper()
+    if time_str.endswith('AM'):
+        is_pm = False
+    elif time_str.endswith('PM'):
+        is_pm = True
+    else:
+        raise ValueError(f"Missing AM/PM in time '{time_str}'")
+
+    clock = time_str[:-2].strip()
+    if ':' in clock:
+        hour_str, minute_str = clock.split(':')
+    else:
+        hour_str, minute_str = clock, '0'
+    hour, minute = int(hour_str), int(minute_str)
+    if not 1 <= hour <= 12 or not 0 <= minute < 60:
+        raise ValueError(f"Invalid time '{time_str}'")
+
+    hour = hour % 12 + (12 if is_pm else 0)
+    return hour * 60 + minute
+
+
+def format_minutes(minutes):
+    """Convert 570 to '9:30 AM', 840 to '2:00 PM', etc."""
+    hour_24, minute = divmod(minutes % MINUTES_PER_DAY, 60)
+    hour_12 = hour_24 % 12 or 12
+    suffix = 'AM' if hour_24 < 12 else 'PM'
+    return f"{hour_12}:{minute:02d} {suffix}"
+
+
+def parse_time_range(time_range):
+    """
+    Convert '9:30 AM - 2:00 PM' into (570, 840)
+    An end of 12:00 AM is midnight at the end of the day: '10:00 PM - 12:00 AM' is (1320, 1440),
+    matching what format_interval writes for the last slot.
+    Returns None for 'Not selected' or anything that isn't a range.
+    """
+    if time_range == "Not selected" or " - " not in time_range:
+        return None
+    start_str, end_str = time_range.split(" - ")
+    end = parse_time_to_minutes(end_str)
+    return parse_time_to_minutes(start_str), end or MINUTES_PER_DAY
+
+
+def format_interval(start, end):
+    """Convert (570, 840) to '9:30 AM - 2:00 PM'"""
+    return f"{format_minutes(start)} - {format_minutes(end)}"
+
+
+def sweep_overlaps(intervals):
+    """
+    Sweep over sorted endpoints and yield (start, end, count) for every stretch
+    of time covered by at least one interval. Intervals are half-open, so a
+    range ending at 10:00 does not overlap one starting at 10:00.
+    """
+    events = []
+    for start, end in intervals:
+        if end > start:
+            events.append((start, 1))
+            events.append((end, -1))
+    # Ends (-1) sort before starts (+1) at the same minute
+    events.sort()
+
+    count = 0
+    previous = None
+    for time, delta in events:
+        if count > 0 and time > previous:
+            yield previous, time, count
+        count += delta
+        previous = time
+
+
+def find_max_overlap_windows(intervals):
+    """
+    Find the windows where the most intervals overlap
+    Returns: tuple of (max_count, [(start, end), ...]) - touching windows are merged
+    """
+    max_count = 0
+    windows = []
+    for start, end, count in sweep_overlaps(intervals):
+        if count > max_count:
+            max_count = count
+            windows = [(start, end)]
+        elif count == max_count:
+            if windows[-1][1] == start:
+                windows[-1] = (windows[-1][0], end)
+            else:
+                windows.append((start, end))
+    return max_count, windows
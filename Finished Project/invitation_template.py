@@ -0,0 +1,262 @@
+"""
+Invitation Template Module
+Personalized invitation emails for large events. An invitation template is
+compiled once into its literal text and field names, and everything every
+recipient shares (the scheduled times, the attendee list) is folded into
+the literal text up front. Rendering one person's body is then a single
+join over the prebuilt parts, and bodies are produced one at a time by a
+generator, so tens of thousands of invitations never sit in memory at once.
+
+Template fields:
+    {name}              the recipient's name
+    {email}             the recipient's address
+    {your_times}        the scheduled times this recipient said they can make
+    {scheduled_times}   every day's best time
+    {participants}      the attendee list (at most ATTENDEE_LIST_LIMIT names)
+"""
+
+from string import Formatter
+
+import meeting_calculator
+from availability_matrix import mask_to_slots, top_slots
+from mail_calc import MessageTemplate
+from participant_store import ParticipantStore
+
+DEFAULT_TEMPLATE = """Hi {name},
+
+A team meeting has been scheduled.
+
+Scheduled times:
+{scheduled_times}
+
+Times you said you can make:
+{your_times}
+
+Participants:
+{participants}
+Please confirm your attendance."""
+
+RECIPIENT_FIELDS = ('name', 'email', 'your_times')
+SHARED_FIELDS = ('scheduled_times', 'participants')
+
+# Long attendee lists are cut short - every invitation carries a copy
+ATTENDEE_LIST_LIMIT = 50
+NO_MATCHING_TIMES = "None of the scheduled times - please let us know if one of them still works."
+UNKNOWN_RECIPIENT_TIMES = "See the scheduled times above."
+
+
+class InvitationTemplate:
+    """A template parsed once into literal parts and {field} positions"""
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        self.fields = []   # (position in parts, field name)
+        for literal, field, format_spec, conversion in Formatter().parse(text):
+            if literal:
+                self.parts.append(literal)
+            if field is None:
+                continue
+            if field not in RECIPIENT_FIELDS + SHARED_FIELDS:
+                raise ValueError(f"Unknown template field '{{{field}}}' - use one of: "
+                                 + ", ".join(f"{{{name}}}" for name in RECIPIENT_FIELDS + SHARED_FIELDS))
+            if format_spec or conversion:
+                raise ValueError(f"Template field '{{{field}}}' can't have a format spec")
+            self.fields.append((len(self.parts), field))
+            self.parts.append('')
+
+    def is_personalized(self):
+        """True if bodies differ per recipient (otherwise one message can go to everyone)"""
+        return any(field in RECIPIENT_FIELDS for _, field in self.fields)
+
+    def bind(self, shared):
+        """
+        Fill in the fields every recipient shares and merge them into the literal text
+        Returns: a new InvitationTemplate that only has the remaining fields left to render
+        """
+        bound = InvitationTemplate.__new__(InvitationTemplate)
+        bound.text = self.text
+        bound.parts = []
+        bound.fields = []
+        fields = dict(self.fields)
+        literal = []
+        for position, part in enumerate(self.parts):
+            field = fields.get(position)
+            if field is None:
+                literal.append(part)
+            elif field in shared:
+                literal.append(shared[field])
+            else:
+                # Runs of literal text collapse into one part
+                bound.parts.append(''.join(literal))
+                literal = []
+                bound.fields.append((len(bound.parts), field))
+                bound.parts.append('')
+        bound.parts.append(''.join(literal))
+        return bound
+
+    def render(self, context):
+        """Build one body from a {field: text} dict"""
+        parts = self.parts.copy()
+        for position, field in self.fields:
+            parts[position] = context[field]
+        return ''.join(parts)
+
+
+def day_label(day_key):
+    """'day_one' -> 'Day One'"""
+    return day_key.replace('_', ' ').title()
+
+
+def split_recipients(participants):
+    """
+    Separate the participants who gave an email address from those who didn't
+    Returns: tuple of ([email addresses], [names of participants without one])
+    """
+    if isinstance(participants, ParticipantStore):
+        people = ((participants.get_name(index), email) for index, email in enumerate(participants.emails))
+    else:
+        people = ((person['name'], person.get('email', '')) for person in participants)
+    addresses, missing = [], []
+    for name, email in people:
+        if email:
+            addresses.append(email)
+        else:
+            missing.append(name)
+    return addresses, missing
+
+
+def format_scheduled_times(day_results, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Lines like 'Day One meeting time: ...' for every day that has a result
+    day_results: the display strings from calculate_separate_day_times, one per day
+    """
+    lines = [f"{day_label(day_key)} meeting time: {result}"
+             for day_key, result in zip(day_keys, day_results)
+             if result and not result.startswith("No ")]
+    return "\n".join(lines) or "Meeting time: TBD"
+
+
+def format_attendee_list(participants, limit=ATTENDEE_LIST_LIMIT):
+    """Bullet list of the first `limit` names, noting how many more are coming"""
+    names = [participants[index]['name'] for index in range(min(limit, len(participants)))]
+    lines = "".join(f"• {name}\n" for name in names)
+    if len(participants) > limit:
+        lines += f"...and {len(participants) - limit} more\n"
+    return lines
+
+
+def format_your_times(matched_times, day_keys):
+    """One line per day the person can make, from a tuple of per-day matched time lists"""
+    lines = [f"{day_label(day_key)}: {', '.join(times)}"
+             for day_key, times in zip(day_keys, matched_times) if times]
+    return "\n".join(lines) or NO_MATCHING_TIMES
+
+
+class RecipientDirectory:
+    """
+    Looks up each recipient's name and matched slots by email address
+    (participants without an address can't be looked up). The winning slots
+    are found once; a person's matched slots are their picks restricted to
+    those, and the formatted text is shared between everyone who matched the
+    same slots.
+    """
+
+    def __init__(self, participants, day_keys=meeting_calculator.DAY_KEYS):
+        self.participants = participants
+        self.day_keys = list(day_keys)
+        self.your_times_cache = {}
+
+        if isinstance(participants, ParticipantStore):
+            # Fast path - bitmask ANDs against the winning slots of each day
+            self.winning_masks = []
+            for counts in participants.day_counts():
+                _, slots = top_slots(counts)
+                self.winning_masks.append(sum(1 << slot for slot in slots))
+            names = map(participants.get_name, range(len(participants)))
+            emails = participants.emails
+        else:
+            session = meeting_calculator.SchedulingSession()
+            session.participants = participants
+            best = session.find_best_times_by_day(self.day_keys)
+            self.winning_times = [set(best[day_key]['times']) for day_key in self.day_keys]
+            names = (person['name'] for person in participants)
+            emails = (person.get('email', '') for person in participants)
+
+        self.index = {}
+        for index, (name, email) in enumerate(zip(names, emails)):
+            if email:
+                self.index.setdefault(email.lower(), index)
+
+    def __len__(self):
+        return len(self.participants)
+
+    def context_for(self, address):
+        """Returns: {'name', 'email', 'your_times'} for one recipient address"""
+        index = self.index.get(address.lower())
+        if index is None:
+            return {'name': address, 'email': address, 'your_times': UNKNOWN_RECIPIENT_TIMES}
+
+        if isinstance(self.participants, ParticipantStore):
+            store = self.participants
+            key = tuple(store.best_masks[day][index] & winning_mask
+                        for day, winning_mask in enumerate(self.winning_masks))
+            name = store.get_name(index)
+        else:
+            person = self.participants[index]
+            key = tuple(tuple(time for time in person.get(f'{day_key}_times', []) if time in winning)
+                        for day_key, winning in zip(self.day_keys, self.winning_times))
+            name = person['name']
+
+        your_times = self.your_times_cache.get(key)
+        if your_times is None:
+            your_times = format_your_times(self._matched_times(key), self.day_keys)
+            self.your_times_cache[key] = your_times
+        return {'name': name, 'email': address, 'your_times': your_times}
+
+    def _matched_times(self, key):
+        """Per-day lists of formatted times for a matched-slots key"""
+        if isinstance(self.participants, ParticipantStore):
+            return [[meeting_calculator.format_hour_slot(slot) for slot in mask_to_slots(mask)] for mask in key]
+        return key
+
+
+def shared_fields(day_results, participants, day_keys=meeting_calculator.DAY_KEYS):
+    """The fields every invitation has in common"""
+    return {'scheduled_times': format_scheduled_times(day_results, day_keys),
+            'participants': format_attendee_list(participants)}
+
+
+def iter_invitations(template, directory, recipient_emails, shared):
+    """
+    Render personalized bodies one recipient at a time
+    template: an InvitationTemplate (or template text); directory: a RecipientDirectory
+    Yields: (recipient email, body)
+    """
+    if isinstance(template, str):
+        template = InvitationTemplate(template)
+    bound = template.bind(shared)
+    for address in recipient_emails:
+        yield address, bound.render(directory.context_for(address))
+
+
+def iter_invitation_messages(template, subject, sender_email, directory, recipient_emails, shared):
+    """
+    Render and serialize one email per recipient, ready for Outbox.enqueue_many or MailTransport.send_message
+    Yields: (message bytes, [recipient])
+    """
+    message_template = MessageTemplate(subject, sender_email)
+    for address, body in iter_invitations(template, directory, recipient_emails, shared):
+        yield message_template.render(address, body), [address]
+
+
+def send_invitations(transport, template, subject, directory, recipient_emails, shared):
+    """
+    Headless send: stream personalized invitations straight into a MailTransport
+    Returns: dict of recipient -> None if accepted, or the error message if not
+    """
+    results = {}
+    for raw, recipients in iter_invitation_messages(template, subject, transport.sender_email,
+                                                    directory, recipient_emails, shared):
+        results.update(transport.send_message(raw, recipients))
+    return results
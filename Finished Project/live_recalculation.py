@@ -0,0 +1,84 @@
+"""
+Live Recalculation Module
+Keeps the best times up to date while the roster is being edited.
+Edits are collected for a short coalescing delay, then only the rows that
+changed are pushed into an incremental VoteTally (see vote_tally.py), so a
+burst of dropdown changes costs one small update instead of a full recount.
+"""
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import meeting_calculator
+
+
+class LiveRecalculator(QObject):
+    """Watches a RosterModel and emits fresh best times shortly after every burst of edits"""
+
+    results_ready = pyqtSignal(str, str)  # day one result, day two result
+
+    def __init__(self, roster_model, delay_ms=150, parent=None):
+        super().__init__(parent)
+        self.roster_model = roster_model
+        self.enabled = False
+        self.tally = None
+        self.dirty_rows = set()
+
+        # Restarting a single-shot timer on every edit batches bursts into one flush
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+
+        roster_model.dataChanged.connect(self.on_data_changed)
+        roster_model.rowsInserted.connect(self.on_rows_inserted)
+        roster_model.rowsRemoved.connect(self.on_rows_reordered)
+        roster_model.modelReset.connect(self.on_rows_reordered)
+
+    def set_enabled(self, enabled):
+        """Turn live mode on (recounts everything once) or off (drops the tally)"""
+        self.enabled = enabled
+        self.tally = None
+        self.dirty_rows.clear()
+        if enabled:
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def on_data_changed(self, top_left, bottom_right, roles=None):
+        """Mark edited rows - name-only edits don't change any votes"""
+        if bottom_right.column() > 0:
+            self.dirty_rows.update(range(top_left.row(), bottom_right.row() + 1))
+        self.schedule()
+
+    def on_rows_inserted(self, parent, first, last):
+        """New rows are added to the tally on the next flush"""
+        self.dirty_rows.update(range(first, last + 1))
+        self.schedule()
+
+    def on_rows_reordered(self, *args):
+        """Removed rows shift every later row, so the tally (keyed by row) is rebuilt"""
+        self.tally = None
+        self.dirty_rows.clear()
+        self.schedule()
+
+    def schedule(self):
+        """(Re)start the coalescing timer while live mode is on"""
+        if self.enabled:
+            self.timer.start()
+
+    def flush(self):
+        """Apply the pending edits to the tally and emit the new best times"""
+        if self.tally is None:
+            self.tally = meeting_calculator.build_vote_tally(self.roster_model.get_selections())
+        else:
+            for row in self.dirty_rows:
+                masks = meeting_calculator.convert_user_to_masks(self.roster_model.get_row_selection(row))
+                if row in self.tally:
+                    self.tally.update_participant(row, masks)
+                else:
+                    self.tally.add_participant(row, masks)
+        self.dirty_rows.clear()
+
+        day_one_result = meeting_calculator.find_best_time_from_tally(self.tally, 0, "No day one times selected")
+        day_two_result = meeting_calculator.find_best_time_from_tally(self.tally, 1, "No day two times selected")
+        self.results_ready.emit(day_one_result, day_two_result)
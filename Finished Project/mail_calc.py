@@ -1,18 +1,239 @@
 import smtplib
+import threading
 from email.message import EmailMessage
-def send_email(subject, body, sender_email, sender_password, recipient_emails):
+
+# Gmail accepts up to 100 recipients per message and drops busy connections, so stay well under both
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MESSAGES_PER_CONNECTION = 100
+# Longest line (in bytes, without the line break) an email may carry unencoded
+MAX_LINE_BYTES = 998
+
+
+class MailTransport:
+    """
+    Pool of logged-in SMTP connections shared by every message sent through it.
+    Connections are opened lazily (at most pool_size), reused across messages and
+    replaced after messages_per_connection sends or when the server drops them.
+    Recipients are split into chunks and sent as Bcc (envelope only), so nobody
+    sees the rest of the list, and every recipient gets their own result.
+    """
+
+    def __init__(self, sender_email, sender_password, host='smtp.gmail.com', port=465, use_ssl=True,
+                 pool_size=DEFAULT_POOL_SIZE, chunk_size=DEFAULT_CHUNK_SIZE,
+                 messages_per_connection=DEFAULT_MESSAGES_PER_CONNECTION, timeout=30):
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.pool_size = pool_size
+        self.chunk_size = chunk_size
+        self.messages_per_connection = messages_per_connection
+        self.timeout = timeout
+        self.idle = []
+        self.open_connections = 0
+        self.login_error = None
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def connect(self):
+        """Open and log in one SMTP connection (SSL for Gmail, plain for a local test server)"""
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.sender_password:
+                smtp.login(self.sender_email, self.sender_password)
+        except (smtplib.SMTPAuthenticationError, smtplib.SMTPNotSupportedError) as e:
+            # Bad credentials won't fix themselves - fail every later batch without reconnecting
+            self.login_error = e
+            smtp.close()
+            raise
+        except Exception:
+            smtp.close()
+            raise
+        smtp.messages_sent = 0
+        return smtp
+
+    def acquire(self):
+        """Take an idle connection, open a new one while under pool_size, or wait for one"""
+        with self._condition:
+            while not self.idle and self.open_connections >= self.pool_size and not self.login_error:
+                self._condition.wait()
+            if self.login_error:
+                raise self.login_error
+            if self.idle:
+                return self.idle.pop()
+            self.open_connections += 1
+        try:
+            return self.connect()
+        except Exception:
+            with self._condition:
+                self.open_connections -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, smtp, broken=False):
+        """Return a connection to the pool, or close it if it failed or has sent enough"""
+        retire = broken or smtp.messages_sent >= self.messages_per_connection
+        with self._condition:
+            if retire:
+                self.open_connections -= 1
+            else:
+                self.idle.append(smtp)
+            self._condition.notify()
+        if retire:
+            _quit(smtp)
+
+    def close(self):
+        """Log out of every idle connection"""
+        with self._condition:
+            idle, self.idle = self.idle, []
+            self.open_connections -= len(idle)
+        for smtp in idle:
+            _quit(smtp)
+
+    def send_message(self, msg, recipient_emails):
+        """
+        Deliver one message to the given envelope recipients over a pooled connection
+        msg may be an EmailMessage or an already serialized message (bytes, see MessageTemplate).
+        A dropped connection is retried once on a fresh one.
+        Returns: dict of recipient -> None if accepted, or the error message if not
+        """
+        for attempt in range(2):
+            try:
+                smtp = self.acquire()
+            except Exception as e:
+                return {recipient: f"Could not connect: {e}" for recipient in recipient_emails}
+            try:
+                if isinstance(msg, bytes):
+                    refused = smtp.sendmail(self.sender_email, recipient_emails, _to_crlf(msg))
+                else:
+                    refused = smtp.send_message(msg, from_addr=self.sender_email, to_addrs=recipient_emails)
+            except smtplib.SMTPServerDisconnected as e:
+                self.release(smtp, broken=True)
+                if attempt == 0:
+                    continue
+                return {recipient: f"Server disconnected: {e}" for recipient in recipient_emails}
+            except smtplib.SMTPRecipientsRefused as e:
+                self.release(smtp)
+                return {recipient: _format_smtp_error(*e.recipients.get(recipient, (None, b'refused')))
+                        for recipient in recipient_emails}
+            except smtplib.SMTPResponseException as e:
+                self.release(smtp)
+                return {recipient: _format_smtp_error(e.smtp_code, e.smtp_error) for recipient in recipient_emails}
+            except Exception as e:
+                self.release(smtp, broken=True)
+                return {recipient: str(e) for recipient in recipient_emails}
+
+            smtp.messages_sent += 1
+            self.release(smtp)
+            return {recipient: _format_smtp_error(*refused[recipient]) if recipient in refused else None
+                    for recipient in recipient_emails}
+
+    def send(self, subject, body, recipient_emails, individual=False):
+        """
+        Send one text email to many recipients
+        individual=True sends each person their own message (To: them); otherwise recipients
+        are Bcc'd in chunks of chunk_size.
+        Returns: dict of recipient -> None if accepted, or the error message if not
+        """
+        results = {}
+        for msg, recipients in self.iter_batches(subject, body, recipient_emails, individual):
+            results.update(self.send_message(msg, recipients))
+        return results
+
+    def iter_batches(self, subject, body, recipient_emails, individual=False):
+        """Yield (message, envelope recipients) pairs - one per person, or one per chunk of chunk_size"""
+        if individual:
+            for recipient in recipient_emails:
+                yield build_message(subject, body, self.sender_email, recipient), [recipient]
+        else:
+            msg = build_message(subject, body, self.sender_email, "undisclosed-recipients:;")
+            for start in range(0, len(recipient_emails), self.chunk_size):
+                yield msg, recipient_emails[start:start + self.chunk_size]
+
+
+def build_message(subject, body, sender_email, to_header):
+    """Create a plain text email; the real recipients are given to the SMTP envelope, not the headers"""
     msg = EmailMessage()
     msg['Subject'] = subject
     msg['From'] = sender_email
-    msg['To'] = ', '.join(recipient_emails)  # Join multiple emails into a single string
+    msg['To'] = to_header
     msg.set_content(body)
+    return msg
+
+
+class MessageTemplate:
+    """
+    Serializes many plain text emails that share a subject and sender
+    The shared headers are encoded once; each message only adds its To: header and
+    body. Anything the fast path can't write as-is (lines over MAX_LINE_BYTES,
+    non-ASCII or multi-line addresses) goes through build_message instead.
+    """
+
+    def __init__(self, subject, sender_email):
+        self.subject = subject
+        self.sender_email = sender_email
+        headers = EmailMessage()
+        headers['Subject'] = subject
+        headers['From'] = sender_email
+        self.header_bytes = headers.as_bytes()[:-1]   # without the blank line ending the headers
+
+    def render(self, recipient_email, body):
+        """Returns: the serialized message (bytes) addressed to one recipient"""
+        lines = body.encode('utf-8').splitlines()
+        if (not recipient_email.isascii() or not recipient_email.isprintable()
+                or max(map(len, lines), default=0) > MAX_LINE_BYTES):
+            return build_message(self.subject, body, self.sender_email, recipient_email).as_bytes()
+        encoding = b'7bit' if body.isascii() else b'8bit'
+        return b''.join((self.header_bytes, b'To: ', recipient_email.encode('ascii'),
+                         b'\nContent-Type: text/plain; charset="utf-8"\nContent-Transfer-Encoding: ', encoding,
+                         b'\nMIME-Version: 1.0\n\n', b'\n'.join(lines), b'\n'))
+
+
+def _to_crlf(raw):
+    """SMTP wants CRLF line endings; serialized messages use plain LF"""
+    return raw.replace(b'\r\n', b'\n').replace(b'\n', b'\r\n')
+
+
+def _quit(smtp):
+    """Log out of a connection, closing it outright if the server is already gone"""
     try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp:
-            smtp.login(sender_email, sender_password)
-            smtp.send_message(msg)
+        smtp.quit()
+    except Exception:
+        smtp.close()
+
+
+def _format_smtp_error(code, message):
+    """Turn an SMTP status code and message into a readable error"""
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', 'replace')
+    return f"{code} {message}" if code else message
+
+
+def send_email(subject, body, sender_email, sender_password, recipient_emails):
+    """
+    Send the meeting details to every recipient (Bcc'd in chunks over one pooled transport)
+    Returns: dict of recipient -> None if accepted, or the error message if not
+    """
+    with MailTransport(sender_email, sender_password) as transport:
+        results = transport.send(subject, body, list(recipient_emails))
+    failed = [recipient for recipient, error in results.items() if error]
+    if failed:
+        print(f"An issue occured while attempting to send email to {len(failed)} of {len(results)} recipients:")
+        for recipient in failed:
+            print(f"  {recipient}: {results[recipient]}")
+    else:
         print("Meeting details sent successfully.")
-    except Exception as e:
-        print("An issue occured while attempting to send email:", e)
+    return results
 # example using the function
 # email_list = ["trysten@example.com", "mariam@example.com", "zache@example.com"] #list will be created from particiant emails
 # send_email(
@@ -58,33 +279,6 @@ def calculate_best_time():
         print("Suggested time: ", sorted_times[0][0], "with", sorted_times[0][1], "votes")
     else:
         print("No times entered.")
-import smtplib
-from email.message import EmailMessage
-def send_email(subject, body, sender_email, sender_password, recipient_emails):
-    msg = EmailMessage()
-    msg['Subject'] = subject
-    msg['From'] = sender_email
-    msg['To'] = ', '.join(recipient_emails)  # Join multiple emails into a single string
-    msg.set_content(body)
-    try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp:
-            smtp.login(sender_email, sender_password)
-            smtp.send_message(msg)
-        print("Meeting details sent successfully.")
-    except Exception as e:
-        print("An issue occured while attempting to send email:", e)
-# example using the function
-# email_list = ["trysten@example.com", "mariam@example.com", "zache@example.com"] #list will be created from particiant emails
-# send_email(
-#     subject="Team Meeting",
-#     body="Reminder: Team meeting at 10am tomorrow.",  #will need to use the calculated best time here as
-#     sender_email="your_email@gmail.com",
-#     sender_password="your_app_password",  # use an app password if Gmail has 2FA
-#     recipient_emails=email_list
-# )
-
-
-
 def main():
     print("=== Meeting Time App Prototype ===")
     enter_availability()
@@ -4,89 +4,658 @@ Contains all the calculation logic for finding optimal meeting times.
 Based on your classmate's original algorithm with GUI integration.
 """
 
-# Global list to store participant data (matches your classmate's original design)
-participants = []
+import heapq
+import threading
+from collections import OrderedDict, deque
+
+from availability_matrix import (AvailabilityMatrix, pack_day_masks, slot_range_to_mask, top_slots,
+                                 weighted_column_sums)
+from interval_sweep import (MINUTES_PER_DAY, find_max_overlap_windows, format_interval,
+                            parse_time_range, parse_time_to_minutes)
+from participant_store import ParticipantStore
+from vote_tally import VoteTally
+
+# Day keys used by the GUI rows - pass a longer list for multi-day events
+DAY_KEYS = ['day_one', 'day_two']
+
+# GUI dropdown options - index 0 is the "Start"/"End" placeholder (nothing selected)
+START_TIME_OPTIONS = [
+    "Start",
+    "8:00 AM", "8:30 AM", "9:00 AM", "9:30 AM", "10:00 AM", "10:30 AM",
+    "11:00 AM", "11:30 AM", "12:00 PM", "12:30 PM", "1:00 PM", "1:30 PM",
+    "2:00 PM", "2:30 PM", "3:00 PM", "3:30 PM", "4:00 PM", "4:30 PM",
+    "5:00 PM", "5:30 PM", "6:00 PM"
+]
+END_TIME_OPTIONS = [
+    "End",
+    "8:30 AM", "9:00 AM", "9:30 AM", "10:00 AM", "10:30 AM", "11:00 AM",
+    "11:30 AM", "12:00 PM", "12:30 PM", "1:00 PM", "1:30 PM", "2:00 PM",
+    "2:30 PM", "3:00 PM", "3:30 PM", "4:00 PM", "4:30 PM", "5:00 PM",
+    "5:30 PM", "6:00 PM", "6:30 PM"
+]
+
+# Minute offsets for every dropdown index, precomputed once so combo indices map straight to minutes
+START_TIME_MINUTES = [None] + [parse_time_to_minutes(option) for option in START_TIME_OPTIONS[1:]]
+END_TIME_MINUTES = [None] + [parse_time_to_minutes(option) for option in END_TIME_OPTIONS[1:]]
+
+# How many rows to convert between progress reports / cancellation checks
+PROGRESS_CHUNK_ROWS = 1000
+
+# Roster fingerprints are a row count plus a 64-bit sum of per-row hashes
+FINGERPRINT_MASK = (1 << 64) - 1
+
+
+class CalculationCancelled(Exception):
+    """Raised inside a calculation when its cancel_check callback returns True"""
 
 # ========================
-# CORE ALGORITHM FUNCTIONS (Your classmate's original logic)
+# RESULT CACHE (Memoized results keyed by roster fingerprint)
 # ========================
 
-def find_top_meeting_time():
+def fingerprint_row(row, user):
     """
-    Your classmate's original function - slightly modified to return results and handle ties
-    Finds the most popular time slot across all participants
+    Hash one GUI row, including its position, into 64 bits
+    Python's tuple hash changes almost linearly when one field changes, so two different
+    single-cell edits could shift the roster sum by the same amount; the splitmix64
+    finalizer scrambles each row hash before it is summed.
     """
-    time_votes = {}
+    value = hash((row, tuple(user.items()))) & FINGERPRINT_MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & FINGERPRINT_MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & FINGERPRINT_MASK
+    return value ^ (value >> 31)
 
-    for person in participants:
-        for time in person['best_times']:
-            if time in time_votes:
-                time_votes[time] += 1
-            else:
-                time_votes[time] = 1
+def roster_fingerprint(gui_data):
+    """
+    Fingerprint a whole roster: (row count, sum of fingerprint_row values mod 2**64)
+    Because it is a sum, a table can keep it up to date edit by edit (see RosterModel.fingerprint)
+    """
+    row_hash_sum = 0
+    for row, user in enumerate(gui_data):
+        row_hash_sum += fingerprint_row(row, user)
+    return len(gui_data), row_hash_sum & FINGERPRINT_MASK
 
-    if not time_votes:
-        return "No best time slots were chosen."
 
-    # Find the maximum number of votes
-    max_votes = max(time_votes.values())
+class ResultCache:
+    """
+    Small LRU cache for calculation results, keyed by (roster fingerprint, query parameters)
+    Any edit changes the roster fingerprint, so stale entries are never returned - they
+    simply age out. Cached values are shared, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Look up a result (None on a miss), marking it most recently used"""
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entry when full"""
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached result for key, or compute() and cache it"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry (the hit/miss counters are kept)"""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Returns: dict with 'hits', 'misses' and 'entries'"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+
+# Shared cache for the module-level high-level functions
+result_cache = ResultCache()
+
+# ========================
+# SCHEDULING SESSIONS (Independent, thread-safe roster state)
+# ========================
+
+class SchedulingSession:
+    """
+    Owns one roster's participants and last results, so several rosters can be
+    calculated at the same time (one session per thread or worker process)
+    without overwriting each other. The module-level functions below are thin
+    wrappers around a shared default session.
+
+    The result cache only holds result strings. Participants are kept for the
+    most recently calculated roster alone (participants_key says which one);
+    after a cache hit for another roster they are rebuilt on first use.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.participants = []
+        self.participants_key = None
+        self.results = {}
+        self.cache = ResultCache()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    @property
+    def participants(self):
+        """The current participants, built from the roster on first use after a cache hit"""
+        with self._lock:
+            if self._rebuild is not None:
+                build, gui_data = self._rebuild
+                self._participants = build(gui_data)
+                self._rebuild = None
+            return self._participants
+
+    @participants.setter
+    def participants(self, participants):
+        with self._lock:
+            self._participants = participants
+            self._rebuild = None
+            self.participants_key = None
+
+    def _restore_participants(self, key, build, gui_data):
+        """After a cache hit: keep the participants if they are this roster's, else rebuild them lazily"""
+        if self.participants_key != key:
+            self._participants = []
+            self._rebuild = (build, gui_data)
+            self.participants_key = key
+
+    def has_participants(self, fingerprint):
+        """True if the participants already belong to this roster's separate-day calculation (no rebuild needed)"""
+        with self._lock:
+            return self.participants_key == (fingerprint, 'separate_days') and self._rebuild is None
+
+    def find_top_meeting_time(self):
+        """
+        Your classmate's original function - slightly modified to return results and handle ties
+        Finds the most popular time slot across all participants
+        """
+        time_votes = {}
+
+        for person in self.participants:
+            for time in person['best_times']:
+                if time in time_votes:
+                    time_votes[time] += 1
+                else:
+                    time_votes[time] = 1
+
+        if not time_votes:
+            return "No best time slots were chosen."
+
+        # Find the maximum number of votes
+        max_votes = max(time_votes.values())
     
-    # Find all time slots with the maximum votes (handles ties)
-    top_times = [time for time, votes in time_votes.items() if votes == max_votes]
+        # Find all time slots with the maximum votes (handles ties)
+        top_times = [time for time, votes in time_votes.items() if votes == max_votes]
+        return format_vote_result(top_times, max_votes)
+
+    def find_best_times_by_day(self, day_keys=DAY_KEYS):
+        """
+        Find the best meeting time for every day in a single pass over participants
+        Returns: dict keyed by day -> {'max_votes': int, 'times': [time slots]}
+        """
+        day_votes = {day: {} for day in day_keys}
+
+        for person in self.participants:
+            for day, time_votes in day_votes.items():
+                for time in person.get(f'{day}_times', []):
+                    time_votes[time] = time_votes.get(time, 0) + 1
+
+        return {day: summarize_votes(time_votes) for day, time_votes in day_votes.items()}
+
+    def find_best_time_day_one(self):
+        """Find the best meeting time for day one only"""
+        return format_day_result(self.find_best_times_by_day(['day_one'])['day_one'], "No day one times selected")
+
+    def find_best_time_day_two(self):
+        """Find the best meeting time for day two only"""
+        return format_day_result(self.find_best_times_by_day(['day_two'])['day_two'], "No day two times selected")
+
+    def find_weighted_meeting_times(self, best_weight=1.0, worst_weight=1.0):
+        """
+        Weighted version of find_top_meeting_time that also reads each person's worst_times
+        Free-form slot strings (e.g. '9-10am' from collect_availability) are mapped to bit positions once,
+        then scored with a weighted column-sum. Participants may carry an optional 'priority' weight.
+        Returns: list of {'time', 'score', 'best_score', 'worst_score'}, highest score first
+        """
+        slot_index = {}
+        best_rows = []
+        worst_rows = []
+        priorities = []
+
+        for person in self.participants:
+            best_row = 0
+            for time in person['best_times']:
+                best_row |= 1 << slot_index.setdefault(time, len(slot_index))
+            worst_row = 0
+            for time in person['worst_times']:
+                worst_row |= 1 << slot_index.setdefault(time, len(slot_index))
+            best_rows.append(best_row)
+            worst_rows.append(worst_row)
+            priorities.append(person.get('priority', 1))
+
+        slot_names = list(slot_index)
+        ranked = rank_weighted_slots(best_rows, worst_rows, priorities, len(slot_names), best_weight, worst_weight)
+        return [{'time': slot_names[slot], 'score': score, 'best_score': best_score, 'worst_score': worst_score}
+                for slot, score, best_score, worst_score in ranked]
+
+    def convert_gui_data_to_participants(self, gui_data):
+        """
+        Convert GUI data format to your classmate's participants format (combined)
+        Days may hold text ranges or structured selections ((540, 720) or None), like the other converters
+        """
+        self.participants = build_combined_store(gui_data)
+
+    def convert_gui_data_to_participants_separate_days(self, gui_data, progress_callback=None, cancel_check=None):
+        """
+        Convert GUI data format but keep day one and day two separate
+        Participants are stored compactly (see participant_store.py); iterating gives
+        dict-like views with 'name', 'best_times', 'day_one_times', 'day_two_times' and 'worst_times'
+        Every PROGRESS_CHUNK_ROWS rows, progress_callback(done, total) is called and cancel_check()
+        can stop the conversion by returning True (raises CalculationCancelled, session left unchanged)
+        """
+        self.participants = build_participant_store(gui_data, progress_callback, cancel_check)
+
+    def calculate_combined_best_time(self, gui_data, fingerprint=None):
+        """
+        High-level function: Calculate the single best time across both days
+        fingerprint: roster_fingerprint(gui_data), if the caller already keeps it up to date
+        Returns: string with the best time result
+        """
+        with self._lock:
+            key = (fingerprint or roster_fingerprint(gui_data), 'combined')
+            result = self.cache.get(key)
+            if result is not None:
+                self._restore_participants(key, build_combined_store, gui_data)
+            else:
+                # One pass builds the merged masks; the slot strings are only made if someone reads them
+                self.participants = build_combined_store(gui_data)
+                self.participants_key = key
+                result = find_best_time_from_counts(self.participants.day_counts()[0], "No best time slots were chosen.")
+                self.cache.put(key, result)
+            self.results = {'combined': result}
+            return result
+
+    def calculate_separate_day_times(self, gui_data, progress_callback=None, cancel_check=None, fingerprint=None):
+        """
+        High-level function: Calculate separate best times for each day
+        progress_callback/cancel_check are optional hooks for background workers (see calculation_worker.py)
+        fingerprint: roster_fingerprint(gui_data), if the caller already keeps it up to date
+        Returns: tuple of (day_one_result, day_two_result)
+        """
+        with self._lock:
+            key = (fingerprint or roster_fingerprint(gui_data), 'separate_days')
+            cached = self.lookup_separate_day_times(key[0])
+            if cached is not None:
+                self._restore_participants(key, build_participant_store, gui_data)
+                return cached
+
+            self.convert_gui_data_to_participants_separate_days(gui_data, progress_callback, cancel_check)
+            self.participants_key = key
+            results = summarize_day_counts(self.participants.day_counts(), DAY_KEYS)
+            day_one_result = format_day_result(results['day_one'], "No day one times selected")
+            day_two_result = format_day_result(results['day_two'], "No day two times selected")
+            self.results = {'day_one': day_one_result, 'day_two': day_two_result}
+            self.cache.put(key, (day_one_result, day_two_result))
+            return day_one_result, day_two_result
+
+    def lookup_separate_day_times(self, fingerprint):
+        """
+        O(1) cache check for calculate_separate_day_times - only the result strings, the participants
+        are left alone (see has_participants)
+        Returns: tuple of (day_one_result, day_two_result), or None if this roster wasn't calculated yet
+        """
+        with self._lock:
+            cached = self.cache.get((fingerprint, 'separate_days'))
+            if cached is None:
+                return None
+            self.results = {'day_one': cached[0], 'day_two': cached[1]}
+            return cached
+
+    def get_participants_data(self):
+        """Get the current participants data (for debugging)"""
+        return self.participants
+
+    def print_debug_info(self):
+        """Print debug information about current participants"""
+        print("=== Current Participants Data ===")
+        for person in self.participants:
+            print(f"Name: {person['name']}")
+            if 'day_one_times' in person:
+                print(f"  Day One times: {person['day_one_times']}")
+                print(f"  Day Two times: {person['day_two_times']}")
+            else:
+                print(f"  Best times (combined): {person['best_times']}")
+            print(f"  Worst times: {person['worst_times']}")
+            print()
+
+    def collect_availability(self):
+        """Your classmate's original data collection function"""
+        print("Enter each person's availability. Type 'done' when you are finished.\n")
+        participants = []
     
-    if len(top_times) == 1:
-        return f"{top_times[0]} ({max_votes} vote{'s' if max_votes > 1 else ''})"
-    else:
-        times_str = ", ".join(top_times)
-        return f"TIE: {times_str} (each with {max_votes} vote{'s' if max_votes > 1 else ''})"
+        while True:
+            name = input("Name: ")
+            if name.strip().lower() == 'done':
+                break
+
+            best_input = input("Best times (EX: 9-10am, 2-3pm): ")
+            worst_input = input("Worst times (EX: 12-1pm, 4-5pm): ")
+
+            best_times = [slot.strip() for slot in best_input.split(',') if slot.strip()]
+            worst_times = [slot.strip() for slot in worst_input.split(',') if slot.strip()]
+
+            person = {
+                'name': name,
+                'best_times': best_times,
+                'worst_times': worst_times
+            }
+
+            participants.append(person)
+            print()
+
+        self.participants = participants
+
+
+# Session used by the module-level functions (matches your classmate's original global design)
+default_session = SchedulingSession()
+
+def __getattr__(name):
+    """Keep `meeting_calculator.participants` readable for older callers"""
+    if name == 'participants':
+        return default_session.participants
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ========================
+# CORE ALGORITHM FUNCTIONS (Your classmate's original logic)
+# ========================
+
+def find_top_meeting_time():
+    """Your classmate's original function - slightly modified to return results and handle ties"""
+    return default_session.find_top_meeting_time()
+
+def find_best_times_by_day(day_keys=DAY_KEYS):
+    """Find the best meeting time for every day in a single pass over participants"""
+    return default_session.find_best_times_by_day(day_keys)
 
 def find_best_time_day_one():
     """Find the best meeting time for day one only"""
-    time_votes = {}
+    return default_session.find_best_time_day_one()
 
-    for person in participants:
-        times_to_check = person.get('day_one_times', [])
-        for time in times_to_check:
-            if time in time_votes:
-                time_votes[time] += 1
-            else:
-                time_votes[time] = 1
+def find_best_time_day_two():
+    """Find the best meeting time for day two only"""
+    return default_session.find_best_time_day_two()
 
+def summarize_votes(time_votes):
+    """Reduce a {time: votes} dict to {'max_votes': int, 'times': [all tied winners]}"""
     if not time_votes:
-        return "No day one times selected"
-
+        return {'max_votes': 0, 'times': []}
     max_votes = max(time_votes.values())
     top_times = [time for time, votes in time_votes.items() if votes == max_votes]
-    
+    return {'max_votes': max_votes, 'times': top_times}
+
+def format_day_result(day_result, empty_message):
+    """Format one day's structured result as the display string used by the GUI"""
+    if not day_result['times']:
+        return empty_message
+    return format_vote_result(day_result['times'], day_result['max_votes'])
+
+def format_vote_result(top_times, max_votes):
+    """Format the winning time slot(s) and vote count, e.g. 'TIE: ... (each with 2 votes)'"""
     if len(top_times) == 1:
         return f"{top_times[0]} ({max_votes} vote{'s' if max_votes > 1 else ''})"
     else:
         times_str = ", ".join(top_times)
         return f"TIE: {times_str} (each with {max_votes} vote{'s' if max_votes > 1 else ''})"
 
-def find_best_time_day_two():
-    """Find the best meeting time for day two only"""
-    time_votes = {}
+# ========================
+# MATRIX ENGINE FUNCTIONS (Bitmask vote counting)
+# ========================
 
-    for person in participants:
-        times_to_check = person.get('day_two_times', [])
-        for time in times_to_check:
-            if time in time_votes:
-                time_votes[time] += 1
-            else:
-                time_votes[time] = 1
+def build_availability_matrix(gui_data, day_keys=DAY_KEYS, slot_minutes=60):
+    """Convert GUI data into a participant x slot bitmask matrix (one row per user)"""
+    matrix = AvailabilityMatrix(day_count=len(day_keys), slots_per_day=MINUTES_PER_DAY // slot_minutes)
+    for user in gui_data:
+        matrix.add_participant(user['user'], convert_user_to_masks(user, day_keys, slot_minutes))
+    return matrix
 
-    if not time_votes:
-        return "No day two times selected"
+def build_participant_store(gui_data, progress_callback=None, cancel_check=None, day_keys=DAY_KEYS):
+    """
+    Convert GUI data into a compact ParticipantStore, one set of day masks per user
+    Every PROGRESS_CHUNK_ROWS rows, progress_callback(done, total) is called and cancel_check()
+    can stop the conversion by returning True (raises CalculationCancelled)
+    """
+    participants = ParticipantStore(day_keys)
+    total = len(gui_data)
+
+    for row, user in enumerate(gui_data):
+        if row % PROGRESS_CHUNK_ROWS == 0:
+            if cancel_check and cancel_check():
+                raise CalculationCancelled()
+            if progress_callback:
+                progress_callback(row, total)
+        participants.add_participant(user['user'], convert_user_to_masks(user, day_keys), email=user.get('email', ''))
+
+    if progress_callback:
+        progress_callback(total, total)
+    return participants
 
-    max_votes = max(time_votes.values())
-    top_times = [time for time, votes in time_votes.items() if votes == max_votes]
-    
-    if len(top_times) == 1:
-        return f"{top_times[0]} ({max_votes} vote{'s' if max_votes > 1 else ''})"
+def build_combined_store(gui_data, day_keys=DAY_KEYS, slot_minutes=60):
+    """
+    Store every user's availability merged across days (one 'combined' mask per person)
+    Iterating gives the same 'name'/'best_times'/'worst_times' views as convert_gui_data_to_participants
+    """
+    store = ParticipantStore(['combined'], slot_minutes)
+    for user in gui_data:
+        merged = 0
+        for mask in convert_user_to_masks(user, day_keys, slot_minutes):
+            merged |= mask
+        store.add_participant(user['user'], [merged], email=user.get('email', ''))
+    return store
+
+def convert_user_to_masks(user, day_keys=DAY_KEYS, slot_minutes=60):
+    """
+    Convert one GUI row into one slot bitmask per day, e.g. [day_one_mask, day_two_mask]
+    Each day may hold a text range ('9:00 AM - 12:00 PM') or a structured selection ((540, 720) or None)
+    """
+    masks = []
+    for day_key in day_keys:
+        selection = user.get(day_key)
+        if isinstance(selection, str):
+            masks.append(convert_time_range_to_mask(selection, slot_minutes))
+        else:
+            masks.append(convert_selection_to_mask(selection, slot_minutes))
+    return masks
+
+def summarize_day_counts(day_counts, day_keys=DAY_KEYS):
+    """Turn per-day hourly vote counts into {day: {'max_votes': int, 'times': [time slots]}}"""
+    results = {}
+    for day_key, counts in zip(day_keys, day_counts):
+        max_votes, slots = top_slots(counts)
+        results[day_key] = {'max_votes': max_votes, 'times': [format_hour_slot(hour) for hour in slots]}
+    return results
+
+def find_best_time_from_counts(counts, empty_message):
+    """Pick the most voted slot(s) from a list of per-hour vote counts"""
+    max_votes, slots = top_slots(counts)
+    if not slots:
+        return empty_message
+    return format_vote_result([format_hour_slot(hour) for hour in slots], max_votes)
+
+# ========================
+# INCREMENTAL TALLY FUNCTIONS (Add/update/remove one participant at a time)
+# ========================
+
+def build_vote_tally(gui_data):
+    """Build an incremental vote tally from GUI data, keyed by table row"""
+    tally = VoteTally(day_count=2)
+    for row, user in enumerate(gui_data):
+        tally.add_participant(row, convert_user_to_masks(user))
+    return tally
+
+def find_best_time_from_tally(tally, day, empty_message):
+    """Read the current best slot(s) for a day straight from a VoteTally"""
+    max_votes, slots = tally.best_slots(day)
+    if not slots:
+        return empty_message
+    return format_vote_result([format_hour_slot(hour) for hour in slots], max_votes)
+
+# ========================
+# WINDOW SEARCH FUNCTIONS (Best contiguous multi-slot meetings)
+# ========================
+
+def find_best_windows(counts, window_slots, top_k=3, rank_by='total'):
+    """
+    Rank every run of `window_slots` consecutive slots in one day's vote counts
+    Totals come from prefix sums and minimums from a sliding-window deque, so a day costs O(slots).
+    rank_by: 'total' (sum of votes across the window) or 'minimum' (fewest people present at any point)
+    Returns: list of (start_slot, total_votes, min_votes), best first, skipping windows nobody can attend
+    """
+    if rank_by not in ('total', 'minimum'):
+        raise ValueError(f"Unknown rank_by '{rank_by}', expected 'total' or 'minimum'")
+    if window_slots <= 0 or window_slots > len(counts):
+        return []
+
+    prefix = [0]
+    for votes in counts:
+        prefix.append(prefix[-1] + votes)
+
+    windows = []
+    for start, min_votes in enumerate(sliding_window_minimums(counts, window_slots)):
+        total_votes = prefix[start + window_slots] - prefix[start]
+        if total_votes:
+            windows.append((start, total_votes, min_votes))
+
+    if rank_by == 'total':
+        rank_key = lambda window: (window[1], window[2], -window[0])
     else:
-        times_str = ", ".join(top_times)
-        return f"TIE: {times_str} (each with {max_votes} vote{'s' if max_votes > 1 else ''})"
+        rank_key = lambda window: (window[2], window[1], -window[0])
+    return heapq.nlargest(top_k, windows, key=rank_key)
+
+def sliding_window_minimums(counts, window_slots):
+    """Minimum of every window of `window_slots` consecutive counts, using a monotonic deque"""
+    minimums = []
+    window = deque()
+    for index, votes in enumerate(counts):
+        while window and counts[window[-1]] >= votes:
+            window.pop()
+        window.append(index)
+        if window[0] <= index - window_slots:
+            window.popleft()
+        if index >= window_slots - 1:
+            minimums.append(counts[window[0]])
+    return minimums
+
+# ========================
+# REQUIRED ATTENDEE FUNCTIONS (Bitwise AND over participant masks)
+# ========================
+
+def find_slots_with_required(matrix, required_names):
+    """
+    Query a built matrix for slots where all required participants are free
+    Returns: list of (day, slot, optional_votes) ranked by optional attendance
+    """
+    required_indices = []
+    for name in required_names:
+        if name not in matrix.name_index:
+            raise ValueError(f"Unknown participant '{name}'")
+        required_indices.append(matrix.name_index[name])
+
+    results = []
+    for slot, optional_votes in matrix.rank_with_required(required_indices):
+        day, day_slot = divmod(slot, matrix.slots_per_day)
+        results.append((day, day_slot, optional_votes))
+    return results
+
+# ========================
+# WEIGHTED SCORING FUNCTIONS (Best times add, worst times subtract)
+# ========================
+
+def rank_weighted_slots(best_rows, worst_rows, priorities, slot_count, best_weight=1.0, worst_weight=1.0):
+    """
+    Score every slot as best_weight * (priority-weighted best votes) - worst_weight * (priority-weighted worst votes)
+    Returns: list of (slot, score, best_score, worst_score) for slots anyone mentioned, highest score first
+    """
+    best_sums = weighted_column_sums(best_rows, priorities, slot_count)
+    worst_sums = weighted_column_sums(worst_rows, priorities, slot_count)
+
+    ranked = []
+    for slot in range(slot_count):
+        best_score = best_weight * best_sums[slot]
+        worst_score = worst_weight * worst_sums[slot]
+        if best_sums[slot] or worst_sums[slot]:
+            ranked.append((slot, best_score - worst_score, best_score, worst_score))
+    ranked.sort(key=lambda item: -item[1])
+    return ranked
+
+def find_weighted_meeting_times(best_weight=1.0, worst_weight=1.0):
+    """Weighted version of find_top_meeting_time that also reads each person's worst_times"""
+    return default_session.find_weighted_meeting_times(best_weight, worst_weight)
+
+# ========================
+# INTERVAL ENGINE FUNCTIONS (Sweep-line over minute ranges)
+# ========================
+
+def build_day_intervals(gui_data, day_key):
+    """Collect one day's availability as (start_minute, end_minute) pairs"""
+    intervals = []
+    for user in gui_data:
+        if not isinstance(user[day_key], str):
+            # Structured selection from the GUI combo indices - already in minutes
+            if user[day_key] is not None:
+                intervals.append(user[day_key])
+            continue
+        try:
+            time_range = parse_time_range(user[day_key])
+        except ValueError as e:
+            print(f"Error parsing time range '{user[day_key]}': {e}")
+            continue
+        if time_range is not None:
+            intervals.append(time_range)
+    return intervals
+
+def find_best_window_from_intervals(intervals, empty_message):
+    """Find the window(s) where the most people overlap, at minute resolution"""
+    max_votes, windows = find_max_overlap_windows(intervals)
+    if not windows:
+        return empty_message
+    return format_vote_result([format_interval(start, end) for start, end in windows], max_votes)
 
 # ========================
 # DATA CONVERSION FUNCTIONS (GUI Integration)
@@ -94,66 +663,11 @@ def find_best_time_day_two():
 
 def convert_gui_data_to_participants(gui_data):
     """Convert GUI data format to your classmate's participants format (combined)"""
-    global participants
-    participants = []
-    
-    for user in gui_data:
-        best_times = []
-        
-        # Add day one time slots if selected
-        if user['day_one'] != "Not selected":
-            day_one_slots = convert_time_range_to_slots(user['day_one'])
-            best_times.extend(day_one_slots)
-        
-        # Add day two time slots if selected
-        if user['day_two'] != "Not selected":
-            day_two_slots = convert_time_range_to_slots(user['day_two'])
-            best_times.extend(day_two_slots)
-        
-        # Remove duplicates and sort
-        best_times = list(set(best_times))
-        best_times = sort_time_slots(best_times)
-        
-        person = {
-            'name': user['user'],
-            'best_times': best_times,
-            'worst_times': []
-        }
-        
-        participants.append(person)
+    return default_session.convert_gui_data_to_participants(gui_data)
 
 def convert_gui_data_to_participants_separate_days(gui_data):
     """Convert GUI data format but keep day one and day two separate"""
-    global participants
-    participants = []
-    
-    for user in gui_data:
-        day_one_times = []
-        day_two_times = []
-        
-        # Add day one time slots if selected
-        if user['day_one'] != "Not selected":
-            day_one_slots = convert_time_range_to_slots(user['day_one'])
-            day_one_times.extend(day_one_slots)
-        
-        # Add day two time slots if selected
-        if user['day_two'] != "Not selected":
-            day_two_slots = convert_time_range_to_slots(user['day_two'])
-            day_two_times.extend(day_two_slots)
-        
-        # Remove duplicates and sort
-        day_one_times = sort_time_slots(list(set(day_one_times)))
-        day_two_times = sort_time_slots(list(set(day_two_times)))
-        
-        person = {
-            'name': user['user'],
-            'best_times': day_one_times + day_two_times,  # Combined for compatibility
-            'day_one_times': day_one_times,
-            'day_two_times': day_two_times,
-            'worst_times': []
-        }
-        
-        participants.append(person)
+    return default_session.convert_gui_data_to_participants_separate_days(gui_data)
 
 # ========================
 # TIME UTILITY FUNCTIONS
@@ -165,37 +679,80 @@ def convert_time_range_to_slots(time_range):
         return []
     
     try:
-        start_str, end_str = time_range.split(" - ")
-        
-        start_hour = convert_to_24_hour(start_str)
-        end_hour = convert_to_24_hour(end_str)
+        start_hour, end_hour = convert_time_range_to_hours(time_range)
         
         # Generate hourly slots
-        slots = []
-        current_hour = start_hour
-        
-        while current_hour < end_hour:
-            next_hour = current_hour + 1
-            start_12h = convert_to_12_hour(current_hour)
-            end_12h = convert_to_12_hour(next_hour)
-            slot = f"{start_12h} - {end_12h}"
-            slots.append(slot)
-            current_hour = next_hour
-        
-        return slots
+        return [format_hour_slot(hour) for hour in range(start_hour, end_hour)]
     except Exception as e:
         print(f"Error parsing time range '{time_range}': {e}")
         return [time_range]
 
+def convert_time_range_to_mask(time_range, slot_minutes=60):
+    """
+    Convert a time range like '9:00 AM - 2:00 PM' into a bitmask of slots
+    Slot i covers minutes i * slot_minutes up to (i + 1) * slot_minutes; only fully covered slots are set.
+    """
+    if time_range == "Not selected" or " - " not in time_range:
+        return 0
+    
+    try:
+        return convert_selection_to_mask(parse_time_range(time_range), slot_minutes)
+    except Exception as e:
+        print(f"Error parsing time range '{time_range}': {e}")
+        return 0
+
+def convert_selection_to_mask(selection, slot_minutes=60):
+    """Convert a structured (start_minute, end_minute) selection, or None, into a bitmask of fully covered slots"""
+    if selection is None:
+        return 0
+    start_minute, end_minute = selection
+    return slot_range_to_mask(-(-start_minute // slot_minutes), end_minute // slot_minutes)
+
+def selection_from_indices(start_index, end_index):
+    """Map dropdown indices straight to a (start_minute, end_minute) selection, or None if unset"""
+    if start_index <= 0 or end_index <= 0:
+        return None
+    return START_TIME_MINUTES[start_index], END_TIME_MINUTES[end_index]
+
+def indices_from_selection(selection):
+    """
+    Map a (start_minute, end_minute) selection back to dropdown indices
+    Returns (0, 0) - nothing selected - for None or times the dropdowns don't offer
+    """
+    if selection is None:
+        return 0, 0
+    start_minute, end_minute = selection
+    if start_minute not in START_TIME_MINUTES or end_minute not in END_TIME_MINUTES:
+        return 0, 0
+    return START_TIME_MINUTES.index(start_minute), END_TIME_MINUTES.index(end_minute)
+
+def format_selection(selection):
+    """Convert a structured selection back into display text, e.g. '9:00 AM - 12:00 PM'"""
+    if selection is None:
+        return "Not selected"
+    return format_interval(*selection)
+
+def convert_time_range_to_hours(time_range):
+    """
+    Convert '9:30 AM - 2:00 PM' into the whole hours it fully covers, (10, 14)
+    Half-hour edges are trimmed so a slot is only counted when the person is free for all of it.
+    """
+    start_minute, end_minute = parse_time_range(time_range)
+    return -(-start_minute // 60), end_minute // 60
+
+def format_slot(slot, slot_minutes=60):
+    """Convert slot 19 at 30-minute resolution to '9:30 AM - 10:00 AM'"""
+    return format_interval(slot * slot_minutes, (slot + 1) * slot_minutes)
+
+def format_hour_slot(hour_24):
+    """Convert 9 to the slot label '9:00 AM - 10:00 AM'"""
+    return f"{convert_to_12_hour(hour_24)} - {convert_to_12_hour(hour_24 + 1)}"
+
 def convert_to_24_hour(time_str):
-    """Convert '9:00 AM' to 9, '2:00 PM' to 14, etc."""
+    """Convert '9:00 AM' to 9, '2:00 PM' to 14, '9:30 AM' to 9, etc."""
     time_str = time_str.strip()
-    if 'AM' in time_str:
-        hour = int(time_str.replace('AM', '').replace(':00', '').strip())
-        return hour if hour != 12 else 0
-    elif 'PM' in time_str:
-        hour = int(time_str.replace('PM', '').replace(':00', '').strip())
-        return hour if hour == 12 else hour + 12
+    if 'AM' in time_str or 'PM' in time_str:
+        return parse_time_to_minutes(time_str) // 60
     return 0
 
 def convert_to_12_hour(hour_24):
@@ -211,53 +768,147 @@ def convert_to_12_hour(hour_24):
 
 def sort_time_slots(time_slots):
     """Sort time slots chronologically"""
-    def get_start_hour(slot):
+    def get_start_minute(slot):
         try:
             start_time = slot.split(" - ")[0]
-            return convert_to_24_hour(start_time)
+            return parse_time_to_minutes(start_time)
         except:
             return 0
     
-    return sorted(time_slots, key=get_start_hour)
+    return sorted(time_slots, key=get_start_minute)
 
 # ========================
 # HIGH-LEVEL API FUNCTIONS (What your GUI should call)
 # ========================
 
 def calculate_combined_best_time(gui_data):
+    """High-level function: Calculate the single best time across both days"""
+    return default_session.calculate_combined_best_time(gui_data)
+
+def calculate_separate_day_times(gui_data):
+    """High-level function: Calculate separate best times for each day"""
+    return default_session.calculate_separate_day_times(gui_data)
+
+def calculate_best_times_for_days(gui_data, day_keys=DAY_KEYS):
     """
-    High-level function: Calculate the single best time across both days
-    Returns: string with the best time result
+    High-level function: Calculate the best times for any number of days in one pass
+    Each user holds a time range per day key, e.g. {'user': 'Alice', 'monday': '9:00 AM - 11:00 AM', ...}
+    Returns: dict keyed by day -> {'max_votes': int, 'times': [time slots]}
     """
-    convert_gui_data_to_participants(gui_data)
-    return find_top_meeting_time()
+    matrix = build_availability_matrix(gui_data, day_keys)
+    return summarize_day_counts(matrix.day_counts(), day_keys)
 
-def calculate_separate_day_times(gui_data):
+def calculate_separate_day_windows(gui_data):
     """
-    High-level function: Calculate separate best times for each day
+    High-level function: Calculate the best overlap window for each day at minute resolution
+    Unlike calculate_separate_day_times this keeps half-hour edges, e.g. '9:30 AM - 11:00 AM'
     Returns: tuple of (day_one_result, day_two_result)
     """
-    convert_gui_data_to_participants_separate_days(gui_data)
-    day_one_result = find_best_time_day_one()
-    day_two_result = find_best_time_day_two()
+    day_one_result = find_best_window_from_intervals(
+        build_day_intervals(gui_data, 'day_one'), "No day one times selected")
+    day_two_result = find_best_window_from_intervals(
+        build_day_intervals(gui_data, 'day_two'), "No day two times selected")
     return day_one_result, day_two_result
 
+def calculate_best_windows(gui_data, duration_minutes, top_k=3, rank_by='total',
+                           day_keys=DAY_KEYS, slot_minutes=30, fingerprint=None):
+    """
+    High-level function: Find the top contiguous meeting windows of a given length for each day
+    duration_minutes must be a multiple of slot_minutes (the GUI offers half-hour times)
+    Results are memoized in result_cache by roster fingerprint and query parameters.
+    Returns: dict keyed by day -> list of {'time', 'start', 'end', 'total_votes', 'min_votes'}, best first
+    """
+    if duration_minutes <= 0 or duration_minutes % slot_minutes:
+        raise ValueError(f"Duration must be a positive multiple of {slot_minutes} minutes")
+    key = (fingerprint or roster_fingerprint(gui_data),
+           ('windows', duration_minutes, top_k, rank_by, tuple(day_keys), slot_minutes))
+    return result_cache.get_or_compute(
+        key, lambda: compute_best_windows(gui_data, duration_minutes, top_k, rank_by, day_keys, slot_minutes))
+
+def compute_best_windows(gui_data, duration_minutes, top_k, rank_by, day_keys, slot_minutes):
+    """Uncached body of calculate_best_windows"""
+    window_slots = duration_minutes // slot_minutes
+
+    matrix = build_availability_matrix(gui_data, day_keys, slot_minutes)
+    results = {}
+    for day_key, counts in zip(day_keys, matrix.day_counts()):
+        results[day_key] = []
+        for start_slot, total_votes, min_votes in find_best_windows(counts, window_slots, top_k, rank_by):
+            start = start_slot * slot_minutes
+            end = start + duration_minutes
+            results[day_key].append({
+                'time': format_interval(start, end),
+                'start': start,
+                'end': end,
+                'total_votes': total_votes,
+                'min_votes': min_votes
+            })
+    return results
+
+def calculate_required_attendee_slots(gui_data, required_names=None, day_keys=DAY_KEYS, slot_minutes=60):
+    """
+    High-level function: Find slots every required person can attend, ranked by optional attendance
+    Required people are given by name, or marked in the GUI data with 'required': True
+    Returns: dict keyed by day -> list of {'time', 'optional_votes'}, best first
+    """
+    if required_names is None:
+        required_names = [user['user'] for user in gui_data if user.get('required')]
+
+    matrix = build_availability_matrix(gui_data, day_keys, slot_minutes)
+    results = {day_key: [] for day_key in day_keys}
+    for day, slot, optional_votes in find_slots_with_required(matrix, required_names):
+        results[day_keys[day]].append({
+            'time': format_slot(slot, slot_minutes),
+            'optional_votes': optional_votes
+        })
+    return results
+
+def calculate_weighted_best_times(gui_data, best_weight=1.0, worst_weight=1.0, day_keys=DAY_KEYS,
+                                  slot_minutes=60, fingerprint=None):
+    """
+    High-level function: Rank each day's slots by weighted best/worst score
+    Worst times come from '<day>_worst' ranges (e.g. 'day_one_worst') and each user may set a 'priority' weight
+    Results are memoized in result_cache by roster fingerprint and query parameters.
+    Returns: dict keyed by day -> list of {'time', 'score', 'best_score', 'worst_score'}, highest score first
+    """
+    key = (fingerprint or roster_fingerprint(gui_data),
+           ('weighted', best_weight, worst_weight, tuple(day_keys), slot_minutes))
+    return result_cache.get_or_compute(
+        key, lambda: compute_weighted_best_times(gui_data, best_weight, worst_weight, day_keys, slot_minutes))
+
+def compute_weighted_best_times(gui_data, best_weight, worst_weight, day_keys, slot_minutes):
+    """Uncached body of calculate_weighted_best_times"""
+    slots_per_day = MINUTES_PER_DAY // slot_minutes
+    worst_keys = [f'{day_key}_worst' for day_key in day_keys]
+    best_rows = []
+    worst_rows = []
+    priorities = []
+
+    for user in gui_data:
+        best_rows.append(pack_day_masks(convert_user_to_masks(user, day_keys, slot_minutes), slots_per_day))
+        worst_rows.append(pack_day_masks(convert_user_to_masks(user, worst_keys, slot_minutes), slots_per_day))
+        priorities.append(user.get('priority', 1))
+
+    results = {day_key: [] for day_key in day_keys}
+    ranked = rank_weighted_slots(best_rows, worst_rows, priorities, len(day_keys) * slots_per_day,
+                                 best_weight, worst_weight)
+    for slot, score, best_score, worst_score in ranked:
+        day, day_slot = divmod(slot, slots_per_day)
+        results[day_keys[day]].append({
+            'time': format_slot(day_slot, slot_minutes),
+            'score': score,
+            'best_score': best_score,
+            'worst_score': worst_score
+        })
+    return results
+
 def get_participants_data():
     """Get the current participants data (for debugging)"""
-    return participants
+    return default_session.get_participants_data()
 
 def print_debug_info():
     """Print debug information about current participants"""
-    print("=== Current Participants Data ===")
-    for person in participants:
-        print(f"Name: {person['name']}")
-        if 'day_one_times' in person:
-            print(f"  Day One times: {person['day_one_times']}")
-            print(f"  Day Two times: {person['day_two_times']}")
-        else:
-            print(f"  Best times (combined): {person['best_times']}")
-        print(f"  Worst times: {person['worst_times']}")
-        print()
+    return default_session.print_debug_info()
 
 # ========================
 # ORIGINAL CLASSMATE FUNCTIONS (For command-line use)
@@ -265,29 +916,7 @@ def print_debug_info():
 
 def collect_availability():
     """Your classmate's original data collection function"""
-    print("Enter each person's availability. Type 'done' when you are finished.\n")
-    global participants
-    participants = []
-    
-    while True:
-        name = input("Name: ")
-        if name.strip().lower() == 'done':
-            break
-
-        best_input = input("Best times (EX: 9-10am, 2-3pm): ")
-        worst_input = input("Worst times (EX: 12-1pm, 4-5pm): ")
-
-        best_times = [slot.strip() for slot in best_input.split(',') if slot.strip()]
-        worst_times = [slot.strip() for slot in worst_input.split(',') if slot.strip()]
-
-        person = {
-            'name': name,
-            'best_times': best_times,
-            'worst_times': worst_times
-        }
-
-        participants.append(person)
-        print()
+    return default_session.collect_availability()
 
 def main():
     """Your classmate's original main function"""
@@ -296,5 +925,12 @@ def main():
     result = find_top_meeting_time()
     print(f"\nMost popular meeting time: {result}")
 
+    # Weighted ranking also takes everyone's worst times into account
+    ranked = find_weighted_meeting_times()
+    if ranked:
+        best = ranked[0]
+        print(f"Best weighted meeting time: {best['time']} "
+              f"(score {best['score']:g} = {best['best_score']:g} best - {best['worst_score']:g} worst)")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
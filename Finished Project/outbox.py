@@ -0,0 +1,320 @@
+"""
+Outbox Module
+Durable, on-disk queue for invitation emails. ExportDialog writes every
+message into a local SQLite outbox first, and a delivery loop drains it
+through a pooled MailTransport:
+    - one delivery row per (message, recipient), so every recipient is
+      tracked and retrying a send never delivers a message twice; each
+      send has its own campaign id, so sending the same text again later
+      is a new send and goes out
+    - bounded parallelism (at most `concurrency` batches in flight)
+    - temporary failures are retried with exponential backoff, permanent
+      (5xx) failures and exhausted retries are marked failed
+    - anything still queued survives a crash or restart and goes out on
+      the next drain; a claimed batch holds a lease, so one that was
+      mid-send when the app died is sent again once the lease runs out
+      (the server may never have received it)
+    - personalized invitations (one message per recipient, see
+      invitation_template.py) are streamed in with enqueue_many and grouped
+      under a campaign id, so one send can be tracked as a whole
+
+Headless use:
+    python outbox.py sender@gmail.com app_password [outbox.db]
+"""
+
+import hashlib
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from mail_calc import MailTransport
+
+DEFAULT_OUTBOX_PATH = 'outbox.db'
+DEFAULT_CONCURRENCY = 4
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 300
+SENDING_LEASE_SECONDS = 600
+QUEUED_ERROR = "Still queued - will be sent on the next delivery run"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    sender TEXT NOT NULL,
+    raw BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    campaign TEXT
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL REFERENCES messages(id),
+    recipient TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    sent_at REAL,
+    UNIQUE (message_id, recipient)
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (status, next_attempt_at);
+"""
+
+
+def backoff_delay(attempts):
+    """Seconds to wait before retry number `attempts` (2, 4, 8, ... capped at BACKOFF_MAX_SECONDS)"""
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+def is_permanent_error(error):
+    """5xx SMTP replies (e.g. '550 no such user') won't succeed on retry"""
+    return error[:3].isdigit() and error[0] == '5'
+
+
+class Outbox:
+    """SQLite-backed queue of messages and their per-recipient delivery state"""
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        # Every claim and result is a commit; with WAL, NORMAL still survives an app crash without
+        # an fsync per commit (a power cut can at worst resend the last batches, like a lost lease)
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        # Outboxes written before campaigns existed
+        columns = {column[1] for column in self.connection.execute("PRAGMA table_info(messages)")}
+        if 'campaign' not in columns:
+            self.connection.execute("ALTER TABLE messages ADD COLUMN campaign TEXT")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS messages_by_campaign ON messages (campaign)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the outbox file"""
+        self.connection.close()
+
+    def enqueue(self, msg, recipient_emails, sender_email, idempotency_key=None, campaign=None):
+        """
+        Queue a message for the given recipients (one transaction)
+        Enqueueing the same message again under the same campaign (a retry of one send) adds no
+        duplicates: delivered recipients are skipped and failed ones are queued for another try.
+        Without a campaign every call is a new send.
+        Returns: the message id
+        """
+        with self.connection:
+            return self._insert(msg.as_bytes(), recipient_emails, sender_email, idempotency_key,
+                                campaign or uuid.uuid4().hex)
+
+    def enqueue_many(self, messages, sender_email, campaign):
+        """
+        Queue a stream of (message bytes or EmailMessage, recipients) pairs in one transaction
+        Messages are written as they arrive, so the stream is never held in memory. Each one
+        is deduplicated within the campaign like enqueue() and tagged with it.
+        Returns: number of messages queued
+        """
+        count = 0
+        with self.connection:
+            for msg, recipient_emails in messages:
+                raw = msg if isinstance(msg, bytes) else msg.as_bytes()
+                self._insert(raw, recipient_emails, sender_email, campaign=campaign)
+                count += 1
+        return count
+
+    def _insert(self, raw, recipient_emails, sender_email, idempotency_key=None, campaign=None):
+        """Write one message and its deliveries (the caller holds the transaction)"""
+        if idempotency_key is None:
+            # Scoped to the send - the same text in a later send is a new message
+            idempotency_key = hashlib.sha256((campaign or '').encode() + b'\0' + raw).hexdigest()
+        self.connection.execute(
+            "INSERT INTO messages (idempotency_key, sender, raw, created_at, campaign) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (idempotency_key) DO UPDATE SET campaign = coalesce(excluded.campaign, campaign)",
+            (idempotency_key, sender_email, raw, time.time(), campaign))
+        (message_id,) = self.connection.execute(
+            "SELECT id FROM messages WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO deliveries (message_id, recipient) VALUES (?, ?)",
+            [(message_id, recipient) for recipient in dict.fromkeys(recipient_emails)])
+        self.connection.execute(
+            "UPDATE deliveries SET status = 'pending', attempts = 0, next_attempt_at = 0 "
+            "WHERE message_id = ? AND status = 'failed'", (message_id,))
+        return message_id
+
+    def claim_batch(self, sender_email, message_ids=None, chunk_size=50, now=None, campaign=None):
+        """
+        Mark up to chunk_size due deliveries of one message as 'sending'
+        While sending, next_attempt_at holds the lease expiry - a batch whose sender died is due again after it.
+        Returns: (message_id, raw message, [(delivery_id, recipient)]) or None if nothing is due
+        """
+        now = time.time() if now is None else now
+        scope, scope_args = self._scope(sender_email, message_ids, campaign)
+        with self.connection:
+            # One status at a time, so the (status, next_attempt_at) index gives the order without a sort
+            for status in ('pending', 'sending'):
+                row = self.connection.execute(
+                    "SELECT d.message_id FROM deliveries d JOIN messages m ON m.id = d.message_id "
+                    f"WHERE d.status = ? AND d.next_attempt_at <= ? AND {scope} "
+                    "ORDER BY d.next_attempt_at, d.id LIMIT 1", (status, now, *scope_args)).fetchone()
+                if row is not None:
+                    break
+            else:
+                return None
+            message_id = row[0]
+            # The unary + keeps SQLite on the (message_id, recipient) index instead of scanning deliveries_due
+            deliveries = self.connection.execute(
+                "SELECT id, recipient FROM deliveries WHERE message_id = ? AND +status IN ('pending', 'sending') "
+                "AND +next_attempt_at <= ? ORDER BY id LIMIT ?", (message_id, now, chunk_size)).fetchall()
+            self.connection.executemany(
+                "UPDATE deliveries SET status = 'sending', next_attempt_at = ? WHERE id = ?",
+                [(now + SENDING_LEASE_SECONDS, delivery_id) for delivery_id, _ in deliveries])
+            (raw,) = self.connection.execute("SELECT raw FROM messages WHERE id = ?", (message_id,)).fetchone()
+        return message_id, raw, deliveries
+
+    def record_results(self, deliveries, results, now=None, permanent=False):
+        """
+        Store a batch's outcome: sent, retry later with backoff, or failed for good
+        permanent: treat every error as permanent (e.g. the server rejected our login)
+        Returns: (number sent, number failed for good)
+        """
+        now = time.time() if now is None else now
+        sent = failed = 0
+        with self.connection:
+            for delivery_id, recipient in deliveries:
+                error = results.get(recipient)
+                if error is None:
+                    self.connection.execute(
+                        "UPDATE deliveries SET status = 'sent', sent_at = ?, last_error = NULL, "
+                        "attempts = attempts + 1 WHERE id = ?", (now, delivery_id))
+                    sent += 1
+                    continue
+                (attempts,) = self.connection.execute(
+                    "SELECT attempts + 1 FROM deliveries WHERE id = ?", (delivery_id,)).fetchone()
+                if permanent or is_permanent_error(error) or attempts >= self.max_attempts:
+                    status, next_attempt_at = 'failed', now
+                    failed += 1
+                else:
+                    status, next_attempt_at = 'pending', now + backoff_delay(attempts)
+                self.connection.execute(
+                    "UPDATE deliveries SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                    "WHERE id = ?", (status, attempts, next_attempt_at, error, delivery_id))
+        return sent, failed
+
+    def counts(self, sender_email, message_ids=None, campaign=None):
+        """Returns: dict with the number of 'pending', 'sending', 'sent' and 'failed' deliveries"""
+        scope, scope_args = self._scope(sender_email, message_ids, campaign)
+        counts = {'pending': 0, 'sending': 0, 'sent': 0, 'failed': 0}
+        for status, count in self.connection.execute(
+                "SELECT d.status, COUNT(*) FROM deliveries d JOIN messages m ON m.id = d.message_id "
+                f"WHERE {scope} GROUP BY d.status", scope_args):
+            counts[status] = count
+        return counts
+
+    def next_due_time(self, sender_email, message_ids=None, campaign=None):
+        """When the earliest waiting retry is due, or None if nothing is pending"""
+        scope, scope_args = self._scope(sender_email, message_ids, campaign)
+        return self.connection.execute(
+            "SELECT MIN(d.next_attempt_at) FROM deliveries d JOIN messages m ON m.id = d.message_id "
+            f"WHERE d.status = 'pending' AND {scope}", scope_args).fetchone()[0]
+
+    def delivery_results(self, sender_email, message_ids=None, campaign=None):
+        """Returns: dict of recipient -> None if sent, the error if failed, or QUEUED_ERROR if still queued"""
+        scope, scope_args = self._scope(sender_email, message_ids, campaign)
+        results = {}
+        for recipient, status, last_error in self.connection.execute(
+                "SELECT d.recipient, d.status, d.last_error FROM deliveries d "
+                f"JOIN messages m ON m.id = d.message_id WHERE {scope} ORDER BY d.id", scope_args):
+            if status == 'sent':
+                results[recipient] = None
+            elif status == 'failed':
+                results[recipient] = last_error
+            else:
+                results[recipient] = QUEUED_ERROR
+        return results
+
+    def _scope(self, sender_email, message_ids, campaign=None):
+        """SQL filter for one sender's deliveries, optionally limited to some messages or one campaign"""
+        scope, scope_args = "m.sender = ?", (sender_email,)
+        if campaign is not None:
+            scope, scope_args = scope + " AND m.campaign = ?", scope_args + (campaign,)
+        if message_ids is not None:
+            placeholders = ", ".join("?" * len(message_ids))
+            scope, scope_args = scope + f" AND m.id IN ({placeholders})", scope_args + tuple(message_ids)
+        return scope, scope_args
+
+
+def deliver_outbox(outbox, transport, message_ids=None, concurrency=DEFAULT_CONCURRENCY,
+                   progress_callback=None, cancel_check=None, campaign=None):
+    """
+    Drain the transport sender's due deliveries with at most `concurrency` batches in flight
+    Waits for backed-off retries until everything is sent or failed, or cancel_check() returns True
+    (unsent deliveries then simply stay queued). If the server rejects the login, the batches that hit
+    it are marked failed and draining stops, leaving the rest queued for a retry with new credentials.
+    progress_callback(sent, failed, remaining) runs after every batch.
+    Returns: Outbox.delivery_results for the drained messages
+    """
+    sender_email = transport.sender_email
+    in_flight = {}
+    # Counted once, then kept up to date from each batch's results
+    counts = outbox.counts(sender_email, message_ids, campaign)
+    total = sum(counts.values())
+    sent, failed = counts['sent'], counts['failed']
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            # Bad credentials won't fix themselves, so don't back off and retry on them
+            stopped = (cancel_check is not None and cancel_check()) or transport.login_error is not None
+            while not stopped and len(in_flight) < concurrency:
+                batch = outbox.claim_batch(sender_email, message_ids, transport.chunk_size, campaign=campaign)
+                if batch is None:
+                    break
+                _, raw, deliveries = batch
+                recipients = [recipient for _, recipient in deliveries]
+                in_flight[executor.submit(transport.send_message, raw, recipients)] = deliveries
+
+            if not in_flight:
+                next_due = None if stopped else outbox.next_due_time(sender_email, message_ids, campaign)
+                if next_due is None:
+                    break
+                # Nothing in flight, only retries waiting for their backoff to pass
+                time.sleep(min(max(next_due - time.time(), 0), 0.25))
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                deliveries = in_flight.pop(future)
+                batch_sent, batch_failed = outbox.record_results(deliveries, future.result(),
+                                                                 permanent=transport.login_error is not None)
+                sent += batch_sent
+                failed += batch_failed
+            if progress_callback:
+                progress_callback(sent, failed, total - sent - failed)
+
+    return outbox.delivery_results(sender_email, message_ids, campaign)
+
+
+def main(argv=None):
+    """Deliver everything still queued for a sender, e.g. after a crash or from a scheduled job"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print("Usage: python outbox.py sender_email app_password [outbox.db]")
+        return 2
+    sender_email, sender_password = argv[0], argv[1]
+    path = argv[2] if len(argv) > 2 else DEFAULT_OUTBOX_PATH
+
+    with Outbox(path) as outbox, MailTransport(sender_email, sender_password,
+                                               pool_size=DEFAULT_CONCURRENCY) as transport:
+        deliver_outbox(outbox, transport)
+        counts = outbox.counts(sender_email)
+    print(f"Sent: {counts['sent']}   Failed: {counts['failed']}   Still queued: {counts['pending']}")
+    return 1 if counts['failed'] or counts['pending'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Participant Store Module
+Compact struct-of-arrays storage for large rosters. Instead of one dict per
+person holding lists of formatted slot strings, the store keeps an interned
+name table and one integer bitmask array per day. Code that expects the old
+participant dicts (print_debug_info, ExportDialog) reads it through
+ParticipantView, which builds the slot strings only when asked.
+"""
+
+from array import array
+from collections import Counter
+
+from availability_matrix import mask_to_slots
+from interval_sweep import MINUTES_PER_DAY, format_interval
+
+
+class ParticipantStore:
+    """Struct-of-arrays roster: name ids plus best/worst slot bitmasks for every day"""
+
+    def __init__(self, day_keys=('day_one', 'day_two'), slot_minutes=60):
+        if MINUTES_PER_DAY // slot_minutes > 64:
+            raise ValueError("ParticipantStore holds at most 64 slots per day (slot_minutes >= 23)")
+        self.day_keys = list(day_keys)
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = MINUTES_PER_DAY // slot_minutes
+        self.day_index = {day_key: day for day, day_key in enumerate(self.day_keys)}
+
+        # Interned names - repeated names share one table entry
+        self.name_table = []
+        self.name_lookup = {}
+        self.name_ids = array('I')
+        self.emails = []
+
+        # One 64-bit mask per participant per day
+        self.best_masks = [array('Q') for _ in self.day_keys]
+        self.worst_masks = [array('Q') for _ in self.day_keys]
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("participant index out of range")
+        return ParticipantView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ParticipantView(self, index)
+
+    def add_participant(self, name, best_day_masks, worst_day_masks=None, email=''):
+        """Append a participant from per-day slot masks; returns the new index"""
+        name_id = self.name_lookup.get(name)
+        if name_id is None:
+            name_id = len(self.name_table)
+            self.name_lookup[name] = name_id
+            self.name_table.append(name)
+        self.name_ids.append(name_id)
+        self.emails.append(email)
+
+        worst_day_masks = worst_day_masks or []
+        for day in range(len(self.day_keys)):
+            self.best_masks[day].append(best_day_masks[day] if day < len(best_day_masks) else 0)
+            self.worst_masks[day].append(worst_day_masks[day] if day < len(worst_day_masks) else 0)
+        return len(self.name_ids) - 1
+
+    def get_name(self, index):
+        """Look up a participant's name through the interned name table"""
+        return self.name_table[self.name_ids[index]]
+
+    def get_times(self, index, day, worst=False):
+        """Format one participant's slots for a day as strings like '9:00 AM - 10:00 AM'"""
+        masks = self.worst_masks if worst else self.best_masks
+        size = self.slot_minutes
+        return [format_interval(slot * size, (slot + 1) * size) for slot in mask_to_slots(masks[day][index])]
+
+    def day_counts(self):
+        """Vote counts per slot for every day, summed straight from the mask arrays"""
+        all_counts = []
+        for masks in self.best_masks:
+            counts = [0] * self.slots_per_day
+            for mask, repeats in Counter(masks).items():
+                for slot in mask_to_slots(mask):
+                    counts[slot] += repeats
+            all_counts.append(counts)
+        return all_counts
+
+
+class ParticipantView:
+    """
+    Read-only, dict-like view of one stored participant
+    Supports the keys of the old participant dicts: 'name', 'best_times',
+    'worst_times', '<day>_times' (e.g. 'day_one_times') and 'email'.
+    """
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __getitem__(self, key):
+        store = self.store
+        if key == 'name':
+            return store.get_name(self.index)
+        if key == 'email':
+            return store.emails[self.index]
+        if key in ('best_times', 'worst_times'):
+            worst = key == 'worst_times'
+            times = []
+            for day in range(len(store.day_keys)):
+                times.extend(store.get_times(self.index, day, worst))
+            return times
+        if key.endswith('_times') and key[:-len('_times')] in store.day_index:
+            return store.get_times(self.index, store.day_index[key[:-len('_times')]])
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        day_time_keys = [f'{day_key}_times' for day_key in self.store.day_keys]
+        return ['name', 'best_times'] + day_time_keys + ['worst_times', 'email']
+
+    def to_dict(self):
+        """Expand into the old participant dict format"""
+        return {key: self[key] for key in self.keys()}
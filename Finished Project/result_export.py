@@ -0,0 +1,357 @@
+"""
+Result Export Module
+Saves an event's results to files other tools can read:
+    .ics    one calendar event per day at its best time, every participant
+            with an email invited (REQ-PARTICIPANT if they picked that slot,
+            OPT-PARTICIPANT otherwise)
+    .csv    per-participant availability (same columns roster_import.py
+            reads) plus a vote counts file (<name>_votes.csv by default)
+            with every slot's vote count
+    .json   best times, per-slot vote counts and every participant's
+            availability in one document
+
+Everything is written incrementally: vote counts come from one pass over
+the slot masks, then participants are streamed out one line at a time, so
+memory does not grow with the roster. Works on a ParticipantStore (GUI,
+roster_import.py) or a memory-mapped RosterSnapshot.
+
+Headless use:
+    python result_export.py roster.csv results.ics --date 2025-03-10 --organizer me@example.com
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import meeting_calculator
+import roster_import
+from availability_matrix import mask_to_slots, top_slots
+from interval_sweep import format_interval
+from roster_snapshot import SNAPSHOT_EXTENSION, RosterSnapshot
+
+EXPORT_EXTENSIONS = ('.ics', '.csv', '.json')
+VOTES_CSV_COLUMNS = ['day', 'start', 'end', 'votes', 'best']
+ICS_LINE_OCTETS = 75
+ICS_PRODUCT_ID = "-//Meeting Builder//Result Export//EN"
+
+
+# ========================
+# ROSTER ACCESS (ParticipantStore or RosterSnapshot)
+# ========================
+
+def iter_participants(participants):
+    """Yield (name, email, [slot mask per day]) for every participant, in roster order"""
+    if isinstance(participants, RosterSnapshot):
+        for index in range(len(participants)):
+            yield participants.get_name(index), participants.get_email(index), participants.get_day_masks(index)
+        return
+    names = map(participants.get_name, range(len(participants)))
+    for name, email, *day_masks in zip(names, participants.emails, *participants.best_masks):
+        yield name, email, day_masks
+
+
+def best_slots(participants):
+    """
+    Tally every day once
+    Returns: tuple of (day_counts, [(max_votes, winning slots) per day])
+    """
+    day_counts = participants.day_counts()
+    return day_counts, [top_slots(counts) for counts in day_counts]
+
+
+class MaskFormatter:
+    """Formats slot masks as time ranges, caching each distinct mask (rosters repeat a few masks a lot)"""
+
+    def __init__(self, slot_minutes):
+        self.slot_minutes = slot_minutes
+        self.cache = {}
+
+    def ranges(self, mask):
+        """Contiguous runs of a mask as (start_minute, end_minute) pairs"""
+        runs = []
+        for slot in mask_to_slots(mask):
+            start, end = slot * self.slot_minutes, (slot + 1) * self.slot_minutes
+            if runs and runs[-1][1] == start:
+                runs[-1] = (runs[-1][0], end)
+            else:
+                runs.append((start, end))
+        return runs
+
+    def text(self, mask):
+        """'9:00 AM - 11:00 AM' (runs joined with '; '), or '' for an empty mask"""
+        text = self.cache.get(mask)
+        if text is None:
+            text = "; ".join(format_interval(start, end) for start, end in self.ranges(mask))
+            self.cache[mask] = text
+        return text
+
+
+def slot_label(slot, slot_minutes):
+    """'9:00 AM - 10:00 AM' for one slot"""
+    return format_interval(slot * slot_minutes, (slot + 1) * slot_minutes)
+
+
+# ========================
+# CSV
+# ========================
+
+def write_availability_csv(output, participants):
+    """Stream one row per participant: name, email and a time range per day"""
+    day_keys = participants.day_keys
+    formatter = MaskFormatter(participants.slot_minutes)
+    writer = csv.writer(output)
+    writer.writerow(['name', 'email'] + day_keys)
+    for name, email, day_masks in iter_participants(participants):
+        writer.writerow([name, email] + [formatter.text(mask) for mask in day_masks])
+
+
+def write_vote_counts_csv(output, participants):
+    """One row per day and slot with its vote count, best slots flagged"""
+    day_counts, winners = best_slots(participants)
+    slot_minutes = participants.slot_minutes
+    writer = csv.writer(output)
+    writer.writerow(VOTES_CSV_COLUMNS)
+    for day_key, counts, (_, winning_slots) in zip(participants.day_keys, day_counts, winners):
+        for slot, votes in enumerate(counts):
+            start, end = slot_label(slot, slot_minutes).split(" - ")
+            writer.writerow([day_key, start, end, votes, 'yes' if slot in winning_slots else ''])
+
+
+# ========================
+# JSON
+# ========================
+
+def write_json(output, participants):
+    """
+    Write {'best_times', 'slot_votes', 'participants'} - participants are streamed one per line
+    best_times: day -> {'max_votes', 'times', 'result'}; slot_votes: day -> [{'time', 'votes'}]
+    """
+    day_keys = participants.day_keys
+    slot_minutes = participants.slot_minutes
+    day_counts, winners = best_slots(participants)
+
+    best_times = {}
+    slot_votes = {}
+    for day_key, counts, (max_votes, winning_slots) in zip(day_keys, day_counts, winners):
+        day_result = {'max_votes': max_votes, 'times': [slot_label(slot, slot_minutes) for slot in winning_slots]}
+        day_result['result'] = meeting_calculator.format_day_result(
+            day_result, f"No {day_key.replace('_', ' ')} times selected")
+        best_times[day_key] = day_result
+        slot_votes[day_key] = [{'time': slot_label(slot, slot_minutes), 'votes': votes}
+                               for slot, votes in enumerate(counts) if votes]
+
+    output.write('{\n"best_times": ')
+    json.dump(best_times, output)
+    output.write(',\n"slot_votes": ')
+    json.dump(slot_votes, output)
+    output.write(',\n"participants": [')
+
+    formatter = MaskFormatter(slot_minutes)
+    separator = '\n'
+    for name, email, day_masks in iter_participants(participants):
+        record = {'name': name, 'email': email}
+        for day_key, mask in zip(day_keys, day_masks):
+            record[day_key] = formatter.text(mask) or None
+        output.write(separator)
+        output.write(json.dumps(record))
+        separator = ',\n'
+    output.write('\n]\n}\n')
+
+
+# ========================
+# ICALENDAR
+# ========================
+
+def escape_ics_text(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def ics_param_value(text):
+    """Quote a parameter value such as CN when it contains ':', ';' or ','"""
+    text = text.replace('"', "'").replace('\r', ' ').replace('\n', ' ')
+    return f'"{text}"' if any(char in text for char in ':;,') else text
+
+
+def fold_ics_line(line):
+    """Split a content line into chunks of at most 75 octets, continuation lines starting with a space"""
+    if len(line) <= ICS_LINE_OCTETS and line.isascii():
+        return line + '\r\n'
+    if line.isascii():
+        chunks = [line[:ICS_LINE_OCTETS]]
+        chunks.extend(line[start:start + ICS_LINE_OCTETS - 1]
+                      for start in range(ICS_LINE_OCTETS, len(line), ICS_LINE_OCTETS - 1))
+        return '\r\n '.join(chunks) + '\r\n'
+
+    data = line.encode('utf-8')
+    if len(data) <= ICS_LINE_OCTETS:
+        return line + '\r\n'
+    chunks = []
+    start, limit = 0, ICS_LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        # Never split a multi-byte character - back up to the start of the one at the cut
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(data[start:end].decode('utf-8'))
+        start, limit = end, ICS_LINE_OCTETS - 1   # the leading space counts
+    chunks.append(data[start:].decode('utf-8'))
+    return '\r\n '.join(chunks) + '\r\n'
+
+
+def roster_digest(participants):
+    """SHA-256 of every participant's name and email, in roster order"""
+    digest = hashlib.sha256()
+    for name, email, _ in iter_participants(participants):
+        digest.update(f"{name}\0{email}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_ics(output, participants, start_date, organizer=None, summary="Team meeting"):
+    """
+    Write one VEVENT per day that has a best time, day n falling on start_date + n days
+    Tied slots are listed in the description; the earliest one is booked. Participants
+    without an email can't be invited and are left out of the attendee lists.
+    UIDs include a digest of the roster, so re-exporting a roster updates its own events
+    and never those of another team meeting at the same time.
+    Returns: number of events written
+    """
+    day_keys = participants.day_keys
+    slot_minutes = participants.slot_minutes
+    _, winners = best_slots(participants)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    roster = roster_digest(participants)
+
+    output.write(fold_ics_line("BEGIN:VCALENDAR"))
+    output.write(fold_ics_line("VERSION:2.0"))
+    output.write(fold_ics_line(f"PRODID:{ICS_PRODUCT_ID}"))
+    output.write(fold_ics_line("CALSCALE:GREGORIAN"))
+
+    events = 0
+    for day, (day_key, (max_votes, winning_slots)) in enumerate(zip(day_keys, winners)):
+        if not winning_slots:
+            continue
+        slot = winning_slots[0]
+        day_start = datetime.combine(start_date + timedelta(days=day), datetime.min.time())
+        starts_at = day_start + timedelta(minutes=slot * slot_minutes)
+        ends_at = starts_at + timedelta(minutes=slot_minutes)
+        dtstart, dtend = starts_at.strftime('%Y%m%dT%H%M%S'), ends_at.strftime('%Y%m%dT%H%M%S')
+        description = f"{day_key.replace('_', ' ').title()}: {max_votes} participants can make this time."
+        if len(winning_slots) > 1:
+            tied = ", ".join(slot_label(tied_slot, slot_minutes) for tied_slot in winning_slots)
+            description += f" Tied best times: {tied}."
+
+        write = output.write
+        write(fold_ics_line("BEGIN:VEVENT"))
+        uid = uuid.uuid5(uuid.NAMESPACE_URL, f'{roster}|{organizer}|{summary}|{day_key}|{dtstart}|{dtend}')
+        write(fold_ics_line(f"UID:{uid}@meeting-builder"))
+        write(fold_ics_line(f"DTSTAMP:{stamp}"))
+        write(fold_ics_line(f"DTSTART:{dtstart}"))
+        write(fold_ics_line(f"DTEND:{dtend}"))
+        write(fold_ics_line(f"SUMMARY:{escape_ics_text(summary)}"))
+        write(fold_ics_line(f"DESCRIPTION:{escape_ics_text(description)}"))
+        if organizer:
+            write(fold_ics_line(f"ORGANIZER:mailto:{organizer}"))
+
+        slot_bit = 1 << slot
+        for name, email, day_masks in iter_participants(participants):
+            if not email:
+                continue
+            role = 'REQ-PARTICIPANT' if day_masks[day] & slot_bit else 'OPT-PARTICIPANT'
+            write(fold_ics_line(f"ATTENDEE;CN={ics_param_value(name)};ROLE={role};"
+                                f"PARTSTAT=NEEDS-ACTION;RSVP=TRUE:mailto:{email}"))
+        write(fold_ics_line("END:VEVENT"))
+        events += 1
+
+    output.write(fold_ics_line("END:VCALENDAR"))
+    return events
+
+
+# ========================
+# HIGH-LEVEL API
+# ========================
+
+def votes_csv_path(path):
+    """Default vote counts file written next to a .csv export: results.csv -> results_votes.csv"""
+    return os.path.splitext(path)[0] + '_votes.csv'
+
+
+def export_results(path, participants, start_date=None, organizer=None, votes_path=None):
+    """
+    Export to the format given by the file extension (.ics, .csv or .json)
+    start_date: date of the first day, for .ics (default: tomorrow)
+    votes_path: where a .csv export writes the vote counts (default: votes_csv_path(path));
+                it is replaced if it exists, so callers should check first
+    Returns: list of the files written (.csv also writes the vote counts file)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_EXTENSIONS:
+        raise ValueError(f"Unsupported export file '{path}' (expected .ics, .csv or .json)")
+
+    if extension == '.ics':
+        # iCalendar brings its own CRLF line endings
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            write_ics(output, participants, start_date or date.today() + timedelta(days=1), organizer)
+        return [path]
+
+    if extension == '.json':
+        with open(path, 'w', encoding='utf-8') as output:
+            write_json(output, participants)
+        return [path]
+
+    votes_path = votes_path or votes_csv_path(path)
+    if os.path.abspath(votes_path) == os.path.abspath(path):
+        raise ValueError(f"The vote counts can't be written to the export file itself ('{path}')")
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        write_availability_csv(output, participants)
+    with open(votes_path, 'w', encoding='utf-8', newline='') as output:
+        write_vote_counts_csv(output, participants)
+    return [path, votes_path]
+
+
+def load_roster(path, day_keys=meeting_calculator.DAY_KEYS):
+    """Open a roster file for export - snapshots are mapped, CSV/JSONL is streamed into a ParticipantStore"""
+    if path.lower().endswith(SNAPSHOT_EXTENSION):
+        return RosterSnapshot(path, day_keys)
+    return roster_import.import_into_store(path, day_keys)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export a roster's meeting results as iCalendar, CSV or JSON.")
+    parser.add_argument('roster', help="roster file (.csv/.jsonl/.ndjson or a .mbrs snapshot)")
+    parser.add_argument('output', help="file to write (.ics, .csv or .json)")
+    parser.add_argument('--date', type=date.fromisoformat, help="first meeting day for .ics, YYYY-MM-DD "
+                                                                 "(default: tomorrow)")
+    parser.add_argument('--organizer', help="organizer email for .ics")
+    parser.add_argument('--votes', help="vote counts file for .csv (default: <output>_votes.csv)")
+    parser.add_argument('--force', action='store_true', help="replace an existing vote counts file")
+    args = parser.parse_args(argv)
+
+    if os.path.splitext(args.output)[1].lower() == '.csv' and not args.force:
+        votes_path = args.votes or votes_csv_path(args.output)
+        if os.path.exists(votes_path):
+            print(f"Export failed: '{votes_path}' already exists (use --votes to pick another file "
+                  f"or --force to replace it)", file=sys.stderr)
+            return 1
+
+    try:
+        participants = load_roster(args.roster)
+        written = export_results(args.output, participants, args.date, args.organizer, args.votes)
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    if isinstance(participants, RosterSnapshot):
+        participants.close()
+    print(f"Exported {len(participants)} participants to {', '.join(written)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
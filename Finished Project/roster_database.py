@@ -0,0 +1,248 @@
+"""
+Roster Database Module
+Saves an event's participants and their availability to a local SQLite file.
+Besides the raw selections, every participant's hourly slots are stored in a
+(day, slot) indexed table and per-slot vote totals are kept up to date on
+every write, so reopening a large event reads the best times straight from
+the stored aggregates instead of rescanning everyone. Single edits (rename,
+change a day, remove someone) each run as one small transaction.
+"""
+
+import sqlite3
+from collections import Counter
+
+import meeting_calculator
+from availability_matrix import mask_to_slots
+from interval_sweep import MINUTES_PER_DAY
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS participants (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS selections (
+    participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
+    day INTEGER NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    PRIMARY KEY (participant_id, day)
+);
+CREATE TABLE IF NOT EXISTS participant_slots (
+    participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
+    day INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    PRIMARY KEY (participant_id, day, slot)
+);
+CREATE INDEX IF NOT EXISTS participant_slots_by_slot ON participant_slots (day, slot);
+CREATE TABLE IF NOT EXISTS slot_counts (
+    day INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    votes INTEGER NOT NULL,
+    PRIMARY KEY (day, slot)
+);
+"""
+
+
+def selection_from_record(record, day_key):
+    """Read one day from a GUI-format record as a (start_minute, end_minute) selection or None"""
+    selection = record.get(day_key)
+    if not isinstance(selection, str):
+        return selection
+    if selection == "Not selected" or " - " not in selection:
+        return None
+    try:
+        return meeting_calculator.parse_time_range(selection)
+    except ValueError as e:
+        print(f"Error parsing time range '{selection}': {e}")
+        return None
+
+
+class RosterDatabase:
+    """SQLite-backed roster with per-slot vote totals maintained on write"""
+
+    def __init__(self, path, day_keys=meeting_calculator.DAY_KEYS, slot_minutes=60):
+        self.path = path
+        self.day_keys = list(day_keys)
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = MINUTES_PER_DAY // slot_minutes
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database file"""
+        self.connection.close()
+
+    # ========================
+    # WRITES
+    # ========================
+
+    def add_participant(self, name, selections=None, email=''):
+        """
+        Add one participant in a single transaction
+        selections: optional list of (start_minute, end_minute) or None, one per day
+        Returns: the new participant id
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO participants (name, email) VALUES (?, ?)", (name, email))
+            participant_id = cursor.lastrowid
+            for day, selection in enumerate(selections or []):
+                self._set_selection(participant_id, day, selection)
+        return participant_id
+
+    def add_records(self, records):
+        """
+        Bulk-add GUI-format records ({'user', 'email', 'day_one', 'day_two'}) in one transaction
+        Vote totals are grouped in Python and written once per slot.
+        Returns: list of new participant ids, in record order
+        """
+        participant_ids = []
+        selection_rows = []
+        slot_rows = []
+        vote_deltas = Counter()
+
+        with self.connection:
+            for record in records:
+                cursor = self.connection.execute(
+                    "INSERT INTO participants (name, email) VALUES (?, ?)",
+                    (record['user'], record.get('email', '')))
+                participant_id = cursor.lastrowid
+                participant_ids.append(participant_id)
+                for day, day_key in enumerate(self.day_keys):
+                    selection = selection_from_record(record, day_key)
+                    if selection is None:
+                        continue
+                    selection_rows.append((participant_id, day, selection[0], selection[1]))
+                    for slot in self._slots_for(selection):
+                        slot_rows.append((participant_id, day, slot))
+                        vote_deltas[day, slot] += 1
+
+            self.connection.executemany(
+                "INSERT INTO selections (participant_id, day, start_minute, end_minute) VALUES (?, ?, ?, ?)",
+                selection_rows)
+            self.connection.executemany(
+                "INSERT INTO participant_slots (participant_id, day, slot) VALUES (?, ?, ?)", slot_rows)
+            self._add_votes(vote_deltas)
+        return participant_ids
+
+    def update_selection(self, participant_id, day, selection):
+        """Change one participant's selection for one day (single transaction, only changed slots touched)"""
+        with self.connection:
+            self._set_selection(participant_id, day, selection)
+
+    def rename_participant(self, participant_id, name):
+        """Change a participant's name"""
+        with self.connection:
+            self.connection.execute("UPDATE participants SET name = ? WHERE id = ?", (name, participant_id))
+
+    def remove_participant(self, participant_id):
+        """Remove a participant and take their votes out of the totals"""
+        with self.connection:
+            for day in range(len(self.day_keys)):
+                self._set_selection(participant_id, day, None)
+            self.connection.execute("DELETE FROM participants WHERE id = ?", (participant_id,))
+
+    def clear(self):
+        """Remove every participant and all vote totals"""
+        with self.connection:
+            self.connection.execute("DELETE FROM participant_slots")
+            self.connection.execute("DELETE FROM selections")
+            self.connection.execute("DELETE FROM participants")
+            self.connection.execute("DELETE FROM slot_counts")
+
+    def _set_selection(self, participant_id, day, selection):
+        """Replace a stored selection and apply the slot differences to the vote totals"""
+        old_slots = {slot for (slot,) in self.connection.execute(
+            "SELECT slot FROM participant_slots WHERE participant_id = ? AND day = ?", (participant_id, day))}
+        new_slots = set(self._slots_for(selection))
+
+        if selection is None:
+            self.connection.execute(
+                "DELETE FROM selections WHERE participant_id = ? AND day = ?", (participant_id, day))
+        else:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO selections (participant_id, day, start_minute, end_minute) "
+                "VALUES (?, ?, ?, ?)", (participant_id, day, selection[0], selection[1]))
+
+        removed = old_slots - new_slots
+        added = new_slots - old_slots
+        self.connection.executemany(
+            "DELETE FROM participant_slots WHERE participant_id = ? AND day = ? AND slot = ?",
+            [(participant_id, day, slot) for slot in removed])
+        self.connection.executemany(
+            "INSERT INTO participant_slots (participant_id, day, slot) VALUES (?, ?, ?)",
+            [(participant_id, day, slot) for slot in added])
+
+        vote_deltas = Counter({(day, slot): 1 for slot in added})
+        vote_deltas.update({(day, slot): -1 for slot in removed})
+        self._add_votes(vote_deltas)
+
+    def _add_votes(self, vote_deltas):
+        """Apply {(day, slot): delta} to the stored vote totals"""
+        self.connection.executemany(
+            "INSERT INTO slot_counts (day, slot, votes) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, slot) DO UPDATE SET votes = votes + excluded.votes",
+            [(day, slot, delta) for (day, slot), delta in vote_deltas.items() if delta])
+
+    def _slots_for(self, selection):
+        """Slots fully covered by a selection"""
+        return mask_to_slots(meeting_calculator.convert_selection_to_mask(selection, self.slot_minutes))
+
+    # ========================
+    # READS
+    # ========================
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM participants").fetchone()[0]
+
+    def load_records(self):
+        """
+        Read every participant back in GUI format, ordered by id
+        Returns: list of {'id', 'user', 'email', 'day_one', 'day_two'} with (start_minute, end_minute) or None per day
+        """
+        records = {}
+        for participant_id, name, email in self.connection.execute(
+                "SELECT id, name, email FROM participants ORDER BY id"):
+            record = {'id': participant_id, 'user': name, 'email': email}
+            for day_key in self.day_keys:
+                record[day_key] = None
+            records[participant_id] = record
+
+        for participant_id, day, start_minute, end_minute in self.connection.execute(
+                "SELECT participant_id, day, start_minute, end_minute FROM selections"):
+            if day < len(self.day_keys):
+                records[participant_id][self.day_keys[day]] = (start_minute, end_minute)
+        return list(records.values())
+
+    def day_counts(self):
+        """Per-day vote counts read from the stored totals (no participant rows are scanned)"""
+        all_counts = [[0] * self.slots_per_day for _ in self.day_keys]
+        for day, slot, votes in self.connection.execute("SELECT day, slot, votes FROM slot_counts"):
+            if day < len(all_counts):
+                all_counts[day][slot] = votes
+        return all_counts
+
+    def participants_available(self, day, slot):
+        """Names of everyone who picked a slot, via the (day, slot) index"""
+        return [name for (name,) in self.connection.execute(
+            "SELECT p.name FROM participant_slots s JOIN participants p ON p.id = s.participant_id "
+            "WHERE s.day = ? AND s.slot = ? ORDER BY p.id", (day, slot))]
+
+    def calculate_separate_day_times(self):
+        """
+        Best times for each day from the stored totals, in the same format as calculate_separate_day_times
+        Returns: tuple of (day_one_result, day_two_result)
+        """
+        day_counts = self.day_counts()
+        day_one_result = meeting_calculator.find_best_time_from_counts(day_counts[0], "No day one times selected")
+        day_two_result = meeting_calculator.find_best_time_from_counts(day_counts[1], "No day two times selected")
+        return day_one_result, day_two_result
@@ -0,0 +1,161 @@
+"""
+Roster Import Module
+Streams availability exports (CSV or JSON Lines) into the calculator without
+going through the GUI or the input() loops. Records are read one line at a
+time and handed on in small batches, so the whole file is never held in
+memory as Python dicts.
+
+Expected columns / keys:
+    name (or user), email, day_one, day_two
+where each day holds a range such as "9:00 AM - 12:00 PM" (blank or
+"Not selected" when the person picked nothing). A file without a name/user
+column or without any day column, or a range that can't be read, raises
+ValueError instead of importing empty rows.
+"""
+
+import csv
+import json
+import os
+from functools import lru_cache
+
+import meeting_calculator
+from interval_sweep import parse_time_range
+from participant_store import ParticipantStore
+from vote_tally import VoteTally
+
+# Rows handed to the tally / table per batch
+IMPORT_BATCH_SIZE = 1000
+
+
+def read_roster_records(path, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Yield one normalized record per participant: {'user', 'email', <day_key>: time range, ...}
+    The format is picked from the file extension (.csv, .jsonl or .ndjson).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        raw_records = _read_csv(path, day_keys)
+    elif extension in ('.jsonl', '.ndjson'):
+        raw_records = _read_jsonl(path, day_keys)
+    else:
+        raise ValueError(f"Unsupported roster file '{path}' (expected .csv, .jsonl or .ndjson)")
+
+    for raw in raw_records:
+        yield normalize_record(raw, day_keys)
+
+
+def check_columns(columns, day_keys, source):
+    """Raise ValueError unless the columns/keys include a name (or user) and at least one day"""
+    if 'name' not in columns and 'user' not in columns:
+        raise ValueError(f"{source} has no 'name' or 'user' column (found: {', '.join(map(str, columns)) or 'none'})")
+    if not any(day_key in columns for day_key in day_keys):
+        raise ValueError(f"{source} has none of the day columns {', '.join(day_keys)}")
+
+
+def _read_csv(path, day_keys=meeting_calculator.DAY_KEYS):
+    """Yield raw CSV rows as dicts, one at a time (malformed CSV or a wrong header raises ValueError)"""
+    with open(path, newline='', encoding='utf-8-sig') as roster_file:
+        reader = csv.DictReader(roster_file)
+        try:
+            check_columns(reader.fieldnames or [], day_keys, f"'{path}'")
+            yield from reader
+        except csv.Error as e:
+            raise ValueError(f"Malformed CSV in '{path}': {e}") from e
+
+
+def _read_jsonl(path, day_keys=meeting_calculator.DAY_KEYS):
+    """Yield raw JSON Lines records, skipping blank lines (a record without a name or any day raises ValueError)"""
+    with open(path, encoding='utf-8') as roster_file:
+        for line_number, line in enumerate(roster_file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Skipping line {line_number} of '{path}': {e}")
+                continue
+            if not isinstance(record, dict):
+                print(f"Skipping line {line_number} of '{path}': expected a JSON object, got {type(record).__name__}")
+                continue
+            check_columns(record, day_keys, f"Line {line_number} of '{path}'")
+            yield record
+
+
+def normalize_record(raw, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Map an exported row onto the calculator's GUI data format
+    Raises ValueError if a field holds something other than text (e.g. {"day_one": 5})
+    or a day holds a range that can't be read (e.g. '9 to 5')
+    """
+    record = {
+        'user': _text_field(raw, 'name') or _text_field(raw, 'user'),
+        'email': _text_field(raw, 'email')
+    }
+    for day_key in day_keys:
+        time_range = _text_field(raw, day_key) or "Not selected"
+        if not is_valid_time_range(time_range):
+            raise ValueError(f"Can't read the {day_key} time '{time_range}' for '{record['user']}' "
+                             "(expected a range like '9:00 AM - 12:00 PM')")
+        record[day_key] = time_range
+    return record
+
+
+@lru_cache(maxsize=4096)
+def is_valid_time_range(time_range):
+    """True for 'Not selected' or a range such as '9:00 AM - 12:00 PM' that ends after it starts"""
+    if time_range == "Not selected":
+        return True
+    try:
+        selection = parse_time_range(time_range)
+    except ValueError:
+        return False
+    return selection is not None and selection[0] < selection[1]
+
+
+def _text_field(raw, key):
+    """One stripped text field from a raw record ('' if missing or null)"""
+    value = raw.get(key)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise ValueError(f"Field '{key}' should be text, got {type(value).__name__} {value!r}")
+    return value.strip()
+
+
+def iter_batches(records, batch_size=IMPORT_BATCH_SIZE):
+    """Group a record stream into lists of at most batch_size records"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_into_tally(path, tally=None, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Stream a roster file straight into a VoteTally, keyed by record number
+    Only each participant's packed slot mask is kept, never the parsed records.
+    Returns: the tally
+    """
+    if tally is None:
+        tally = VoteTally(day_count=len(day_keys))
+    start = len(tally)
+    for offset, record in enumerate(read_roster_records(path, day_keys)):
+        tally.add_participant(start + offset, meeting_calculator.convert_user_to_masks(record, day_keys))
+    return tally
+
+
+def import_into_store(path, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Stream a roster file into a compact ParticipantStore (names, emails and slot masks)
+    Returns: the store
+    """
+    store = ParticipantStore(day_keys)
+    for record in read_roster_records(path, day_keys):
+        store.add_participant(record['user'], meeting_calculator.convert_user_to_masks(record, day_keys),
+                              email=record['email'])
+    return store
@@ -0,0 +1,279 @@
+"""
+Roster Model Module
+Model/view replacement for the per-row cell widgets in the main table.
+RosterModel keeps every participant as plain data (name plus start/end
+dropdown indices per day) and TimeRangeDelegate only builds the two
+dropdowns for the cell that is being edited, sharing one option list
+between all editors. This keeps the table responsive with 10k+ rows.
+"""
+
+from array import array
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QStringListModel, Qt
+from PyQt5.QtWidgets import QComboBox, QHBoxLayout, QLabel, QStyledItemDelegate, QWidget
+
+import meeting_calculator
+
+
+class RosterModel(QAbstractTableModel):
+    """Table model holding participant names and their dropdown selections for each day"""
+
+    COLUMN_HEADERS = ["User Name", "Day One Times", "Day Two Times"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.emails = []
+        # Dropdown index per participant per day (0 = "Start"/"End", i.e. nothing selected)
+        self.start_indices = [array('b') for _ in meeting_calculator.DAY_KEYS]
+        self.end_indices = [array('b') for _ in meeting_calculator.DAY_KEYS]
+        # Per-row hashes behind fingerprint(), updated on every edit
+        self.row_hashes = array('Q')
+        self.row_hash_sum = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMN_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if column == 0:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return self.names[row]
+            return None
+
+        day = column - 1
+        start_index, end_index = self.start_indices[day][row], self.end_indices[day][row]
+        if role == Qt.EditRole:
+            return start_index, end_index
+        if role == Qt.DisplayRole:
+            # Text is only built for rows the view actually paints
+            if start_index > 0 and end_index > 0:
+                return (f"{meeting_calculator.START_TIME_OPTIONS[start_index]} - "
+                        f"{meeting_calculator.END_TIME_OPTIONS[end_index]}")
+            return "Not selected"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+
+        if column == 0:
+            if self.names[row] == value:
+                return False
+            self.names[row] = value
+        else:
+            day = column - 1
+            start_index, end_index = value
+            if (self.start_indices[day][row], self.end_indices[day][row]) == (start_index, end_index):
+                return False
+            self.start_indices[day][row] = start_index
+            self.end_indices[day][row] = end_index
+
+        self._rehash_row(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > len(self.names):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.names[row:row + count]
+        del self.emails[row:row + count]
+        for indices in self.start_indices + self.end_indices:
+            del indices[row:row + count]
+        # Later rows moved up, and a row's position is part of its hash
+        del self.row_hashes[row:]
+        for moved_row in range(row, len(self.names)):
+            self._hash_new_row(moved_row)
+        self.row_hash_sum = sum(self.row_hashes)
+        self.endRemoveRows()
+        return True
+
+    def add_participant(self, name, day_indices=None, email=''):
+        """
+        Append a participant row
+        day_indices: optional list of (start_index, end_index) dropdown indices, one per day
+        Returns: the new row number
+        """
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._append(name, day_indices, email)
+        self.endInsertRows()
+        return row
+
+    def add_records(self, records):
+        """
+        Append a batch of records ({'user', 'email', 'day_one', 'day_two'}, see roster_import.py)
+        Each day may be a text range or a (start_minute, end_minute) selection / None.
+        The view is notified once for the whole batch instead of once per row.
+        Times the dropdowns can't show (e.g. '9:15 AM - 11:00 AM') are left unselected.
+        Returns: list of names whose rows lost at least one day's time that way
+        """
+        if not records:
+            return []
+        unrepresentable = []
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+        for record in records:
+            day_indices = []
+            lost_time = False
+            for day_key in meeting_calculator.DAY_KEYS:
+                time_range = record[day_key]
+                if isinstance(time_range, str):
+                    try:
+                        time_range = meeting_calculator.parse_time_range(time_range)
+                    except ValueError as e:
+                        print(f"Error parsing time range '{time_range}': {e}")
+                        time_range = None
+                        lost_time = True
+                indices = meeting_calculator.indices_from_selection(time_range)
+                if time_range is not None and indices == (0, 0):
+                    lost_time = True
+                day_indices.append(indices)
+            self._append(record['user'], day_indices, record.get('email', ''))
+            if lost_time:
+                unrepresentable.append(record['user'])
+        self.endInsertRows()
+        return unrepresentable
+
+    def clear(self):
+        """Remove every participant"""
+        self.beginResetModel()
+        self.names.clear()
+        self.emails.clear()
+        for indices in self.start_indices + self.end_indices:
+            del indices[:]
+        del self.row_hashes[:]
+        self.row_hash_sum = 0
+        self.endResetModel()
+
+    def _append(self, name, day_indices, email=''):
+        """Append one participant without notifying the view"""
+        day_indices = day_indices or []
+        self.names.append(name)
+        self.emails.append(email)
+        for day in range(len(self.start_indices)):
+            start_index, end_index = day_indices[day] if day < len(day_indices) else (0, 0)
+            self.start_indices[day].append(start_index)
+            self.end_indices[day].append(end_index)
+        self.row_hash_sum += self._hash_new_row(len(self.names) - 1)
+
+    def fingerprint(self):
+        """
+        Current roster fingerprint, equal to meeting_calculator.roster_fingerprint(self.get_selections())
+        Kept up to date on every edit, so reading it is O(1).
+        """
+        return len(self.names), self.row_hash_sum & meeting_calculator.FINGERPRINT_MASK
+
+    def _hash_new_row(self, row):
+        """Append the hash of a row to row_hashes and return it"""
+        row_hash = meeting_calculator.fingerprint_row(row, self.get_row_selection(row))
+        self.row_hashes.append(row_hash)
+        return row_hash
+
+    def _rehash_row(self, row):
+        """Swap an edited row's old hash for its new one"""
+        row_hash = meeting_calculator.fingerprint_row(row, self.get_row_selection(row))
+        self.row_hash_sum += row_hash - self.row_hashes[row]
+        self.row_hashes[row] = row_hash
+
+    def get_selections(self):
+        """Read every row as {'user', 'day_one', 'day_two'} with (start_minute, end_minute) or None per day"""
+        selections = []
+        day_columns = list(zip(meeting_calculator.DAY_KEYS, self.start_indices, self.end_indices))
+        for row, name in enumerate(self.names):
+            selection = {'user': name, 'email': self.emails[row]}
+            for day_key, start_indices, end_indices in day_columns:
+                selection[day_key] = meeting_calculator.selection_from_indices(start_indices[row], end_indices[row])
+            selections.append(selection)
+        return selections
+
+    def get_row_selection(self, row):
+        """Read one row as {'user', 'day_one', 'day_two'} with (start_minute, end_minute) or None per day"""
+        selection = {'user': self.names[row], 'email': self.emails[row]}
+        for day, day_key in enumerate(meeting_calculator.DAY_KEYS):
+            selection[day_key] = meeting_calculator.selection_from_indices(
+                self.start_indices[day][row], self.end_indices[day][row])
+        return selection
+
+    def get_text_selections(self):
+        """Read every row in the older text format, e.g. {'day_one': '9:00 AM - 12:00 PM'}"""
+        selections = []
+        for selection in self.get_selections():
+            for day_key in meeting_calculator.DAY_KEYS:
+                selection[day_key] = meeting_calculator.format_selection(selection[day_key])
+            selections.append(selection)
+        return selections
+
+
+class TimeRangeDelegate(QStyledItemDelegate):
+    """
+    Item delegate that shows dual dropdowns (start time - end time) only while a cell is edited
+    All editors share the same two option models instead of building fresh option lists per row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.start_options = QStringListModel(meeting_calculator.START_TIME_OPTIONS, self)
+        self.end_options = QStringListModel(meeting_calculator.END_TIME_OPTIONS, self)
+
+    def createEditor(self, parent, option, index):
+        container = QWidget(parent)
+        container.setAutoFillBackground(True)
+        layout = QHBoxLayout(container)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+
+        start_combo = QComboBox()
+        start_combo.setModel(self.start_options)
+
+        dash_label = QLabel(" - ")
+        dash_label.setAlignment(Qt.AlignCenter)
+
+        end_combo = QComboBox()
+        end_combo.setModel(self.end_options)
+
+        layout.addWidget(start_combo)
+        layout.addWidget(dash_label)
+        layout.addWidget(end_combo)
+
+        # Store references for later access
+        container.start_combo = start_combo
+        container.end_combo = end_combo
+
+        # Push every dropdown change straight into the model
+        start_combo.currentIndexChanged.connect(lambda: self.commitData.emit(container))
+        end_combo.currentIndexChanged.connect(lambda: self.commitData.emit(container))
+        return container
+
+    def setEditorData(self, editor, index):
+        start_index, end_index = index.data(Qt.EditRole)
+        editor.start_combo.blockSignals(True)
+        editor.end_combo.blockSignals(True)
+        editor.start_combo.setCurrentIndex(start_index)
+        editor.end_combo.setCurrentIndex(end_index)
+        editor.start_combo.blockSignals(False)
+        editor.end_combo.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, (editor.start_combo.currentIndex(), editor.end_combo.currentIndex()), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
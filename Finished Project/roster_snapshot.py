@@ -0,0 +1,175 @@
+"""
+Roster Snapshot Module
+Compact binary snapshot of a roster for very large events. A snapshot is
+opened with mmap and read through memoryviews, so "loading" a million
+participants only maps the file - nothing is parsed or copied until a
+name or count is actually asked for.
+
+File layout (little endian):
+    header        HEADER_FORMAT: magic, version, day count, slot minutes,
+                  participant count and the offsets of the sections below
+    name table    (count + 1) uint64 offsets, then the UTF-8 names back to back
+    email table   same layout as the name table
+    masks         count x day_count uint64 slot bitmasks, participant-major,
+                  8-byte aligned
+"""
+
+import mmap
+import struct
+from array import array
+from collections import Counter
+
+import meeting_calculator
+from availability_matrix import weighted_column_sums
+from interval_sweep import MINUTES_PER_DAY
+
+SNAPSHOT_MAGIC = b'MBRS'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = '.mbrs'
+HEADER_FORMAT = '<4sHHHHQQQQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+def write_snapshot(path, store):
+    """
+    Write a ParticipantStore (see participant_store.py) to a snapshot file
+    Returns: number of participants written
+    """
+    count = len(store)
+    day_count = len(store.day_keys)
+    name_table = _build_string_table([store.get_name(index) for index in range(count)])
+    email_table = _build_string_table(store.emails)
+
+    names_offset = HEADER_SIZE
+    emails_offset = names_offset + len(name_table)
+    masks_offset = _align(emails_offset + len(email_table), 8)
+
+    # Interleave the store's per-day arrays into one participant-major array
+    masks = array('Q', bytes(8 * count * day_count))
+    for day, day_masks in enumerate(store.best_masks):
+        masks[day::day_count] = day_masks
+
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(struct.pack(HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, day_count,
+                                        store.slot_minutes, 0, count, names_offset, emails_offset,
+                                        masks_offset))
+        snapshot_file.write(name_table)
+        snapshot_file.write(email_table)
+        snapshot_file.write(bytes(masks_offset - emails_offset - len(email_table)))
+        snapshot_file.write(masks.tobytes())
+    return count
+
+
+def _build_string_table(strings):
+    """Encode strings as (len + 1) uint64 offsets followed by the UTF-8 bytes"""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = array('Q', [0])
+    position = 0
+    for data in encoded:
+        position += len(data)
+        offsets.append(position)
+    return offsets.tobytes() + b''.join(encoded)
+
+
+def _align(offset, alignment):
+    """Round an offset up to a multiple of alignment"""
+    return -(-offset // alignment) * alignment
+
+
+class RosterSnapshot:
+    """Read-only, memory-mapped view of a snapshot file"""
+
+    def __init__(self, path, day_keys=meeting_calculator.DAY_KEYS):
+        self.path = path
+        self.day_keys = list(day_keys)
+        with open(path, 'rb') as snapshot_file:
+            self.buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+
+        if len(self.buffer) < HEADER_SIZE:
+            self.close()
+            raise ValueError(f"'{path}' is not a roster snapshot")
+        (magic, version, self.day_count, self.slot_minutes, _, self.count,
+         names_offset, emails_offset, masks_offset) = struct.unpack_from(HEADER_FORMAT, self.buffer)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a version {SNAPSHOT_VERSION} roster snapshot")
+
+        try:
+            if not 0 < self.slot_minutes <= MINUTES_PER_DAY:
+                raise ValueError(f"'{path}' has an invalid slot size ({self.slot_minutes} minutes)")
+            self.slots_per_day = MINUTES_PER_DAY // self.slot_minutes
+
+            # Zero-copy views straight into the mapped file
+            self.name_offsets, self.name_data = self._string_table(names_offset)
+            self.email_offsets, self.email_data = self._string_table(emails_offset)
+            mask_bytes = 8 * self.count * self.day_count
+            self._check_section(masks_offset, mask_bytes)
+            self.masks = self.view[masks_offset:masks_offset + mask_bytes].cast('Q')
+        except ValueError:
+            self.close()
+            raise
+
+    def _check_section(self, offset, size):
+        """Raise ValueError if offset..offset + size runs past the end of the file (e.g. a truncated copy)"""
+        if offset < HEADER_SIZE or offset + size > len(self.buffer):
+            raise ValueError(f"'{self.path}' is truncated or corrupt: {size} bytes at offset {offset} "
+                             f"don't fit in {len(self.buffer)} bytes")
+
+    def _string_table(self, offset):
+        """Views over one string table's offsets and UTF-8 data"""
+        data_offset = offset + 8 * (self.count + 1)
+        self._check_section(offset, data_offset - offset)
+        data_size, = struct.unpack_from('<Q', self.buffer, data_offset - 8)
+        self._check_section(data_offset, data_size)
+        return self.view[offset:data_offset].cast('Q'), self.view[data_offset:data_offset + data_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        """Release the views and unmap the file"""
+        for name in ('masks', 'name_offsets', 'name_data', 'email_offsets', 'email_data'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self.view.release()
+        self.buffer.close()
+
+    def get_name(self, index):
+        """Decode one participant's name"""
+        return str(self.name_data[self.name_offsets[index]:self.name_offsets[index + 1]], 'utf-8')
+
+    def get_email(self, index):
+        """Decode one participant's email address"""
+        return str(self.email_data[self.email_offsets[index]:self.email_offsets[index + 1]], 'utf-8')
+
+    def get_day_masks(self, index):
+        """One participant's slot bitmask for every day"""
+        start = index * self.day_count
+        return list(self.masks[start:start + self.day_count])
+
+    def day_counts(self):
+        """Vote counts per slot for every day, tallied straight from the mapped mask array"""
+        all_counts = []
+        for day in range(self.day_count):
+            # Identical masks are grouped first, so the per-bit pass only sees distinct rows
+            grouped = Counter(self.masks[day::self.day_count])
+            all_counts.append(weighted_column_sums(grouped.keys(), grouped.values(), self.slots_per_day))
+        return all_counts
+
+    def calculate_separate_day_times(self):
+        """
+        Best times for each day, in the same format as calculate_separate_day_times
+        Returns: tuple of (day_one_result, day_two_result)
+        """
+        results = meeting_calculator.summarize_day_counts(self.day_counts(), self.day_keys)
+        day_one_result = meeting_calculator.format_day_result(results['day_one'], "No day one times selected")
+        day_two_result = meeting_calculator.format_day_result(results['day_two'], "No day two times selected")
+        return day_one_result, day_two_result
@@ -0,0 +1,123 @@
+"""
+Sharded Tally Module
+Map-reduce vote counting for very large rosters (1M+ responses).
+The roster is split into row ranges, each range is tallied in a worker
+process, and every worker sends back one compact count array (one integer
+per slot) instead of pickled participant dicts. The partial counts are summed
+and summarized with the same code as the serial path, so results - including
+ties - match calculate_separate_day_times exactly.
+
+Where processes can be forked, the workers read their rows straight from the
+roster they inherited from the parent, so the parent does no per-row work and
+sends only (start, stop) pairs. Elsewhere each worker is sent its raw slice of
+the roster, which the parent has to pickle.
+"""
+
+import multiprocessing
+import os
+import threading
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import meeting_calculator
+from availability_matrix import mask_to_slots, pack_day_masks
+from interval_sweep import MINUTES_PER_DAY
+
+# Participants per shard - big enough that process overhead is small next to the parsing work
+SHARD_ROWS = 50000
+
+# Roster the forked workers read their shards from - only set while sharded_day_counts runs a pool
+_fork_rows = None
+_fork_lock = threading.Lock()
+
+
+def split_shards(row_count, shard_rows=SHARD_ROWS):
+    """
+    Split a roster into shards of rows
+    Returns: iterator of (start, stop) row ranges - no row is touched here
+    """
+    for start in range(0, row_count, shard_rows):
+        yield start, min(start + shard_rows, row_count)
+
+
+def tally_shard(shard, day_keys=meeting_calculator.DAY_KEYS, slot_minutes=60):
+    """
+    Map step: count the votes for one shard of GUI rows (runs inside a worker process)
+    Only the day selections are read - names and emails don't affect the counts.
+    Returns: array('Q') of vote counts, day d's slots at d * slots_per_day and up
+    """
+    slots_per_day = MINUTES_PER_DAY // slot_minutes
+    # Identical selections are common, so each distinct one is parsed and counted only once
+    rows = Counter()
+    for selections, repeats in Counter(tuple(user.get(day_key) for day_key in day_keys) for user in shard).items():
+        user = dict(zip(day_keys, selections))
+        rows[pack_day_masks(meeting_calculator.convert_user_to_masks(user, day_keys, slot_minutes),
+                            slots_per_day)] += repeats
+
+    counts = array('Q', bytes(8 * len(day_keys) * slots_per_day))
+    for row, repeats in rows.items():
+        for slot in mask_to_slots(row):
+            counts[slot] += repeats
+    return counts
+
+
+def tally_forked_rows(start, stop, day_keys, slot_minutes):
+    """Map step on a forked worker: tally rows start..stop of the roster inherited from the parent"""
+    return tally_shard(_fork_rows[start:stop], day_keys, slot_minutes)
+
+
+def merge_counts(partial_counts, slot_count):
+    """Reduce step: sum the per-shard count arrays slot by slot"""
+    total = array('Q', bytes(8 * slot_count))
+    for counts in partial_counts:
+        for slot, votes in enumerate(counts):
+            total[slot] += votes
+    return total
+
+
+def sharded_day_counts(gui_data, day_keys=meeting_calculator.DAY_KEYS, slot_minutes=60, workers=None,
+                       shard_rows=SHARD_ROWS):
+    """
+    Count every day's votes across a process pool
+    Returns: list of per-day vote count lists (same shape as ParticipantStore.day_counts())
+    """
+    global _fork_rows
+    slots_per_day = MINUTES_PER_DAY // slot_minutes
+    workers = workers or os.cpu_count() or 1
+    shards = list(split_shards(len(gui_data), shard_rows))
+
+    if workers == 1 or len(shards) == 1:
+        partial_counts = [tally_shard(gui_data[start:stop], day_keys, slot_minutes) for start, stop in shards]
+    elif 'fork' in multiprocessing.get_all_start_methods():
+        # Workers are forked after _fork_rows is set, so they see the roster without it being pickled
+        with _fork_lock:
+            _fork_rows = gui_data
+            try:
+                fork_context = multiprocessing.get_context('fork')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context) as executor:
+                    futures = [executor.submit(tally_forked_rows, start, stop, day_keys, slot_minutes)
+                               for start, stop in shards]
+                    partial_counts = [future.result() for future in futures]
+            finally:
+                _fork_rows = None
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(tally_shard, gui_data[start:stop], day_keys, slot_minutes)
+                       for start, stop in shards]
+            partial_counts = [future.result() for future in futures]
+
+    total = merge_counts(partial_counts, len(day_keys) * slots_per_day)
+    return [list(total[day * slots_per_day:(day + 1) * slots_per_day]) for day in range(len(day_keys))]
+
+
+def calculate_sharded_day_times(gui_data, workers=None, shard_rows=SHARD_ROWS):
+    """
+    High-level function: sharded equivalent of calculate_separate_day_times for huge rosters
+    Returns: tuple of (day_one_result, day_two_result)
+    """
+    day_counts = sharded_day_counts(gui_data, workers=workers, shard_rows=shard_rows)
+    results = meeting_calculator.summarize_day_counts(day_counts, meeting_calculator.DAY_KEYS)
+    day_one_result = meeting_calculator.format_day_result(results['day_one'], "No day one times selected")
+    day_two_result = meeting_calculator.format_day_result(results['day_two'], "No day two times selected")
+    return day_one_result, day_two_result
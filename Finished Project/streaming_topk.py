@@ -0,0 +1,137 @@
+"""
+Streaming Top-K Module
+Finds the most voted time slot(s) from an open-ended stream of votes, e.g. a
+form feed that never stops, without keeping any participant records.
+Only per-slot counters are kept. With a capacity set, the counters form a
+Space-Saving heavy-hitters sketch, so memory stays constant no matter how
+many distinct slots (or free-text times) show up in the stream.
+
+Space-Saving error bounds (capacity k, N votes seen so far):
+    - a slot's estimated count never undercounts: true <= estimate <= true + error
+    - every per-slot error is at most the smallest monitored count, which is <= N / k
+    - any slot with more than N / k true votes is always being monitored
+"""
+
+import meeting_calculator
+from availability_matrix import mask_to_slots
+
+
+class SlotVoteStream:
+    """
+    Per-slot vote counter for unbounded vote streams
+
+    capacity=None keeps one exact counter per distinct slot (fine for the
+    GUI's fixed list of hourly slots). With a capacity, at most that many
+    counters are kept and the least voted one is replaced when a new slot
+    arrives (Space-Saving). Like VoteTally, counters sit in "buckets" keyed
+    by count, and counts only ever move up by one, so every vote and every
+    best-slot query is O(1) in the number of votes seen.
+    """
+
+    def __init__(self, capacity=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total_votes = 0
+        self.counts = {}
+        self.errors = {}
+        self.first_seen = {}
+        self.buckets = {}
+        self.min_votes = 0
+        self.max_votes = 0
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add_vote(self, slot):
+        """Count one (participant, slot) vote - only the slot is kept"""
+        self.total_votes += 1
+        if slot in self.counts:
+            self._move(slot, self.counts[slot] + 1)
+            return
+
+        error = 0
+        if self.capacity is not None and len(self.counts) >= self.capacity:
+            # Replace the oldest of the least voted slots; the newcomer inherits its count as error
+            error = self.min_votes
+            evicted = next(iter(self.buckets[error]))
+            self._remove(evicted)
+
+        self.errors[slot] = error
+        self.first_seen[slot] = self._sequence
+        self._sequence += 1
+        self._move(slot, error + 1)
+
+    def add_votes(self, slots):
+        """Count a participant's votes for several slots"""
+        for slot in slots:
+            self.add_vote(slot)
+
+    def best_slots(self):
+        """
+        Get the current winning slot(s), ties listed in the order the slots were first seen
+        Returns: tuple of (max_votes, [slots]) - max_votes is 0 before any votes arrive
+        """
+        if not self.max_votes:
+            return 0, []
+        return self.max_votes, sorted(self.buckets[self.max_votes], key=self.first_seen.get)
+
+    def best_time(self, empty_message="No best time slots were chosen."):
+        """Format the current winner(s) the same way as find_top_meeting_time"""
+        max_votes, slots = self.best_slots()
+        if not slots:
+            return empty_message
+        return meeting_calculator.format_vote_result(slots, max_votes)
+
+    def error_bound(self):
+        """Largest possible overcount of any reported count (0 while the counts are exact)"""
+        if self.capacity is None or len(self.counts) < self.capacity:
+            return 0
+        return self.min_votes
+
+    def guaranteed_votes(self, slot):
+        """Lower bound on a slot's true vote count"""
+        return self.counts.get(slot, 0) - self.errors.get(slot, 0)
+
+    def _remove(self, slot):
+        """Drop a slot's counter entirely"""
+        count = self.counts.pop(slot)
+        del self.errors[slot]
+        del self.first_seen[slot]
+        self._leave_bucket(slot, count)
+
+    def _move(self, slot, new_count):
+        """Move a (new or existing) slot up to the next bucket, keeping the minimum and maximum exact"""
+        if slot in self.counts:
+            self._leave_bucket(slot, self.counts[slot])
+        self.counts[slot] = new_count
+        self.buckets.setdefault(new_count, {})[slot] = None
+
+        if new_count > self.max_votes:
+            self.max_votes = new_count
+        if not self.min_votes or new_count < self.min_votes or self.min_votes not in self.buckets:
+            self.min_votes = new_count
+
+    def _leave_bucket(self, slot, count):
+        """Take a slot out of its bucket, dropping the bucket once it is empty"""
+        bucket = self.buckets[count]
+        del bucket[slot]
+        if not bucket:
+            del self.buckets[count]
+
+
+def stream_record_votes(stream, records, day_keys=meeting_calculator.DAY_KEYS):
+    """
+    Feed GUI-format records (e.g. roster_import.read_roster_records) into a SlotVoteStream
+    Each record votes once for every hourly slot it covers on any day, like the
+    'best_times' used by find_top_meeting_time. Days may hold text ranges or structured
+    selections ((540, 720) or None). Only the current record is held in memory.
+    Returns: the stream
+    """
+    for record in records:
+        merged = 0
+        for mask in meeting_calculator.convert_user_to_masks(record, day_keys):
+            merged |= mask
+        stream.add_votes([meeting_calculator.format_hour_slot(hour) for hour in mask_to_slots(merged)])
+    return stream
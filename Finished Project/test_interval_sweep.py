@@ -0,0 +1,75 @@
+"""
+Tests for the interval_sweep overlap sweep against a minute-by-minute recount
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import random
+import unittest
+
+import interval_sweep
+
+DAY_END = 180
+
+
+def coverage(intervals):
+    """How many (half-open) intervals cover each minute of 0..DAY_END"""
+    counts = [0] * DAY_END
+    for start, end in intervals:
+        for minute in range(start, end):
+            counts[minute] += 1
+    return counts
+
+
+def random_intervals(rng, count):
+    intervals = []
+    for _ in range(count):
+        start = rng.randrange(0, DAY_END, 15)
+        intervals.append((start, rng.randrange(start, DAY_END + 1, 15)))   # some are empty
+    return intervals
+
+
+class IntervalSweepTests(unittest.TestCase):
+
+    def test_sweep_matches_a_minute_recount(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            intervals = random_intervals(rng, rng.randrange(8))
+            counts = coverage(intervals)
+            swept = [0] * DAY_END
+            previous_end = None
+            for start, end, count in interval_sweep.sweep_overlaps(intervals):
+                self.assertLess(start, end)
+                self.assertGreater(count, 0)
+                if previous_end is not None:
+                    self.assertLessEqual(previous_end, start)
+                previous_end = end
+                for minute in range(start, end):
+                    swept[minute] = count
+            self.assertEqual(swept, counts)
+
+    def test_max_windows_are_merged_runs_of_the_maximum(self):
+        rng = random.Random(13)
+        for _ in range(300):
+            intervals = random_intervals(rng, rng.randrange(8))
+            counts = coverage(intervals)
+            max_count = max(counts)
+            windows = []
+            if max_count:
+                for minute, count in enumerate(counts):
+                    if count != max_count:
+                        continue
+                    if windows and windows[-1][1] == minute:
+                        windows[-1] = (windows[-1][0], minute + 1)
+                    else:
+                        windows.append((minute, minute + 1))
+            self.assertEqual(interval_sweep.find_max_overlap_windows(intervals), (max_count, windows))
+
+    def test_touching_intervals_do_not_overlap(self):
+        self.assertEqual(interval_sweep.find_max_overlap_windows([(0, 60), (60, 120)]), (1, [(0, 120)]))
+        self.assertEqual(interval_sweep.find_max_overlap_windows([(0, 60), (30, 90), (90, 120)]),
+                         (2, [(30, 60)]))
+        self.assertEqual(interval_sweep.find_max_overlap_windows([]), (0, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for mail_calc.MailTransport against the in-process fake SMTP server
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import unittest
+
+import mail_calc
+from fake_smtp_server import FakeSMTPServer
+
+SENDER = 'organizer@test.org'
+
+
+def make_transport(server, password='', **options):
+    """A plain-SMTP transport pointed at the fake server"""
+    return mail_calc.MailTransport(SENDER, password, host='127.0.0.1', port=server.port, use_ssl=False,
+                                   timeout=5, **options)
+
+
+class MailTransportTests(unittest.TestCase):
+
+    def test_recipients_are_sent_in_chunks(self):
+        recipients = [f'person{index}@test.org' for index in range(120)]
+        with FakeSMTPServer() as server, make_transport(server, chunk_size=50) as transport:
+            results = transport.send("Team Meeting", "See you there.", recipients)
+
+        self.assertEqual(results, dict.fromkeys(recipients))
+        self.assertEqual([len(accepted) for _, accepted, _ in server.messages], [50, 50, 20])
+        self.assertEqual(server.recipients(), recipients)
+        # Bcc'd - nobody's address is in the message itself
+        for _, _, data in server.messages:
+            self.assertIn(b'To: undisclosed-recipients:;', data)
+            self.assertNotIn(b'person0@test.org', data)
+
+    def test_individual_messages_are_addressed_to_each_recipient(self):
+        recipients = ['a@test.org', 'b@test.org']
+        with FakeSMTPServer() as server, make_transport(server) as transport:
+            transport.send("Team Meeting", "Hello", recipients, individual=True)
+
+        self.assertEqual([accepted for _, accepted, _ in server.messages], [['a@test.org'], ['b@test.org']])
+        self.assertIn(b'To: b@test.org', server.messages[1][2])
+
+    def test_each_recipient_gets_its_own_result(self):
+        recipients = ['a@test.org', 'gone@test.org', 'busy@test.org', 'c@test.org']
+        with FakeSMTPServer(rejected={'gone@test.org'}, deferred={'busy@test.org': 1}) as server, \
+                make_transport(server) as transport:
+            results = transport.send("Team Meeting", "Hello", recipients)
+
+        self.assertIsNone(results['a@test.org'])
+        self.assertIsNone(results['c@test.org'])
+        self.assertTrue(results['gone@test.org'].startswith('550'))
+        self.assertTrue(results['busy@test.org'].startswith('451'))
+        self.assertEqual(server.recipients(), ['a@test.org', 'c@test.org'])
+
+    def test_every_recipient_refused(self):
+        recipients = ['gone@test.org', 'left@test.org']
+        with FakeSMTPServer(rejected=set(recipients)) as server, make_transport(server) as transport:
+            results = transport.send("Team Meeting", "Hello", recipients)
+            # The connection is still usable afterwards
+            self.assertEqual(transport.send("Team Meeting", "Hello", ['a@test.org']), {'a@test.org': None})
+
+        self.assertEqual(set(results), set(recipients))
+        self.assertTrue(all(error.startswith('550') for error in results.values()))
+        self.assertEqual(server.connections, 1)
+
+    def test_dropped_connection_is_retried_on_a_new_one(self):
+        with FakeSMTPServer(drop_after=1) as server, make_transport(server, pool_size=1) as transport:
+            first = transport.send("Team Meeting", "One", ['a@test.org'])
+            second = transport.send("Team Meeting", "Two", ['b@test.org'])
+
+        self.assertEqual(first, {'a@test.org': None})
+        self.assertEqual(second, {'b@test.org': None})
+        self.assertEqual(server.recipients(), ['a@test.org', 'b@test.org'])
+        self.assertEqual(server.connections, 2)
+
+    def test_connections_are_reused_from_the_pool(self):
+        recipients = [f'person{index}@test.org' for index in range(5)]
+        with FakeSMTPServer() as server, make_transport(server, pool_size=1) as transport:
+            results = transport.send("Team Meeting", "Hello", recipients, individual=True)
+
+        self.assertEqual(results, dict.fromkeys(recipients))
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_connections_are_replaced_after_messages_per_connection(self):
+        recipients = [f'person{index}@test.org' for index in range(5)]
+        with FakeSMTPServer() as server, \
+                make_transport(server, pool_size=1, messages_per_connection=2) as transport:
+            transport.send("Team Meeting", "Hello", recipients, individual=True)
+
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 3)
+
+    def test_rejected_login_fails_without_reconnecting(self):
+        with FakeSMTPServer(auth='reject') as server, make_transport(server, password='wrong') as transport:
+            first = transport.send("Team Meeting", "Hello", ['a@test.org'])
+            second = transport.send("Team Meeting", "Hello", ['b@test.org'])
+
+        self.assertIsNotNone(transport.login_error)
+        self.assertTrue(first['a@test.org'].startswith('Could not connect'))
+        self.assertTrue(second['b@test.org'].startswith('Could not connect'))
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.messages, [])
+
+    def test_accepted_login_sends(self):
+        with FakeSMTPServer(auth='accept') as server, make_transport(server, password='secret') as transport:
+            results = transport.send("Team Meeting", "Hello", ['a@test.org'])
+
+        self.assertEqual(results, {'a@test.org': None})
+        self.assertIsNone(transport.login_error)
+
+    def test_serialized_messages_are_sent_with_crlf_line_endings(self):
+        raw = mail_calc.MessageTemplate("Team Meeting", SENDER).render('a@test.org', "Line one\nLine two")
+        with FakeSMTPServer() as server, make_transport(server) as transport:
+            results = transport.send_message(raw, ['a@test.org'])
+
+        self.assertEqual(results, {'a@test.org': None})
+        self.assertIn(b'Line one\r\nLine two\r\n', server.messages[0][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
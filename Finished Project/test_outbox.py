@@ -0,0 +1,155 @@
+"""
+Tests for the SQLite outbox and deliver_outbox against the in-process fake SMTP server
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import os
+import tempfile
+import unittest
+
+import mail_calc
+import outbox
+from fake_smtp_server import FakeSMTPServer
+
+SENDER = 'organizer@test.org'
+
+
+def make_message(body="See you there."):
+    """A Bcc-style invitation like the export dialog queues"""
+    return mail_calc.build_message("Team Meeting", body, SENDER, "undisclosed-recipients:;")
+
+
+class OutboxTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.outbox = outbox.Outbox(os.path.join(self.directory.name, 'outbox.db'))
+
+    def tearDown(self):
+        self.outbox.close()
+        self.directory.cleanup()
+
+    def make_transport(self, server, password=''):
+        """A plain-SMTP transport pointed at the fake server"""
+        return mail_calc.MailTransport(SENDER, password, host='127.0.0.1', port=server.port, use_ssl=False,
+                                       pool_size=2, timeout=5)
+
+    def test_delivers_every_recipient(self):
+        recipients = [f'person{index}@test.org' for index in range(120)]
+        self.outbox.enqueue(make_message(), recipients, SENDER)
+        with FakeSMTPServer() as server, self.make_transport(server) as transport:
+            results = outbox.deliver_outbox(self.outbox, transport, concurrency=2)
+
+        self.assertEqual(results, dict.fromkeys(recipients))
+        self.assertEqual(sorted(server.recipients()), sorted(recipients))
+        self.assertEqual(self.outbox.counts(SENDER)['sent'], 120)
+
+    def test_temporary_failure_backs_off_then_sends(self):
+        self.outbox.enqueue(make_message(), ['busy@test.org'], SENDER)
+        now = 1000.0
+        with FakeSMTPServer(deferred={'busy@test.org': 1}) as server, self.make_transport(server) as transport:
+            _, raw, deliveries = self.outbox.claim_batch(SENDER, now=now)
+            results = transport.send_message(raw, [recipient for _, recipient in deliveries])
+            self.assertTrue(results['busy@test.org'].startswith('451'))
+            self.assertEqual(self.outbox.record_results(deliveries, results, now=now), (0, 0))
+
+            # Queued again, but not due until the backoff has passed
+            delay = outbox.backoff_delay(1)
+            self.assertEqual(self.outbox.next_due_time(SENDER), now + delay)
+            self.assertIsNone(self.outbox.claim_batch(SENDER, now=now + delay - 1))
+
+            _, raw, deliveries = self.outbox.claim_batch(SENDER, now=now + delay)
+            results = transport.send_message(raw, [recipient for _, recipient in deliveries])
+            self.assertEqual(self.outbox.record_results(deliveries, results, now=now + delay), (1, 0))
+
+        self.assertEqual(server.recipients(), ['busy@test.org'])
+        self.assertEqual(self.outbox.delivery_results(SENDER), {'busy@test.org': None})
+
+    def test_temporary_failures_give_up_after_max_attempts(self):
+        self.outbox.enqueue(make_message(), ['busy@test.org'], SENDER)
+        now = 1000.0
+        for _ in range(outbox.MAX_ATTEMPTS):
+            _, _, deliveries = self.outbox.claim_batch(SENDER, now=now)
+            _, failed = self.outbox.record_results(deliveries, {'busy@test.org': '451 Try again later'}, now=now)
+            now += outbox.BACKOFF_MAX_SECONDS
+
+        self.assertEqual(failed, 1)
+        self.assertEqual(self.outbox.counts(SENDER)['failed'], 1)
+        self.assertIsNone(self.outbox.claim_batch(SENDER, now=now))
+
+    def test_permanent_failure_is_marked_failed(self):
+        self.outbox.enqueue(make_message(), ['a@test.org', 'gone@test.org'], SENDER)
+        with FakeSMTPServer(rejected={'gone@test.org'}) as server, self.make_transport(server) as transport:
+            results = outbox.deliver_outbox(self.outbox, transport)
+
+        self.assertIsNone(results['a@test.org'])
+        self.assertTrue(results['gone@test.org'].startswith('550'))
+        self.assertEqual(self.outbox.counts(SENDER), {'pending': 0, 'sending': 0, 'sent': 1, 'failed': 1})
+        # Tried once - a 5xx isn't retried
+        self.assertEqual(server.rcpt_attempts['gone@test.org'], 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        self.outbox.enqueue(make_message(), ['a@test.org'], SENDER)
+        now = 1000.0
+        claimed = self.outbox.claim_batch(SENDER, now=now)
+        self.assertIsNotNone(claimed)
+
+        # The sender died mid-batch: nobody else may take it while the lease holds...
+        self.assertIsNone(self.outbox.claim_batch(SENDER, now=now + outbox.SENDING_LEASE_SECONDS - 1))
+        self.assertEqual(self.outbox.counts(SENDER)['sending'], 1)
+        # ...and it is due again once the lease runs out
+        reclaimed = self.outbox.claim_batch(SENDER, now=now + outbox.SENDING_LEASE_SECONDS)
+        self.assertEqual(reclaimed[2], claimed[2])
+
+    def test_reenqueue_is_idempotent_within_a_send(self):
+        message = make_message()
+        first_id = self.outbox.enqueue(message, ['a@test.org', 'b@test.org'], SENDER, campaign='send-1')
+        self.assertEqual(self.outbox.enqueue(message, ['a@test.org', 'b@test.org'], SENDER, campaign='send-1'),
+                         first_id)
+        self.assertEqual(self.outbox.counts(SENDER)['pending'], 2)
+
+        with FakeSMTPServer() as server, self.make_transport(server) as transport:
+            outbox.deliver_outbox(self.outbox, transport)
+            # Retrying the delivered send sends nothing new
+            self.outbox.enqueue(message, ['a@test.org', 'b@test.org'], SENDER, campaign='send-1')
+            results = outbox.deliver_outbox(self.outbox, transport)
+
+        self.assertEqual(results, {'a@test.org': None, 'b@test.org': None})
+        self.assertEqual(sorted(server.recipients()), ['a@test.org', 'b@test.org'])
+
+    def test_same_message_in_a_new_send_goes_out(self):
+        message = make_message()
+        with FakeSMTPServer() as server, self.make_transport(server) as transport:
+            for campaign in ('week-1', None, None):
+                message_id = self.outbox.enqueue(message, ['a@test.org'], SENDER, campaign=campaign)
+                results = outbox.deliver_outbox(self.outbox, transport, [message_id])
+                self.assertEqual(results, {'a@test.org': None})
+
+        self.assertEqual(len(server.messages), 3)
+
+    def test_reenqueue_retries_failed_recipients(self):
+        message = make_message()
+        with FakeSMTPServer(rejected={'gone@test.org'}) as server, self.make_transport(server) as transport:
+            self.outbox.enqueue(message, ['a@test.org', 'gone@test.org'], SENDER, campaign='send-1')
+            outbox.deliver_outbox(self.outbox, transport)
+            server.rejected.clear()
+            self.outbox.enqueue(message, ['a@test.org', 'gone@test.org'], SENDER, campaign='send-1')
+            results = outbox.deliver_outbox(self.outbox, transport)
+
+        self.assertEqual(results, {'a@test.org': None, 'gone@test.org': None})
+        self.assertEqual(server.recipients(), ['a@test.org', 'gone@test.org'])
+
+    def test_rejected_login_stops_draining(self):
+        for index in range(3):
+            self.outbox.enqueue(make_message(f"Message {index}"), [f'person{index}@test.org'], SENDER)
+        with FakeSMTPServer(auth='reject') as server, self.make_transport(server, password='wrong') as transport:
+            results = outbox.deliver_outbox(self.outbox, transport, concurrency=1)
+
+        self.assertTrue(results['person0@test.org'].startswith('Could not connect'))
+        self.assertEqual(results['person1@test.org'], outbox.QUEUED_ERROR)
+        self.assertEqual(self.outbox.counts(SENDER), {'pending': 2, 'sending': 0, 'sent': 0, 'failed': 1})
+        self.assertEqual(server.connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
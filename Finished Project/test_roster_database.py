@@ -0,0 +1,91 @@
+"""
+Tests for roster_database.RosterDatabase's stored vote totals against a recount of the stored selections
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+import meeting_calculator
+import roster_database
+from availability_matrix import mask_to_slots
+
+SELECTIONS = [None, (540, 720), (600, 660), (480, 1020), (570, 630), (780, 900)]
+
+
+def recount(records):
+    """Per-day vote counts from scratch, straight from every participant's selections"""
+    counts = [[0] * 24 for _ in meeting_calculator.DAY_KEYS]
+    for record in records:
+        for day, day_key in enumerate(meeting_calculator.DAY_KEYS):
+            for slot in mask_to_slots(meeting_calculator.convert_selection_to_mask(record[day_key])):
+                counts[day][slot] += 1
+    return counts
+
+
+class RosterDatabaseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'event.db')
+        self.database = roster_database.RosterDatabase(self.path)
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def assert_matches(self, database):
+        """Stored totals, slot index and best times all agree with the stored selections"""
+        records = database.load_records()
+        counts = recount(records)
+        self.assertEqual(database.day_counts(), counts)
+        self.assertEqual(database.calculate_separate_day_times(),
+                         meeting_calculator.SchedulingSession().calculate_separate_day_times(records))
+        for day, day_key in enumerate(meeting_calculator.DAY_KEYS):
+            for slot in (9, 10, 13):
+                expected = [record['user'] for record in records
+                            if slot in mask_to_slots(meeting_calculator.convert_selection_to_mask(record[day_key]))]
+                self.assertEqual(database.participants_available(day, slot), expected)
+
+    def test_totals_match_a_recount_after_edits(self):
+        rng = random.Random(17)
+        records = [{'user': f'person {index}', 'email': f'p{index}@test.org',
+                    'day_one': rng.choice(SELECTIONS), 'day_two': rng.choice(SELECTIONS + ['9:00 AM - 11:00 AM'])}
+                   for index in range(200)]
+        participant_ids = self.database.add_records(records)
+        self.assert_matches(self.database)
+
+        for step in range(300):
+            action = rng.random()
+            if action < 0.5:
+                self.database.update_selection(rng.choice(participant_ids), rng.randrange(2), rng.choice(SELECTIONS))
+            elif action < 0.7 and len(participant_ids) > 1:
+                participant_id = participant_ids.pop(rng.randrange(len(participant_ids)))
+                self.database.remove_participant(participant_id)
+            elif action < 0.9:
+                participant_ids.append(self.database.add_participant(
+                    f'late {step}', [rng.choice(SELECTIONS), rng.choice(SELECTIONS)]))
+            else:
+                self.database.rename_participant(rng.choice(participant_ids), f'renamed {step}')
+            if step % 30 == 0:
+                self.assert_matches(self.database)
+
+        self.assert_matches(self.database)
+        self.assertEqual(len(self.database), len(participant_ids))
+
+        # Reopening reads the same totals back
+        self.database.close()
+        self.database = roster_database.RosterDatabase(self.path)
+        self.assert_matches(self.database)
+
+    def test_clear_removes_every_vote(self):
+        self.database.add_records([{'user': 'a', 'day_one': (540, 720), 'day_two': None}])
+        self.database.clear()
+        self.assertEqual(len(self.database), 0)
+        self.assertEqual(self.database.day_counts(), recount([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
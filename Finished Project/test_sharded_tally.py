@@ -0,0 +1,50 @@
+"""
+Tests that sharded_tally gives the same counts and results (tie order included) as the serial calculation
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import random
+import unittest
+
+import meeting_calculator
+import sharded_tally
+
+SELECTIONS = [None, (540, 720), (600, 660), (480, 1020), (780, 900), '9:00 AM - 11:00 AM', 'Not selected']
+
+
+def make_roster(rng, rows):
+    return [{'user': f'person {index}', 'email': '', 'day_one': rng.choice(SELECTIONS),
+             'day_two': rng.choice(SELECTIONS)} for index in range(rows)]
+
+
+class ShardedTallyTests(unittest.TestCase):
+
+    def assert_same_as_serial(self, roster, **options):
+        serial_counts = meeting_calculator.build_participant_store(roster).day_counts()
+        self.assertEqual(sharded_tally.sharded_day_counts(roster, **options), serial_counts)
+        self.assertEqual(sharded_tally.calculate_sharded_day_times(roster, **options),
+                         meeting_calculator.SchedulingSession().calculate_separate_day_times(roster))
+
+    def test_split_shards_covers_every_row_once(self):
+        self.assertEqual(list(sharded_tally.split_shards(7, 3)), [(0, 3), (3, 6), (6, 7)])
+        self.assertEqual(list(sharded_tally.split_shards(0, 3)), [])
+
+    def test_serial_shards_match(self):
+        rng = random.Random(19)
+        for rows in (0, 1, 37, 500):
+            self.assert_same_as_serial(make_roster(rng, rows), workers=1, shard_rows=64)
+
+    def test_worker_processes_match(self):
+        self.assert_same_as_serial(make_roster(random.Random(23), 600), workers=2, shard_rows=64)
+
+    def test_ties_are_listed_in_slot_order(self):
+        # 1 PM and 9 AM tie on day one, split across different shards
+        roster = [{'user': 'a', 'day_one': (780, 840), 'day_two': None},
+                  {'user': 'b', 'day_one': (540, 600), 'day_two': None}] * 50
+        self.assert_same_as_serial(roster, workers=2, shard_rows=30)
+        day_one_result, _ = sharded_tally.calculate_sharded_day_times(roster, workers=2, shard_rows=30)
+        self.assertEqual(day_one_result, "TIE: 9:00 AM - 10:00 AM, 1:00 PM - 2:00 PM (each with 50 votes)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for streaming_topk.SlotVoteStream against brute-force vote counts
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import random
+import unittest
+from collections import Counter
+
+import meeting_calculator
+import streaming_topk
+
+
+def skewed_stream(rng, length, slot_count):
+    """Votes where a few slots are far more popular than the rest"""
+    weights = [1 / (rank + 1) ** 1.2 for rank in range(slot_count)]
+    return rng.choices([f'slot {index}' for index in range(slot_count)], weights, k=length)
+
+
+class SlotVoteStreamTests(unittest.TestCase):
+
+    def test_exact_counts_and_first_seen_tie_order(self):
+        rng = random.Random(5)
+        votes = [f'slot {rng.randrange(6)}' for _ in range(500)]
+        stream = streaming_topk.SlotVoteStream()
+        for index, slot in enumerate(votes, start=1):
+            stream.add_vote(slot)
+            true_counts = Counter(votes[:index])
+            max_votes = max(true_counts.values())
+            expected = [slot for slot in dict.fromkeys(votes[:index]) if true_counts[slot] == max_votes]
+            self.assertEqual(stream.counts, true_counts)
+            self.assertEqual(stream.best_slots(), (max_votes, expected))
+            self.assertEqual(stream.error_bound(), 0)
+
+    def test_space_saving_bounds(self):
+        rng = random.Random(7)
+        capacity = 10
+        votes = skewed_stream(rng, 5000, 60)
+        stream = streaming_topk.SlotVoteStream(capacity)
+        for index, slot in enumerate(votes, start=1):
+            stream.add_vote(slot)
+            if index % 250:
+                continue
+            true_counts = Counter(votes[:index])
+            self.assertLessEqual(len(stream), capacity)
+            self.assertEqual(stream.total_votes, index)
+            self.assertEqual(stream.min_votes, min(stream.counts.values()))
+            self.assertEqual(stream.max_votes, max(stream.counts.values()))
+            self.assertLessEqual(stream.error_bound(), index / capacity)
+            for slot, count in stream.counts.items():
+                # Never undercounts, overcounts by at most the slot's own error, which is within the bound
+                self.assertLessEqual(true_counts[slot], count)
+                self.assertLessEqual(count, true_counts[slot] + stream.errors[slot])
+                self.assertLessEqual(stream.errors[slot], stream.error_bound())
+                self.assertLessEqual(stream.guaranteed_votes(slot), true_counts[slot])
+            # Heavy hitters are always monitored
+            for slot, true in true_counts.items():
+                if true > index / capacity:
+                    self.assertIn(slot, stream.counts)
+
+    def test_record_votes_match_find_top_meeting_time(self):
+        records = [
+            {'user': 'a', 'day_one': '9:00 AM - 11:00 AM', 'day_two': 'Not selected'},
+            {'user': 'b', 'day_one': None, 'day_two': (540, 720)},
+            {'user': 'c', 'day_one': (600, 660), 'day_two': '10:00 AM - 12:00 PM'},
+            {'user': 'd', 'day_one': None, 'day_two': None},
+        ]
+        stream = streaming_topk.stream_record_votes(streaming_topk.SlotVoteStream(), records)
+
+        session = meeting_calculator.SchedulingSession()
+        session.convert_gui_data_to_participants(records)
+        expected = Counter(slot for person in session.participants for slot in person['best_times'])
+        self.assertEqual(stream.counts, expected)
+        self.assertEqual(stream.best_time(), session.find_top_meeting_time())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for vote_tally.VoteTally against a brute-force recount after every edit
+Run from this folder with: python -m pytest -q (or python -m unittest)
+"""
+
+import random
+import unittest
+
+from availability_matrix import mask_to_slots
+from vote_tally import VoteTally
+
+DAY_COUNT = 2
+SLOTS = 8   # few slots, so ties and emptied buckets come up often
+
+
+def recount(masks_by_key):
+    """Per-slot counts (day d's slots at d * SLOTS and up) from scratch"""
+    counts = [0] * (DAY_COUNT * SLOTS)
+    for day_masks in masks_by_key.values():
+        for day, mask in enumerate(day_masks):
+            for slot in mask_to_slots(mask):
+                counts[day * SLOTS + slot] += 1
+    return counts
+
+
+def random_masks(rng):
+    return [rng.randrange(1 << SLOTS) for _ in range(DAY_COUNT)]
+
+
+class VoteTallyTests(unittest.TestCase):
+
+    def assert_matches(self, tally, masks_by_key):
+        """Counts, maximum and buckets all agree with a recount"""
+        counts = recount(masks_by_key)
+        self.assertEqual(tally.counts, counts)
+        self.assertEqual(len(tally), len(masks_by_key))
+        for day in range(DAY_COUNT):
+            day_counts = counts[day * SLOTS:(day + 1) * SLOTS]
+            max_votes = max(day_counts)
+            expected = [slot for slot, votes in enumerate(day_counts) if votes == max_votes] if max_votes else []
+            self.assertEqual(tally.best_slots(day), (max_votes, expected))
+            # Every bucket holds exactly the slots with that count, and no bucket is empty
+            buckets = {}
+            for slot, votes in enumerate(day_counts):
+                if votes:
+                    buckets[votes] = buckets.get(votes, 0) | (1 << slot)
+            self.assertEqual(tally.buckets[day], buckets)
+
+    def test_random_edits_match_a_recount(self):
+        rng = random.Random(3)
+        tally = VoteTally(day_count=DAY_COUNT, slots_per_day=SLOTS)
+        masks_by_key = {}
+        next_key = 0
+        for _ in range(2000):
+            action = rng.random()
+            if action < 0.4 or not masks_by_key:
+                masks_by_key[next_key] = random_masks(rng)
+                tally.add_participant(next_key, masks_by_key[next_key])
+                next_key += 1
+            elif action < 0.7:
+                key = rng.choice(list(masks_by_key))
+                masks_by_key[key] = random_masks(rng)
+                tally.update_participant(key, masks_by_key[key])
+            else:
+                key = rng.choice(list(masks_by_key))
+                del masks_by_key[key]
+                tally.remove_participant(key)
+            self.assert_matches(tally, masks_by_key)
+
+    def test_maximum_drops_when_the_leader_loses_votes(self):
+        tally = VoteTally(day_count=DAY_COUNT, slots_per_day=SLOTS)
+        tally.add_participant('a', [0b011, 0])
+        tally.add_participant('b', [0b001, 0])
+        self.assertEqual(tally.best_slots(0), (2, [0]))
+
+        tally.update_participant('b', [0b100, 0])
+        self.assertEqual(tally.best_slots(0), (1, [0, 1, 2]))
+        tally.remove_participant('a')
+        tally.remove_participant('b')
+        self.assertEqual(tally.best_slots(0), (0, []))
+        self.assertEqual(tally.buckets, [{}, {}])
+
+    def test_adding_a_key_twice_is_rejected(self):
+        tally = VoteTally(day_count=DAY_COUNT, slots_per_day=SLOTS)
+        tally.add_participant('a', [1, 0])
+        with self.assertRaises(ValueError):
+            tally.add_participant('a', [1, 0])
+        self.assertEqual(tally.best_slots(0), (1, [0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Incremental Vote Tally Module
+Keeps per-slot vote counts up to date as participants are added, edited or
+removed, instead of recounting the whole roster on every calculation.
+Each edit only touches the slots that actually changed, and the best slot(s)
+for every day can be read back in O(1).
+"""
+
+from availability_matrix import SLOTS_PER_DAY, mask_to_slots, pack_day_masks
+
+
+class VoteTally:
+    """
+    Stateful vote counter with add/update/remove deltas
+
+    Besides the raw counts, each day keeps "buckets": a dict mapping a vote
+    count to a bitmask of the slots that currently have that many votes.
+    Counts only ever move by one, so the maximum can be maintained exactly.
+    """
+
+    def __init__(self, day_count=2, slots_per_day=SLOTS_PER_DAY):
+        self.day_count = day_count
+        self.slots_per_day = slots_per_day
+        self.counts = [0] * (day_count * slots_per_day)
+        self.rows = {}
+        self.max_votes = [0] * day_count
+        self.buckets = [{} for _ in range(day_count)]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def add_participant(self, key, day_masks):
+        """Add a participant's per-day slot masks to the tally"""
+        if key in self.rows:
+            raise ValueError(f"Participant '{key}' is already in the tally")
+        row = pack_day_masks(day_masks[:self.day_count], self.slots_per_day)
+        self.rows[key] = row
+        self._apply(row, 0)
+
+    def update_participant(self, key, day_masks):
+        """Replace a participant's availability, only touching the slots that changed"""
+        old_row = self.rows[key]
+        new_row = pack_day_masks(day_masks[:self.day_count], self.slots_per_day)
+        self.rows[key] = new_row
+        self._apply(new_row & ~old_row, old_row & ~new_row)
+
+    def remove_participant(self, key):
+        """Remove a participant and their votes from the tally"""
+        row = self.rows.pop(key)
+        self._apply(0, row)
+
+    def best_slots(self, day):
+        """
+        Get the current winning slot(s) for a day
+        Returns: tuple of (max_votes, [slot indices]) - max_votes is 0 when nobody voted
+        """
+        max_votes = self.max_votes[day]
+        if max_votes == 0:
+            return 0, []
+        return max_votes, mask_to_slots(self.buckets[day][max_votes])
+
+    def day_counts(self):
+        """Return the vote counts split into one list per day"""
+        size = self.slots_per_day
+        return [self.counts[day * size:(day + 1) * size] for day in range(self.day_count)]
+
+    def _apply(self, added, removed):
+        """Increment every slot in `added` and decrement every slot in `removed`"""
+        for slot in mask_to_slots(added):
+            self._move(slot, 1)
+        for slot in mask_to_slots(removed):
+            self._move(slot, -1)
+
+    def _move(self, slot, delta):
+        """Move one slot to a neighbouring bucket and keep the day's maximum exact"""
+        day, position = divmod(slot, self.slots_per_day)
+        bit = 1 << position
+        buckets = self.buckets[day]
+        old_count = self.counts[slot]
+        new_count = old_count + delta
+
+        if old_count:
+            buckets[old_count] ^= bit
+            if not buckets[old_count]:
+                del buckets[old_count]
+                if old_count == self.max_votes[day] and delta < 0:
+                    self.max_votes[day] = new_count
+        if new_count:
+            buckets[new_count] = buckets.get(new_count, 0) | bit
+            if new_count > self.max_votes[day]:
+                self.max_votes[day] = new_count
+
+        self.counts[slot] = new_count